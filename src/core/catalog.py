@@ -0,0 +1,50 @@
+from typing import Dict, Iterable, Iterator, List
+
+from src.core.types import Card
+
+
+class CardCatalog:
+    """
+    Interned set of the distinct cards of a deck, indexed by card ID.
+    Copies of the same card in the deck share the ID of the first one.
+    """
+
+    def __init__(self, cards: Iterable[Card]) -> None:
+        self.cards: List[Card] = list(cards)
+        self._by_id: Dict[int, Card] = {}
+        self._by_name: Dict[str, Card] = {}
+
+        for card in self.cards:
+            if card.id not in self._by_id:
+                self._by_id[card.id] = card
+                self._by_name[card.name] = card
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, card: Card) -> bool:
+        return card.id in self._by_id
+
+    def get(self, card_id: int) -> Card:
+        return self._by_id[card_id]
+
+    def get_by_name(self, name: str) -> Card:
+        return self._by_name[name]
+
+    def get_ids(self) -> List[int]:
+        return sorted(self._by_id)
+
+    def iter_mask(self, mask: int) -> Iterator[Card]:
+        """Iterate over the cards of a bitmask, in ID order"""
+        while mask:
+            low_bit = mask & -mask
+            yield self._by_id[low_bit.bit_length() - 1]
+            mask ^= low_bit
+
+
+def get_cards_mask(cards: Iterable[Card]) -> int:
+    """Get the ID bitmask of a group of cards (duplicates collapse to one bit)"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
@@ -11,6 +11,10 @@ class Resource(Enum):
     LOOM = auto()
     COIN = auto()
 
+    # Members are singletons, so hashing by identity is enough and much faster
+    # than Enum.__hash__, which runs on every lookup of a cost or a production
+    __hash__ = object.__hash__
+
 
 class ScienceSymbol(Enum):
     TABLET = auto()
@@ -1,34 +1,151 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Sequence, Tuple
 
-from src.core.enums import CardType, Resource
+from src.core.enums import CardType, Resource, ScienceSymbol
 
+# Cards are identified by name, the same card can appear in several copies in the
+# deck (e.g. "loom" in age 1 and 2) but a player can only build it once. Catalog
+# cards are numbered in the order of the catalog, see parse_cards, so their IDs
+# are the same in every process. Cards built one by one, e.g. in tests, are
+# numbered here on first use, above the IDs of any catalog
+MAX_CATALOG_CARDS = 128
+_EXTRA_CARD_IDS: Dict[str, int] = {}
 
-@dataclass
+
+def intern_card_id(name: str) -> int:
+    """Get the ID of a card outside of a catalog, assigning the next free one if new"""
+    card_id = _EXTRA_CARD_IDS.get(name)
+    if card_id is None:
+        card_id = MAX_CATALOG_CARDS + len(_EXTRA_CARD_IDS)
+        _EXTRA_CARD_IDS[name] = card_id
+    return card_id
+
+
+def freeze_cost(cost: Mapping[Resource, int]) -> Mapping[Resource, int]:
+    """Read-only cost, shared as is by every view of the card"""
+    if isinstance(cost, MappingProxyType):
+        return cost
+    return MappingProxyType(dict(cost))
+
+
+@dataclass(frozen=True, slots=True)
+class Multiplier:
+    """Coins or points given per item counted on the player and/or its neighbors"""
+
+    amount: int
+    card_types: Tuple[CardType, ...] = ()  # Count the cards of these types
+    wonder_stages: bool = False  # Count the built wonder stages
+    military_tokens: bool = False  # Count the military tokens
+    wonder_complete: bool = False  # Give the amount once when the wonder is complete
+    own: bool = True
+    left: bool = False
+    right: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Effect:
+    """Structured form of an effect string, compiled once when parsing"""
+
+    production: Tuple[Tuple[Resource, int], ...] = ()  # Always produced
+    production_choice: Tuple[Resource, ...] = ()  # One unit of one of these per turn
+    shields: int = 0
+    victory_points: int = 0
+    coins: int = 0  # Given once when played
+    coins_per: Optional[Multiplier] = None  # Given once when played
+    points_per: Optional[Multiplier] = None  # Counted at the end of the game
+    trade_discount: FrozenSet[Resource] = frozenset()
+    trade_left: bool = False
+    trade_right: bool = False
+    science: Optional[ScienceSymbol] = None
+    science_choice: bool = False  # Any science symbol of choice
+    special: Optional[str] = None  # Effects not handled by the engine yet
+
+
+@dataclass(frozen=True, slots=True)
 class Card:
+    """Card of a catalog, see parse_cards, or built alone with make_card"""
+
     name: str
     type: CardType
     age: int
     min_players: int
-    cost: Dict[Resource, int]
-    chain_to: List[str]
+    cost: Mapping[Resource, int]
+    chain_to: Tuple[str, ...]
     effect: str
+    parsed_effect: Effect = field(compare=False, repr=False)
+    id: int = field(default=-1, compare=False, repr=False)
 
+    def __post_init__(self) -> None:
+        if self.id < 0:
+            object.__setattr__(self, "id", intern_card_id(self.name))
+        # Cards are shared by every view, so nothing in them can be mutable
+        object.__setattr__(self, "cost", freeze_cost(self.cost))
+        object.__setattr__(self, "chain_to", tuple(self.chain_to or ()))
 
-@dataclass
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Mapping proxies cannot be pickled, the cost goes as a plain dict
+        return (
+            Card,
+            (
+                self.name,
+                self.type,
+                self.age,
+                self.min_players,
+                dict(self.cost),
+                self.chain_to,
+                self.effect,
+                self.parsed_effect,
+                self.id,
+            ),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # Copies of the same card share the ID, so this is the name comparison
+        # without looking at the other fields
+        if self is other:
+            return True
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    @property
+    def mask(self) -> int:
+        return 1 << self.id
+
+
+@dataclass(frozen=True)
 class WonderStage:
-    cost: Dict[Resource, int]
+    """Stage of a wonder, see parse_wonders, or built alone with make_wonder_stage"""
+
+    cost: Mapping[Resource, int]
     effect: str
+    parsed_effect: Effect = field(compare=False, repr=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "cost", freeze_cost(self.cost))
 
-@dataclass
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return WonderStage, (dict(self.cost), self.effect, self.parsed_effect)
+
+
+@dataclass(frozen=True)
 class Wonder:
     name: str
     resource: Resource
-    stages: List[WonderStage]
+    stages: Sequence[WonderStage]
+
+    def __post_init__(self) -> None:
+        # Wonders are shared by every view of the player, so the stages must not
+        # be mutable from the outside
+        object.__setattr__(self, "stages", tuple(self.stages))
 
 
-@dataclass
+# Frozen, so the views and the snapshots of a player share it without a copy
+@dataclass(frozen=True)
 class Score:
     military: int = 0
     treasury: int = 0
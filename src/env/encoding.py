@@ -0,0 +1,103 @@
+from array import array
+from typing import Sequence
+
+from src.core.catalog import CardCatalog
+from src.core.enums import Action
+from src.core.types import Card
+from src.game.move import Move
+from src.game.player import ActionMask, GameView
+
+ACTIONS = tuple(Action)
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+# Features of each seat before its card bits
+SEAT_FEATURES = 6  # Coins, military tokens, stages built, stages, shields, hand size
+
+
+class ActionCodec:
+    """Moves as integers: card ID * number of actions + index of the action"""
+
+    def __init__(self, catalog: CardCatalog) -> None:
+        self.catalog = catalog
+        self.n_card_ids = max(catalog.get_ids(), default=-1) + 1
+        self.size = self.n_card_ids * len(ACTIONS)
+        self._zeros = array("B", bytes(self.size))
+
+    def encode(self, move: Move) -> int:
+        return move.card.id * len(ACTIONS) + ACTION_INDEX[move.action]
+
+    def decode(self, action: int, player_name: str, hand: Sequence[Card]) -> Move:
+        """The move of a card of the hand, ValueError if the card is not in it"""
+        if not 0 <= action < self.size:
+            raise ValueError(f"Action {action} out of range")
+        card_id, action_index = divmod(action, len(ACTIONS))
+        for card in hand:
+            if card.id == card_id:
+                return Move(player_name, ACTIONS[action_index], card)
+        raise ValueError(f"Card {card_id} is not in the hand of {player_name}")
+
+    def write_mask(self, mask: ActionMask, out: "array[int]", offset: int = 0) -> None:
+        """Set the bytes out[offset + action] to 1 for the valid actions, 0 for the others"""
+        out[offset : offset + self.size] = self._zeros
+        for move in mask.moves:
+            out[offset + self.encode(move)] = 1
+
+    def get_mask(self, mask: ActionMask) -> "array[int]":
+        out = array("B", self._zeros)
+        self.write_mask(mask, out)
+        return out
+
+
+class ObservationEncoder:
+    """
+    Fixed size vector of what a seat knows: age and turn, then every seat
+    starting from its own and going left (the direction of the hands in the
+    last age) with its public features and its built cards as bits by card
+    ID, then the own hand and the discard pile as counts by card ID
+    """
+
+    def __init__(self, catalog: CardCatalog, n_players: int) -> None:
+        self.catalog = catalog
+        self.n_players = n_players
+        self.n_card_ids = max(catalog.get_ids(), default=-1) + 1
+        self.seat_size = SEAT_FEATURES + self.n_card_ids
+        self.hand_offset = 2 + n_players * self.seat_size
+        self.discard_offset = self.hand_offset + self.n_card_ids
+        self.size = self.discard_offset + self.n_card_ids
+        self._zeros = array("f", bytes(self.size * 4))
+
+    def write(
+        self,
+        game_view: GameView,
+        position: int,
+        hand: Sequence[Card],
+        out: "array[float]",
+        offset: int = 0,
+    ) -> None:
+        out[offset : offset + self.size] = self._zeros
+        out[offset] = game_view.age
+        out[offset + 1] = game_view.turn
+
+        views = game_view.all_players_no_hand
+        for relative in range(self.n_players):
+            view = views[(position - relative) % self.n_players]
+            start = offset + 2 + relative * self.seat_size
+            out[start] = view.coins
+            out[start + 1] = view.military_tokens
+            out[start + 2] = view.stages_built
+            out[start + 3] = len(view.wonder.stages)
+            out[start + 4] = view.get_shields()
+            out[start + 5] = view.hand_size
+            start += SEAT_FEATURES
+            for card in view.cards:
+                out[start + card.id] = 1
+
+        for card in hand:
+            out[offset + self.hand_offset + card.id] += 1
+        for card in game_view.discarded_cards:
+            out[offset + self.discard_offset + card.id] += 1
+
+    def encode(self, game_view: GameView, position: int, hand: Sequence[Card]) -> "array[float]":
+        out = array("f", self._zeros)
+        self.write(game_view, position, hand, out)
+        return out
@@ -0,0 +1,167 @@
+import logging
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.catalog import CardCatalog
+from src.core.types import Card, Wonder
+from src.env.encoding import ActionCodec, ObservationEncoder
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import (
+    ActionMask,
+    GameView,
+    Player,
+    PlayerStrategy,
+    get_action_mask,
+    get_left_neighbor,
+    get_right_neighbor,
+)
+from src.game.scoring import get_margin
+from src.simulation.runner import get_game_seed, get_root_seed, setup_game
+from src.utils.parsers import load_cards, load_wonders
+
+logger = logging.getLogger(__name__)
+
+StepResult = Tuple["array[float]", float, bool, bool, Dict[str, Any]]
+
+
+class AgentSeat(PlayerStrategy):
+    """Placeholder strategy of the seat played through step"""
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        raise RuntimeError("The agent seat moves through SevenWondersEnv.step")
+
+
+class SevenWondersEnv:
+    """
+    Reset/step environment of one seat, in the style of Gymnasium. The other
+    seats are played by their strategies between two steps, in seat order as
+    in GameState.play_game. Actions are integers, see ActionCodec, and the
+    valid ones are given by the action mask in the info of every step. The
+    reward is 0 until the game ends, then the final margin of the agent over
+    the best other seat.
+    """
+
+    def __init__(
+        self,
+        opponents: Sequence[PlayerStrategy],
+        seat: int = 0,
+        seed: Optional[int] = None,
+        cards: Optional[Sequence[Card]] = None,
+        wonders: Optional[Sequence[Wonder]] = None,
+    ) -> None:
+        self.n_players = len(opponents) + 1
+        assert 0 <= seat < self.n_players, "The agent seat must be at the table"
+        self.seat = seat
+        self.strategies: List[PlayerStrategy] = list(opponents)
+        self.strategies.insert(seat, AgentSeat())
+        self.cards = list(load_cards() if cards is None else cards)
+        self.wonders = list(load_wonders() if wonders is None else wonders)
+
+        catalog = CardCatalog(self.cards)
+        self.codec = ActionCodec(catalog)
+        self.encoder = ObservationEncoder(catalog, self.n_players)
+        self.observation_size = self.encoder.size
+        self.n_actions = self.codec.size
+
+        # Episodes are seeded like the games of a simulation, so any episode
+        # can be played again from the root seed and its index
+        self.root_seed = get_root_seed(seed)
+        self.episode = -1
+        self.game: Optional[GameState] = None
+        self.next_seat = 0  # Next seat to move in the current turn
+        self.is_over = False
+
+    @property
+    def player(self) -> Player:
+        assert self.game is not None, "Call reset first"
+        return self.game.all_players[self.seat]
+
+    def reset(self, seed: Optional[int] = None) -> Tuple["array[float]", Dict[str, Any]]:
+        """Start a new game, with the given seed or the next one of the root seed"""
+        self.start(seed)
+        return self.get_observation(), {"action_mask": self.get_action_mask()}
+
+    def step(self, action: int) -> StepResult:
+        reward = self.play(action)
+        info: Dict[str, Any] = {"action_mask": self.get_action_mask()}
+        if self.is_over:
+            info["totals"] = self.get_totals()
+        return self.get_observation(), reward, self.is_over, False, info
+
+    def start(self, seed: Optional[int] = None) -> None:
+        self.episode += 1
+        if seed is None:
+            seed = get_game_seed(self.root_seed, self.episode)
+        self.game = setup_game(self.strategies, seed, self.cards, self.wonders)
+        self.game.deal_age()
+        self.next_seat = 0
+        self.is_over = self.advance()
+
+    def play(self, action: int) -> float:
+        """Play the move of the agent and the other seats up to its next one, returns the reward"""
+        if self.game is None or self.is_over:
+            raise RuntimeError("The game is over, call reset")
+
+        player = self.player
+        move = self.codec.decode(action, player.name, player.hand)
+        mask = self.get_valid_actions()
+        if not mask.is_valid(mask.hand.index(move.card), move.action):
+            raise ValueError("Invalid move suggested")
+        self.game.make_move(move)
+        self.next_seat += 1
+
+        self.is_over = self.advance()
+        if not self.is_over:
+            return 0.0
+        return float(get_margin(self.get_totals(), self.seat))
+
+    def advance(self) -> bool:
+        """Play the other seats until the agent is to move, returns True once the game is over"""
+        game = self.game
+        assert game is not None
+        while True:
+            while self.next_seat < self.n_players:
+                if self.next_seat == self.seat:
+                    return False
+                game.make_turn(game.all_players[self.next_seat])
+                self.next_seat += 1
+            self.next_seat = 0
+            if game.next_turn() and game.next_age():
+                game.get_final_scores()
+                return True
+
+    def get_totals(self) -> List[int]:
+        assert self.game is not None, "Call reset first"
+        return [player.score.total for player in self.game.all_players]
+
+    def get_valid_actions(self) -> ActionMask:
+        game = self.game
+        assert game is not None, "Call reset first"
+        return get_action_mask(
+            self.player,
+            get_left_neighbor(self.seat, game.all_players).get_player_view(),
+            get_right_neighbor(self.seat, game.all_players).get_player_view(),
+        )
+
+    def get_observation(self) -> "array[float]":
+        out = array("f", bytes(4 * self.observation_size))
+        self.write_observation(out)
+        return out
+
+    def get_action_mask(self) -> "array[int]":
+        out = array("B", bytes(self.n_actions))
+        self.write_action_mask(out)
+        return out
+
+    def write_observation(self, out: "array[float]", offset: int = 0) -> None:
+        """Write the observation of the agent into a float buffer, e.g. a row of a batch"""
+        assert self.game is not None, "Call reset first"
+        self.encoder.write(self.game.get_game_view(), self.seat, self.player.hand, out, offset)
+
+    def write_action_mask(self, out: "array[int]", offset: int = 0) -> None:
+        """Write the valid actions into a byte buffer, all 0 once the game is over"""
+        if self.is_over:
+            out[offset : offset + self.n_actions] = array("B", bytes(self.n_actions))
+        else:
+            self.codec.write_mask(self.get_valid_actions(), out, offset)
@@ -0,0 +1,81 @@
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core.types import Card, Wonder
+from src.env.env import SevenWondersEnv
+from src.game.player import PlayerStrategy
+from src.simulation.runner import get_game_seed, get_root_seed
+from src.utils.parsers import load_cards, load_wonders
+
+VectorStepResult = Tuple[
+    "array[float]", "array[float]", "array[int]", "array[int]", Dict[str, Any]
+]
+
+
+class VectorEnv:
+    """
+    Many environments stepped with one call, each reset as soon as its game
+    ends. Results are stacked row by row in flat buffers allocated once:
+    observations are float32 of shape (n_envs, observation_size), action
+    masks uint8 of shape (n_envs, n_actions). They support the buffer
+    protocol, so e.g. numpy.frombuffer(observations, numpy.float32) wraps
+    them without a copy. The buffers are overwritten by the next call.
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        make_opponents: Callable[[], Sequence[PlayerStrategy]],
+        seat: int = 0,
+        seed: Optional[int] = None,
+        cards: Optional[Sequence[Card]] = None,
+        wonders: Optional[Sequence[Wonder]] = None,
+    ) -> None:
+        """make_opponents gives the strategies of one table, called once per environment"""
+        cards = load_cards() if cards is None else cards
+        wonders = load_wonders() if wonders is None else wonders
+        self.root_seed = get_root_seed(seed)
+        self.envs = [
+            SevenWondersEnv(
+                make_opponents(), seat, get_game_seed(self.root_seed, index), cards, wonders
+            )
+            for index in range(n_envs)
+        ]
+        self.n_envs = n_envs
+        self.observation_size = self.envs[0].observation_size
+        self.n_actions = self.envs[0].n_actions
+
+        self.observations = array("f", bytes(4 * n_envs * self.observation_size))
+        self.action_masks = array("B", bytes(n_envs * self.n_actions))
+        self.rewards = array("f", bytes(4 * n_envs))
+        self.terminated = array("B", bytes(n_envs))
+        self.truncated = array("B", bytes(n_envs))  # Games always end, kept for the API
+
+    def reset(self) -> Tuple["array[float]", Dict[str, Any]]:
+        for index, env in enumerate(self.envs):
+            env.start()
+            self.write(index, env)
+        return self.observations, {"action_mask": self.action_masks}
+
+    def step(self, actions: Sequence[int]) -> VectorStepResult:
+        """
+        Play one action in every environment. The info has the action masks
+        and, under "episodes", the index and final totals of each game that
+        ended: the observation of its row is already the first of the next one
+        """
+        assert len(actions) == self.n_envs, "One action per environment"
+        episodes: List[Tuple[int, List[int]]] = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            self.rewards[index] = env.play(action)
+            self.terminated[index] = env.is_over
+            if env.is_over:
+                episodes.append((index, env.get_totals()))
+                env.start()
+            self.write(index, env)
+
+        info = {"action_mask": self.action_masks, "episodes": episodes}
+        return self.observations, self.rewards, self.terminated, self.truncated, info
+
+    def write(self, index: int, env: SevenWondersEnv) -> None:
+        env.write_observation(self.observations, index * self.observation_size)
+        env.write_action_mask(self.action_masks, index * self.n_actions)
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+from src.core.enums import Action
+from src.core.types import Score
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import GameView, Player, PlayerStrategy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MOVE_TIMEOUT = 5.0  # Seconds
+
+
+class AsyncPlayerStrategy(ABC):
+    """Strategy that may wait on I/O, e.g. a bot running as a separate service"""
+
+    @abstractmethod
+    async def choose_move(self, player: Player, game_view: GameView) -> Move:
+        """Same contract as PlayerStrategy.choose_move"""
+        pass
+
+    async def close(self) -> None:
+        """Release connections or processes, called when the table is closed"""
+
+
+class SyncStrategyAdapter(AsyncPlayerStrategy):
+    """Seats a local strategy at an async table, it runs inline since it is fast"""
+
+    def __init__(self, strategy: PlayerStrategy) -> None:
+        self.strategy = strategy
+
+    async def choose_move(self, player: Player, game_view: GameView) -> Move:
+        return self.strategy.choose_move(player, game_view)
+
+
+def get_fallback_move(player: Player) -> Move:
+    """Move played for a seat that times out or fails: discarding is always valid"""
+    return Move(player.name, Action.DISCARD, player.hand[0])
+
+
+class AsyncTable:
+    """
+    Plays a game with async strategies. On each turn all the seats are asked at
+    once, against the same snapshot, and the turn is applied simultaneously,
+    so a turn lasts as long as the slowest seat and not the sum of all of them.
+    A seat that does not answer within the timeout, fails or returns an invalid
+    move plays the fallback move.
+    """
+
+    def __init__(
+        self,
+        game: GameState,
+        strategies: Sequence[AsyncPlayerStrategy],
+        move_timeout: float = DEFAULT_MOVE_TIMEOUT,
+    ) -> None:
+        assert len(strategies) == len(game.all_players), "One strategy per seat"
+        self.game = game
+        self.strategies = list(strategies)
+        self.move_timeout = move_timeout
+        self.fallbacks = [0] * len(strategies)  # Fallback moves played by each seat
+
+    async def choose_move(
+        self, seat: int, game_view: GameView, deadline: float
+    ) -> Move:
+        player = self.game.all_players[seat]
+        timeout = max(0.0, deadline - time.monotonic())
+        try:
+            move: Optional[Move] = await asyncio.wait_for(
+                self.strategies[seat].choose_move(player, game_view), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Player {player.name} timed out, playing the fallback move")
+            move = None
+        except Exception:
+            logger.exception(f"Player {player.name} failed, playing the fallback move")
+            move = None
+
+        if move is not None and not self.game.is_valid_turn_move(player, move, game_view):
+            logger.warning(f"Player {player.name} chose an invalid move {move}")
+            move = None
+
+        if move is None:
+            self.fallbacks[seat] += 1
+            return get_fallback_move(player)
+        return move
+
+    async def play_turn(self) -> List[Move]:
+        game_view = self.game.get_game_view()
+        deadline = time.monotonic() + self.move_timeout
+        moves = await asyncio.gather(
+            *(
+                self.choose_move(seat, game_view, deadline)
+                for seat in range(len(self.strategies))
+            )
+        )
+        self.game.apply_turn(game_view, moves)
+        return list(moves)
+
+    async def play_game(self) -> List[Score]:
+        """Play the whole game, returns the final scores by seat"""
+        game = self.game
+        game.deal_age()
+        while True:
+            await self.play_turn()
+            if game.next_turn() and game.next_age():
+                break
+        return game.get_final_scores()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(strategy.close() for strategy in self.strategies))
@@ -0,0 +1,382 @@
+import logging
+import random
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.core.constants import CARDS_PER_PLAYER, DISCARD_CARD_VALUE
+from src.core.enums import Action, Resource
+from src.core.types import Card, Score, Wonder
+from src.game.military import calculate_military_outcome
+from src.game.move import Move
+from src.game.player import (
+    ActionMask,
+    GameView,
+    PlayerView,
+    compute_action_mask,
+    count_multiplier,
+    get_payment_plan,
+)
+from src.game.production import ProductionLedger
+from src.game.scoring import calculate_total_score
+from src.utils.validators import get_random_cards, get_left_in_list, get_right_in_list
+
+logger = logging.getLogger(__name__)
+
+AGES = (1, 2, 3)
+
+
+class BatchPolicy(ABC):
+    """Strategy that picks the moves of one seat in all the games at once"""
+
+    @abstractmethod
+    def choose_moves(
+        self, players: Sequence[PlayerView], masks: Sequence[ActionMask]
+    ) -> List[Move]:
+        """Choose one of the moves of each action mask, players[i] owns masks[i]"""
+        pass
+
+
+class PriorityPolicy(BatchPolicy):
+    """
+    Takes the first valid move of the best action, in hand order. With the
+    default priority it plays like SimpleStrategy
+    """
+
+    def __init__(
+        self, priority: Sequence[Action] = (Action.WONDER, Action.PLAY, Action.DISCARD)
+    ) -> None:
+        self.priority = tuple(priority)
+
+    def choose_moves(
+        self, players: Sequence[PlayerView], masks: Sequence[ActionMask]
+    ) -> List[Move]:
+        moves = []
+        for mask in masks:
+            for action in self.priority:
+                move = next((move for move in mask.moves if move.action == action), None)
+                if move is not None:
+                    moves.append(move)
+                    break
+            else:
+                raise Exception("No valid moves found")
+        return moves
+
+
+class RandomPolicy(BatchPolicy):
+    """Takes a valid move at random, the usual policy of Monte Carlo playouts"""
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng = rng if rng is not None else random.Random()
+
+    def choose_moves(
+        self, players: Sequence[PlayerView], masks: Sequence[ActionMask]
+    ) -> List[Move]:
+        return [self.rng.choice(mask.moves) for mask in masks]
+
+
+class BatchState:
+    """
+    State of a batch of games played in lock-step, stored column-wise: every
+    column has one entry per (game, seat), at index game * n_players + seat.
+    All the games are at the same age and turn.
+    """
+
+    def __init__(
+        self,
+        wonders: Sequence[Sequence[Wonder]],
+        player_names: Sequence[str],
+    ) -> None:
+        self.n_games = len(wonders)
+        self.n_players = len(player_names)
+        assert all(len(seats) == self.n_players for seats in wonders), "One wonder per seat"
+
+        self.age = 1
+        self.turn = 1
+        self.player_names = tuple(player_names)
+        self.wonders: List[Wonder] = [wonder for seats in wonders for wonder in seats]
+
+        size = self.n_games * self.n_players
+        self.coins = array("q", [3] * size)
+        self.military_tokens = array("q", [0] * size)
+        self.stages_built = array("q", [0] * size)
+        self.card_masks: List[int] = [0] * size
+        self.cards: List[Tuple[Card, ...]] = [()] * size
+        self.hands: List[List[Card]] = [[] for _ in range(size)]
+        self.production: List[ProductionLedger] = [
+            ProductionLedger.for_wonder(wonder) for wonder in self.wonders
+        ]
+        self.discarded_cards: List[List[Card]] = [[] for _ in range(self.n_games)]
+        # Built on demand and kept until invalidated, anything that writes the
+        # columns of an entry must invalidate it
+        self.views: List[Optional[PlayerView]] = [None] * size
+
+    @classmethod
+    def from_game_view(
+        cls, game_view: GameView, hands: Sequence[Sequence[Sequence[Card]]]
+    ) -> "BatchState":
+        """
+        Copies of the position shown by the view, one per game, each with its
+        own hands by seat. The public state is shared, it is never mutated.
+        """
+        views = game_view.all_players_no_hand
+        state = cls([[view.wonder for view in views]] * len(hands), [view.name for view in views])
+        state.age = game_view.age
+        state.turn = game_view.turn
+        for game, game_hands in enumerate(hands):
+            assert len(game_hands) == state.n_players, "One hand per seat"
+            for view, hand in zip(views, game_hands):
+                index = state.index(game, view.position)
+                state.coins[index] = view.coins
+                state.military_tokens[index] = view.military_tokens
+                state.stages_built[index] = view.stages_built
+                state.card_masks[index] = view.card_mask
+                state.cards[index] = view.cards
+                state.production[index] = view.production
+                state.hands[index] = list(hand)
+            state.discarded_cards[game] = list(game_view.discarded_cards)
+        state.invalidate()
+        return state
+
+    def index(self, game: int, seat: int) -> int:
+        return game * self.n_players + seat
+
+    def invalidate(self, index: Optional[int] = None) -> None:
+        """Drop the cached view of an entry, or of all of them"""
+        if index is None:
+            self.views = [None] * len(self.views)
+        else:
+            self.views[index] = None
+
+    def get_player_view(self, game: int, seat: int) -> PlayerView:
+        index = self.index(game, seat)
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = self._build_player_view(index, seat)
+        return view
+
+    def _build_player_view(self, index: int, seat: int) -> PlayerView:
+        return PlayerView(
+            self.player_names[seat],
+            seat,
+            self.wonders[index],
+            self.cards[index],
+            self.coins[index],
+            self.military_tokens[index],
+            self.stages_built[index],
+            Score(),
+            self.card_masks[index],
+            self.production[index],
+            -1,  # Batch players are not versioned
+            len(self.hands[index]),
+        )
+
+    def get_neighbor_views(self, game: int, seat: int) -> Tuple[PlayerView, PlayerView]:
+        return (
+            self.get_player_view(game, get_left_in_list(seat, self.n_players)),
+            self.get_player_view(game, get_right_in_list(seat, self.n_players)),
+        )
+
+
+class BatchEngine:
+    """
+    Plays many games in lock-step: on each turn every seat chooses its moves in
+    all the games with a single policy call. Follows the same rules and draws
+    from the random generator in the same order as GameState.play_game, so a
+    game seeded with s matches the reference game given random.Random(s).
+    """
+
+    def __init__(
+        self,
+        deck: List[Card],
+        wonders: Sequence[Sequence[Wonder]],
+        policies: Sequence[BatchPolicy],
+        seeds: Sequence[int],
+        player_names: Optional[Sequence[str]] = None,
+        state: Optional[BatchState] = None,  # A position to start from, see play_to_end
+    ) -> None:
+        assert len(wonders) == len(seeds), "One seed per game"
+        if player_names is None:
+            player_names = [f"P{seat + 1}" for seat in range(len(policies))]
+        assert len(player_names) == len(policies), "One policy per seat"
+
+        self.deck = deck
+        self.policies = list(policies)
+        self.rngs = [random.Random(seed) for seed in seeds]
+        self.state = state if state is not None else BatchState(wonders, player_names)
+        assert self.state.n_games == len(seeds), "One seed per game"
+
+    def run(self) -> List[List[Score]]:
+        """Play all the games to the end, returns the scores by game and seat"""
+        self.deal_age()
+        return self.play_to_end()
+
+    def play_to_end(self, to_move: Optional[Sequence[int]] = None) -> List[List[Score]]:
+        """
+        Play from the current age and turn, with the hands of the age already
+        dealt. Only the seats in to_move, all of them by default, are still to
+        move this turn
+        """
+        state = self.state
+        seats: Sequence[int] = range(state.n_players) if to_move is None else to_move
+        while True:
+            for seat in seats:
+                self.play_seat(seat)
+            seats = range(state.n_players)
+            if self.next_turn():
+                if state.age == AGES[-1]:
+                    return self.get_scores()
+                state.age += 1
+                state.turn = 1
+                self.deal_age()
+
+    def deal_age(self) -> None:
+        state = self.state
+        n_cards = state.n_players * CARDS_PER_PLAYER
+        for game, rng in enumerate(self.rngs):
+            shuffled_cards = get_random_cards(
+                self.deck,
+                n_cards,
+                filter_age=[state.age],
+                filter_min_players=list(range(3, state.n_players + 1)),
+                unique=True,
+                rng=rng,
+            )
+            for seat in range(state.n_players):
+                start = seat * CARDS_PER_PLAYER
+                state.hands[state.index(game, seat)].extend(
+                    shuffled_cards[start : start + CARDS_PER_PLAYER]
+                )
+        state.invalidate()
+
+    def play_seat(self, seat: int) -> None:
+        """Let the policy of a seat move in every game"""
+        state = self.state
+        players = []
+        masks = []
+        for game in range(state.n_games):
+            player = state.get_player_view(game, seat)
+            left, right = state.get_neighbor_views(game, seat)
+            players.append(player)
+            masks.append(
+                compute_action_mask(player, state.hands[state.index(game, seat)], left, right)
+            )
+
+        moves = self.policies[seat].choose_moves(players, masks)
+        assert len(moves) == state.n_games, "The policy must return one move per game"
+
+        for game, (move, mask) in enumerate(zip(moves, masks)):
+            index = mask.hand.index(move.card)
+            if not mask.is_valid(index, move.action):
+                raise ValueError("Invalid move suggested")
+            self.apply_move(game, seat, move)
+
+    def apply_move(self, game: int, seat: int, move: Move) -> None:
+        """Apply a valid move, same as GameState.make_move"""
+        state = self.state
+        index = state.index(game, seat)
+        card = move.card
+
+        if move.action == Action.PLAY:
+            player = state.get_player_view(game, seat)
+            if not player.can_chain(card):
+                self.pay(game, seat, card.cost)
+
+            state.cards[index] = state.cards[index] + (card,)
+            state.card_masks[index] |= card.mask
+            state.production[index] = state.production[index].with_card(card)
+            state.invalidate(index)
+
+            effect = card.parsed_effect
+            coins = effect.coins
+            if effect.coins_per is not None:
+                left, right = state.get_neighbor_views(game, seat)
+                coins += count_multiplier(
+                    effect.coins_per, state.get_player_view(game, seat), left, right
+                )
+            state.coins[index] += coins
+
+        elif move.action == Action.WONDER:
+            stage = state.wonders[index].stages[state.stages_built[index]]
+            self.pay(game, seat, stage.cost)
+            state.stages_built[index] += 1
+            state.production[index] = state.production[index].with_effect(
+                stage.parsed_effect, tradable=False
+            )
+            state.coins[index] += stage.parsed_effect.coins
+
+        elif move.action == Action.DISCARD:
+            state.coins[index] += DISCARD_CARD_VALUE
+            state.discarded_cards[game].append(card)
+
+        state.hands[index].remove(card)
+        state.invalidate(index)
+
+    def pay(self, game: int, seat: int, cost: Mapping[Resource, int]) -> None:
+        state = self.state
+        index = state.index(game, seat)
+        left, right = state.get_neighbor_views(game, seat)
+        plan = get_payment_plan(
+            state.get_player_view(game, seat), left, right, cost, rng=self.rngs[game]
+        )
+        if plan is None:
+            raise ValueError(f"Player {state.player_names[seat]} cannot afford the cost")
+
+        state.coins[index] -= cost.get(Resource.COIN, 0) + plan.total
+        state.coins[state.index(game, left.position)] += plan.left
+        state.coins[state.index(game, right.position)] += plan.right
+        state.invalidate(index)
+        state.invalidate(state.index(game, left.position))
+        state.invalidate(state.index(game, right.position))
+
+    def next_turn(self) -> bool:
+        """Pass the hands on, or end the age. Returns True if the age is complete"""
+        state = self.state
+        n_players = state.n_players
+
+        if all(len(hand) < 2 for hand in state.hands):
+            for game in range(state.n_games):
+                for seat in range(n_players):
+                    index = state.index(game, seat)
+                    state.discarded_cards[game].extend(state.hands[index])
+                    state.hands[index] = []
+
+                # Tokens are applied after all the battles of the game are resolved
+                outcomes = []
+                for seat in range(n_players):
+                    player = state.get_player_view(game, seat)
+                    outcomes.append(
+                        calculate_military_outcome(
+                            player, state.get_neighbor_views(game, seat), state.age
+                        )
+                    )
+                for seat, tokens in enumerate(outcomes):
+                    state.military_tokens[state.index(game, seat)] += tokens
+            state.invalidate()
+            return True
+
+        # Clockwise in ages 1 and 3, counter-clockwise in age 2
+        get_next = get_right_in_list if state.age in [1, 3] else get_left_in_list
+        for game in range(state.n_games):
+            start = state.index(game, 0)
+            old_hands = state.hands[start : start + n_players]
+            for seat in range(n_players):
+                state.hands[start + seat] = old_hands[get_next(seat, n_players)]
+
+        state.turn += 1
+        return False
+
+    def get_scores(self) -> List[List[Score]]:
+        state = self.state
+        scores = []
+        for game in range(state.n_games):
+            scores.append(
+                [
+                    calculate_total_score(
+                        state.get_player_view(game, seat),
+                        *state.get_neighbor_views(game, seat),
+                    )
+                    for seat in range(state.n_players)
+                ]
+            )
+        return scores
@@ -0,0 +1,263 @@
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.core.catalog import CardCatalog
+from src.core.enums import Resource
+from src.core.types import Card, Wonder
+from src.game.game_state import GameState
+from src.game.player import Player, PlayerStrategy
+from src.game.production import RESOURCE_INDEX, TRADABLE_RESOURCES, ProductionLedger
+
+# Bits used in each signed 64-bit word of a card bitset
+WORD_BITS = 63
+WORD_MASK = (1 << WORD_BITS) - 1
+N_RESOURCES = len(TRADABLE_RESOURCES)
+
+
+class CompactLayout:
+    """
+    Fixed part of a compact game: who plays which wonder, the cards that can
+    appear and where each field lives in the buffer. Shared by all the states
+    of the same game, only the buffer is copied.
+    """
+
+    def __init__(
+        self, catalog: CardCatalog, wonders: Sequence[Wonder], player_names: Sequence[str]
+    ) -> None:
+        assert len(wonders) == len(player_names), "One wonder per player"
+        self.catalog = catalog
+        self.wonders: Tuple[Wonder, ...] = tuple(wonders)
+        self.player_names: Tuple[str, ...] = tuple(player_names)
+        self.n_players = len(player_names)
+        self.n_card_ids = max(catalog.get_ids(), default=-1) + 1
+        self.n_words = max(1, -(-self.n_card_ids // WORD_BITS))
+
+        # Offsets of the columns, each has one entry per player unless noted
+        n = self.n_players
+        self.age_offset = 0
+        self.turn_offset = 1
+        self.coins_offset = 2
+        self.military_offset = self.coins_offset + n
+        self.stages_offset = self.military_offset + n
+        self.production_offset = self.stages_offset + n  # N_RESOURCES per player
+        self.tableau_offset = self.production_offset + n * N_RESOURCES  # n_words per player
+        self.hand_offset = self.tableau_offset + n * self.n_words  # n_words per player
+        self.discard_offset = self.hand_offset + n * self.n_words  # One per card ID
+        self.size = self.discard_offset + self.n_card_ids
+
+        # Fixed production of each card, added to the column when it is built
+        self.card_production: List[Tuple[int, ...]] = [
+            (0,) * N_RESOURCES for _ in range(self.n_card_ids)
+        ]
+        for card_id in catalog.get_ids():
+            card = catalog.get(card_id)
+            vector = [0] * N_RESOURCES
+            for resource, amount in card.parsed_effect.production:
+                vector[RESOURCE_INDEX[resource]] += amount
+            self.card_production[card_id] = tuple(vector)
+
+    def get_empty_state(self) -> "CompactState":
+        return CompactState(self, array("q", bytes(8 * self.size)))
+
+
+class CompactState:
+    """
+    Struct-of-arrays form of a game position, stored in a single array of
+    signed 64-bit integers. Cards are ID bitsets, so hands and tableaux are a
+    few words each, and cloning a position is one buffer copy.
+    """
+
+    __slots__ = ("layout", "data")
+
+    def __init__(self, layout: CompactLayout, data: "array[int]") -> None:
+        assert len(data) == layout.size, "Buffer does not match the layout"
+        self.layout = layout
+        self.data = data
+
+    def copy(self) -> "CompactState":
+        return CompactState(self.layout, self.data[:])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactState):
+            return NotImplemented
+        return self.layout is other.layout and self.data == other.data
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize
+
+    @property
+    def age(self) -> int:
+        return self.data[self.layout.age_offset]
+
+    @age.setter
+    def age(self, age: int) -> None:
+        self.data[self.layout.age_offset] = age
+
+    @property
+    def turn(self) -> int:
+        return self.data[self.layout.turn_offset]
+
+    @turn.setter
+    def turn(self, turn: int) -> None:
+        self.data[self.layout.turn_offset] = turn
+
+    def get_coins(self, player: int) -> int:
+        return self.data[self.layout.coins_offset + player]
+
+    def add_coins(self, player: int, amount: int) -> None:
+        assert self.get_coins(player) + amount >= 0, "Coins cannot be negative"
+        self.data[self.layout.coins_offset + player] += amount
+
+    def get_military_tokens(self, player: int) -> int:
+        return self.data[self.layout.military_offset + player]
+
+    def add_military_tokens(self, player: int, amount: int) -> None:
+        self.data[self.layout.military_offset + player] += amount
+
+    def get_stages_built(self, player: int) -> int:
+        return self.data[self.layout.stages_offset + player]
+
+    def add_stage(self, player: int) -> None:
+        stages_built = self.get_stages_built(player)
+        stage = self.layout.wonders[player].stages[stages_built]
+        self.data[self.layout.stages_offset + player] += 1
+        self._add_production(player, stage.parsed_effect.production)
+
+    def get_production(self, player: int) -> Tuple[int, ...]:
+        """Fixed units per resource, indexed like TRADABLE_RESOURCES"""
+        start = self.layout.production_offset + player * N_RESOURCES
+        return tuple(self.data[start : start + N_RESOURCES])
+
+    def get_ledger(self, player: int) -> ProductionLedger:
+        """Full production, with the multiple choice producers and the discounts"""
+        return ProductionLedger.for_player(
+            self.layout.wonders[player],
+            list(self.get_tableau(player)),
+            self.get_stages_built(player),
+        )
+
+    def get_tableau_mask(self, player: int) -> int:
+        return self._get_mask(self.layout.tableau_offset + player * self.layout.n_words)
+
+    def get_tableau(self, player: int) -> Iterable[Card]:
+        return self.layout.catalog.iter_mask(self.get_tableau_mask(player))
+
+    def add_card(self, player: int, card: Card) -> None:
+        offset = self.layout.tableau_offset + player * self.layout.n_words
+        assert not self._get_mask(offset) >> card.id & 1, "Card already built"
+        self._set_bit(offset, card.id)
+        vector = self.layout.card_production[card.id]
+        start = self.layout.production_offset + player * N_RESOURCES
+        for index, amount in enumerate(vector):
+            if amount:
+                self.data[start + index] += amount
+
+    def get_hand_mask(self, player: int) -> int:
+        return self._get_mask(self.layout.hand_offset + player * self.layout.n_words)
+
+    def set_hand_mask(self, player: int, mask: int) -> None:
+        self._set_mask(self.layout.hand_offset + player * self.layout.n_words, mask)
+
+    def get_hand(self, player: int) -> List[Card]:
+        return list(self.layout.catalog.iter_mask(self.get_hand_mask(player)))
+
+    def remove_from_hand(self, player: int, card: Card) -> None:
+        offset = self.layout.hand_offset + player * self.layout.n_words
+        word, bit = divmod(card.id, WORD_BITS)
+        assert self.data[offset + word] >> bit & 1, "Card not in hand"
+        self.data[offset + word] ^= 1 << bit
+
+    def get_discarded_count(self, card: Card) -> int:
+        return self.data[self.layout.discard_offset + card.id]
+
+    def discard_card(self, card: Card) -> None:
+        self.data[self.layout.discard_offset + card.id] += 1
+
+    def get_discarded_cards(self) -> List[Card]:
+        """The discard pile in card ID order, the order of the discards is not kept"""
+        offset = self.layout.discard_offset
+        return [
+            self.layout.catalog.get(card_id)
+            for card_id in range(self.layout.n_card_ids)
+            for _ in range(self.data[offset + card_id])
+        ]
+
+    def _add_production(self, player: int, production: Iterable[Tuple[Resource, int]]) -> None:
+        start = self.layout.production_offset + player * N_RESOURCES
+        for resource, amount in production:
+            self.data[start + RESOURCE_INDEX[resource]] += amount
+
+    def _get_mask(self, offset: int) -> int:
+        mask = 0
+        for word in range(self.layout.n_words):
+            mask |= self.data[offset + word] << (word * WORD_BITS)
+        return mask
+
+    def _set_mask(self, offset: int, mask: int) -> None:
+        assert mask >> (self.layout.n_words * WORD_BITS) == 0, "Card ID out of the layout"
+        for word in range(self.layout.n_words):
+            self.data[offset + word] = mask >> (word * WORD_BITS) & WORD_MASK
+
+    def _set_bit(self, offset: int, card_id: int) -> None:
+        word, bit = divmod(card_id, WORD_BITS)
+        self.data[offset + word] |= 1 << bit
+
+
+def to_compact(game: GameState, layout: Optional[CompactLayout] = None) -> CompactState:
+    """
+    Convert a game state. Without a layout, one is made from the deck and the
+    cards already in play. Hand and discard order, scores and strategies are
+    not part of the compact state.
+    """
+    players = game.all_players
+    if layout is None:
+        cards = list(game.deck) + list(game.discarded_cards)
+        for player in players:
+            cards.extend(player.cards)
+            cards.extend(player.hand)
+        layout = CompactLayout(
+            CardCatalog(cards),
+            [player.wonder for player in players],
+            [player.name for player in players],
+        )
+
+    state = layout.get_empty_state()
+    state.age = game.age
+    state.turn = game.turn
+    for index, player in enumerate(players):
+        assert player.position == index, "Players must be stored in seat order"
+        state.data[layout.coins_offset + index] = player.coins
+        state.data[layout.military_offset + index] = player.military_tokens
+        state.data[layout.stages_offset + index] = player.stages_built
+        start = layout.production_offset + index * N_RESOURCES
+        state.data[start : start + N_RESOURCES] = array("q", player.production.fixed)
+        state._set_mask(layout.tableau_offset + index * layout.n_words, player.card_mask)
+        state.set_hand_mask(index, player.get_hand_mask())
+    for card_id, count in game.discarded_counts.items():
+        state.data[layout.discard_offset + card_id] = count
+
+    return state
+
+
+def from_compact(
+    state: CompactState, strategies: Sequence[PlayerStrategy], deck: List[Card]
+) -> GameState:
+    """Build a game state from a compact one, with cards in ID order"""
+    layout = state.layout
+    players = []
+    for index, strategy in enumerate(strategies):
+        player = Player(layout.player_names[index], index, layout.wonders[index], strategy)
+        player.add_coins(state.get_coins(index) - player.coins)
+        player.add_military_tokens(state.get_military_tokens(index))
+        player.stages_built = state.get_stages_built(index)
+        player.cards = list(state.get_tableau(index))
+        player.add_to_hand(state.get_hand(index))
+        players.append(player)
+
+    game = GameState(players, deck)
+    game.age = state.age
+    game.turn = state.turn
+    game.discard_cards(state.get_discarded_cards())
+    game.rehash()
+    return game
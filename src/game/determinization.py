@@ -0,0 +1,106 @@
+import random
+from collections import Counter
+from typing import List, Optional, Sequence
+
+from src.core.types import Card
+from src.game.game_state import GameState, get_age_deck
+from src.game.player import GameView, Player, PlayerSnapshot, PlayerStrategy
+
+
+def get_unseen_cards(player: Player, game_view: GameView, deck: Sequence[Card]) -> List[Card]:
+    """
+    Cards of the current age the player cannot see: neither in its hand, nor
+    built by anyone, nor discarded. The hidden hands are drawn from them, along
+    with the cards tucked under wonder stages and, in age 3, the unused guilds
+    """
+    visible = Counter(card.id for card in player.hand)
+    for view in game_view.all_players_no_hand:
+        visible.update(card.id for card in view.cards if card.age == game_view.age)
+    visible.update(card.id for card in game_view.discarded_cards if card.age == game_view.age)
+
+    unseen = []
+    for card in get_age_deck(list(deck), game_view.age, len(game_view.all_players_no_hand)):
+        if visible[card.id]:
+            visible[card.id] -= 1
+        else:
+            unseen.append(card)
+    return unseen
+
+
+def build_game(
+    player: Player,
+    game_view: GameView,
+    deck: Sequence[Card],
+    strategies: Sequence[PlayerStrategy],
+    rng: Optional[random.Random] = None,
+) -> GameState:
+    """
+    Game state rebuilt from what the player knows: the public table and its own
+    hand. The other hands are left empty, see deal_hidden_hands. The immutable
+    parts of the views are shared, so this costs a few objects per seat.
+    """
+    players = []
+    for view, strategy in zip(game_view.all_players_no_hand, strategies):
+        simulated = Player(view.name, view.position, view.wonder, strategy)
+        simulated.restore(
+            PlayerSnapshot(
+                view.cards,
+                view.card_mask,
+                view.coins,
+                view.military_tokens,
+                view.stages_built,
+                view.production,
+                view.score,
+                tuple(player.hand) if view.position == player.position else (),
+                simulated.version,  # Fresh, so no cache mistakes it for the real player
+                0,  # Rehashed below
+            )
+        )
+        players.append(simulated)
+
+    game = GameState(players, list(deck), rng)
+    game.age = game_view.age
+    game.turn = game_view.turn
+    game.discarded_cards = game_view.discarded_cards
+    game.discarded_counts = Counter(card.id for card in game_view.discarded_cards)
+    game.rehash()
+    return game
+
+
+def sample_hidden_hands(
+    game_view: GameView,
+    position: int,
+    hand: Sequence[Card],
+    unseen: Sequence[Card],
+    rng: random.Random,
+) -> List[List[Card]]:
+    """
+    Hands of all the seats, the hidden ones drawn at random from the unseen
+    cards with the sizes shown by the view, and the known hand at position
+    """
+    sizes = [view.hand_size for view in game_view.all_players_no_hand]
+    others = [seat for seat in range(len(sizes)) if seat != position]
+    cards = rng.sample(list(unseen), sum(sizes[seat] for seat in others))
+    hands = [list(hand) if seat == position else [] for seat in range(len(sizes))]
+    start = 0
+    for seat in others:
+        hands[seat] = cards[start : start + sizes[seat]]
+        start += sizes[seat]
+    return hands
+
+
+def deal_hidden_hands(
+    game: GameState,
+    game_view: GameView,
+    position: int,
+    unseen: Sequence[Card],
+    rng: random.Random,
+) -> None:
+    """
+    Deal the hidden hands at random from the unseen cards, each with the size
+    shown by the view. Recorded in the journal, so pop takes them back.
+    """
+    hands = sample_hidden_hands(game_view, position, (), unseen, rng)
+    for seat, hand in enumerate(hands):
+        if seat != position:
+            game.all_players[seat].add_to_hand(hand)
@@ -0,0 +1,196 @@
+import logging
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, TypeVar
+
+from src.core.enums import Action
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player, get_action_mask, get_left_neighbor, get_right_neighbor
+from src.game.scoring import calculate_total_score, get_margin
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsLenAndGetItem
+
+logger = logging.getLogger(__name__)
+
+LAST_AGE = 3
+DEFAULT_MAX_CARDS = 2  # The last pick of the game, 3 for the last two
+DEFAULT_MAX_ENTRIES = 1 << 16
+
+# Tried first to last, so that among moves of equal value the solver keeps
+# the one SimpleStrategy would play
+ACTION_ORDER = {Action.WONDER: 0, Action.PLAY: 1, Action.DISCARD: 2}
+
+Totals = Tuple[int, ...]  # Final total score of each seat
+
+T = TypeVar("T")
+
+
+class FirstChoice(random.Random):
+    """
+    Generator whose choice always takes the first option. Breaks the payment
+    ties of a search the same way on every path, so a position always has the
+    same value, and leaves the random streams of the game untouched
+    """
+
+    def choice(self, seq: "SupportsLenAndGetItem[T]") -> T:
+        return seq[0]
+
+
+@dataclass
+class EndgameSolution:
+    move: Move  # Best move of the seat to move
+    totals: Totals  # Final totals when every seat plays its best move from here
+    nodes: int  # Positions searched for this solution, the others came from the table
+
+
+@dataclass
+class TableEntry:
+    key: Tuple[object, ...]  # Exact position and seats to move, rules out hash collisions
+    totals: Totals
+    move: Optional[Move]  # None at the end of the game
+
+
+def is_endgame(game: GameState, max_cards: int = DEFAULT_MAX_CARDS) -> bool:
+    """The last age, with no hand holding more than max_cards cards"""
+    hand_size = max(len(player.hand) for player in game.all_players)
+    return game.age == LAST_AGE and hand_size <= max_cards
+
+
+def get_seats_to_move(game: GameState, seat: int) -> Tuple[int, ...]:
+    """
+    Seats still to move this turn, seat first, then the others in order. The
+    ones that already moved hold a card fewer than seat, under simultaneous
+    play none has
+    """
+    hand_size = len(game.all_players[seat].hand)
+    others = [
+        player.position
+        for player in game.all_players
+        if len(player.hand) == hand_size and player.position != seat
+    ]
+    return (seat, *others)
+
+
+def get_final_totals(game: GameState) -> Totals:
+    players = game.all_players
+    return tuple(
+        calculate_total_score(
+            player,
+            get_left_neighbor(player.position, players),
+            get_right_neighbor(player.position, players),
+        ).total
+        for player in players
+    )
+
+
+class EndgameSolver:
+    """
+    Exact solver of the last picks of the game, with every hand known. The
+    seat solved for moves first, then the other seats still to move this turn
+    and every seat in the later turns, in order and seeing the moves before
+    theirs as in GameState.play_game. Each chooses the move that gives it the
+    best final margin over the best other seat, knowing the seats after it do
+    the same (max-n search).
+
+    Payment ties between the neighbors go to the cheapest plan for the left
+    one, see FirstChoice, where the game draws at random: the totals can be
+    off by a coin split from what the game will give.
+
+    Positions are kept in a transposition table by Zobrist hash and seats to
+    move, checked against the exact position key, so a seat moving after
+    another one in the same turn finds most of its tree already solved. On the
+    last turn the cards left are discarded and nothing scores the discard pile
+    or the card under a stage, so the solver tries one wonder move and one
+    discard only.
+    """
+
+    def __init__(
+        self,
+        max_cards: int = DEFAULT_MAX_CARDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.max_cards = max_cards
+        self.max_entries = max_entries
+        self.table: Dict[Tuple[int, Tuple[int, ...]], TableEntry] = {}
+        self.nodes = 0
+        self.hits = 0
+        self.rng = FirstChoice()
+
+    def solve(self, game: GameState, seat: int) -> EndgameSolution:
+        """Best move of seat and the final totals, the game is left as it was"""
+        if not is_endgame(game, self.max_cards):
+            raise ValueError(f"Not an endgame: age {game.age}, more than {self.max_cards} cards")
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+
+        nodes = self.nodes
+        rngs = [player.rng for player in game.all_players]
+        for player in game.all_players:
+            player.rng = self.rng
+        game.push()
+        try:
+            totals, move = self.search(game, get_seats_to_move(game, seat))
+        finally:
+            game.pop()
+            for player, rng in zip(game.all_players, rngs):
+                player.rng = rng
+
+        assert move is not None, "The game is already over"
+        return EndgameSolution(move, totals, self.nodes - nodes)
+
+    def search(
+        self, game: GameState, to_move: Tuple[int, ...]
+    ) -> Tuple[Totals, Optional[Move]]:
+        """
+        Value of the position with the seats of to_move still to move this turn,
+        the first one next. Changes are undone by the caller
+        """
+        if not to_move:
+            if game.next_turn():
+                return get_final_totals(game), None
+            to_move = tuple(range(len(game.all_players)))
+
+        seat = to_move[0]
+        table_key = (game.get_hash(), to_move)
+        entry = self.table.get(table_key)
+        if entry is not None and entry.key == (game.get_position_key(), to_move):
+            self.hits += 1
+            return entry.totals, entry.move
+
+        self.nodes += 1
+        best: Optional[Totals] = None
+        best_move: Optional[Move] = None
+        for move in self.get_moves(game, game.all_players[seat]):
+            game.push()
+            game.make_move(move)
+            totals, _ = self.search(game, to_move[1:])
+            game.pop()
+            if best is None or get_margin(totals, seat) > get_margin(best, seat):
+                best, best_move = totals, move
+
+        assert best is not None, "No valid moves found"
+        self.table[table_key] = TableEntry((game.get_position_key(), to_move), best, best_move)
+        return best, best_move
+
+    def get_moves(self, game: GameState, player: Player) -> List[Move]:
+        """Valid moves in search order, without the repeats of the last turn"""
+        left = get_left_neighbor(player.position, game.all_players).get_player_view()
+        right = get_right_neighbor(player.position, game.all_players).get_player_view()
+        moves = sorted(
+            get_action_mask(player, left, right).moves,
+            key=lambda move: ACTION_ORDER[move.action],
+        )
+        if len(player.hand) > 2:
+            return moves
+
+        # Last pick, the card is all that differs between two wonder moves or
+        # two discards and it does not score
+        seen = set()
+        unique = []
+        for move in moves:
+            if move.action == Action.PLAY or move.action not in seen:
+                seen.add(move.action)
+                unique.append(move)
+        return unique
@@ -1,32 +1,101 @@
 import logging
-from copy import deepcopy
-from typing import Dict, List
+import random
+from collections import Counter
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from src.core.constants import CARDS_PER_PLAYER, DISCARD_CARD_VALUE
-from src.core.enums import Action
-from src.core.types import Card
+from src.core.enums import Action, Resource
+from src.core.types import Card, Score, WonderStage
+from src.game.journal import Journal
 from src.game.military import apply_military_tokens_to_all, resolve_military_conflicts
 from src.game.move import Move
 from src.game.player import (
     GameView,
     Player,
+    PlayerSnapshot,
     PlayerView,
     get_left_neighbor,
+    get_payment_plan,
     get_right_neighbor,
     is_valid_move,
 )
-from src.utils.validators import get_random_cards, get_left_in_list, get_right_in_list
+from src.game.scoring import calculate_total_score
+from src.game.zobrist import Feature, zobrist_key
+from src.utils.validators import (
+    drop_duplicates_cards,
+    get_random_cards,
+    get_left_in_list,
+    get_right_in_list,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class GameSnapshot:
+    """State of the game at some point, see GameState.snapshot"""
+
+    age: int
+    turn: int
+    turns_played: int
+    discarded_cards: Tuple[Card, ...]
+    discarded_counts: Tuple[Tuple[int, int], ...]
+    players: Tuple[PlayerSnapshot, ...]
+    zobrist: int
+
+
+def get_age_deck(deck: List[Card], age: int, n_players: int) -> List[Card]:
+    """Cards of an age for the number of players, the deal is drawn from them"""
+    return drop_duplicates_cards(
+        [card for card in deck if card.age == age and 3 <= card.min_players <= n_players]
+    )
+
+
+def check_player_count(deck: List[Card], n_players: int) -> None:
+    """Raise ValueError unless every age of the deck deals a full hand to each player"""
+    for age in (1, 2, 3):
+        n_cards = len(get_age_deck(deck, age, n_players))
+        if n_cards < n_players * CARDS_PER_PLAYER:
+            raise ValueError(
+                f"The deck cannot seat {n_players} players: age {age} has {n_cards} "
+                f"distinct cards for them, {n_players * CARDS_PER_PLAYER} are needed"
+            )
+
+
 class GameState:
-    def __init__(self, players: List[Player], deck: List[Card]) -> None:
+    def __init__(
+        self,
+        players: List[Player],
+        deck: List[Card],
+        rng: Optional[random.Random] = None,
+        seat_rngs: Optional[Sequence[random.Random]] = None,
+    ) -> None:
         self.age = 1
         self.turn = 1
+        self.turns_played = 0  # Over all the ages
         self.all_players = players
         self.deck = deck
-        self.discarded_cards: List[Card] = []
+        self.discarded_cards: Tuple[Card, ...] = ()
+        self.discarded_counts: Counter[int] = Counter()  # Card ID -> copies discarded
+
+        # Everything random in the game draws from this generator, so a game is
+        # reproducible from the seed of the generator alone. With seat_rngs, the
+        # trading tie-breaks of each seat draw from their own generator instead,
+        # so the deals do not depend on the moves and two games with the same
+        # seeds give the same random numbers to the same seat
+        self.rng = rng if rng is not None else random.Random()
+        assert seat_rngs is None or len(seat_rngs) == len(players), "One generator per seat"
+
+        # Shared with the players, so that every change can be undone with pop
+        self.journal = Journal()
+        for seat, player in enumerate(players):
+            player.journal = self.journal
+            player.rng = self.rng if seat_rngs is None else seat_rngs[seat]
+
+        # Zobrist hash of age, turn and discard pile, the players keep their own
+        self.zobrist = self._compute_zobrist()
 
         logger.info(f"Game state created with {len(players)} players")
 
@@ -42,13 +111,9 @@ class GameState:
         n_cards = len(self.all_players) * CARDS_PER_PLAYER
 
         shuffled_cards = get_random_cards(
-            self.deck,
+            get_age_deck(self.deck, self.age, len(self.all_players)),
             n_cards,
-            filter_age=[self.age],  # Only cards for the current age
-            filter_min_players=list(
-                range(3, len(self.all_players) + 1)
-            ),  # Only cards for the current number of players
-            unique=True,
+            rng=self.rng,
         )
 
         logger.info(f"Dealing {n_cards} cards for age {self.age}")
@@ -63,21 +128,31 @@ class GameState:
         if self.age == 3:
             return True # Game is complete
         
+        self.journal.record(self, "age", "turn", "zobrist")
+        self.zobrist ^= zobrist_key(Feature.AGE, self.age) ^ zobrist_key(
+            Feature.TURN, self.turn
+        )
         self.age += 1
         self.turn = 1
+        self.zobrist ^= zobrist_key(Feature.AGE, self.age) ^ zobrist_key(
+            Feature.TURN, self.turn
+        )
         
         self.deal_age()
         return False        
 
     def next_turn(self) -> bool:
         """Advance to next turn, return True if age is complete"""
+        self.journal.record(self, "turns_played")
+        self.turns_played += 1
+
         if all(len(player.hand) < 2 for player in self.all_players):
             # Last card of the age
             # TODO: some effect allow on the last card to be played, check this
 
             # Discard cards from players
             for player in self.all_players:
-                self.discarded_cards.extend(player.hand)
+                self.discard_cards(player.hand)
                 player.discard_hand()
 
             # Handle military conflicts at end of age
@@ -87,8 +162,11 @@ class GameState:
             return True
 
         self.rotate_hands()
-        
+
+        self.journal.record(self, "turn", "zobrist")
+        self.zobrist ^= zobrist_key(Feature.TURN, self.turn)
         self.turn += 1
+        self.zobrist ^= zobrist_key(Feature.TURN, self.turn)
         return False
 
     def rotate_hands(self) -> None:
@@ -101,24 +179,145 @@ class GameState:
             next_index = get_right_in_list(i, n_players) if self.age in [1, 3] else get_left_in_list(i, n_players)
             next_player = self.all_players[next_index]
             
-            player.discard_hand()
-            player.add_to_hand(old_hands[next_player])
+            player.hand = old_hands[next_player]
             
 
+    def play_game(self, simultaneous: bool = False) -> List[Score]:
+        """
+        Play a whole game: on each turn every player moves, then hands are passed
+        on or the age ends. Returns the final scores by seat. Players move in
+        seat order, each seeing the moves before it, unless simultaneous is set
+        """
+        self.deal_age()
+        while True:
+            if simultaneous:
+                self.resolve_turn()
+            else:
+                for player in self.all_players:
+                    self.make_turn(player)
+            if self.next_turn() and self.next_age():
+                break
+
+        return self.get_final_scores()
+
+    def get_final_scores(self) -> List[Score]:
+        """Score every player at the end of the game, returns the scores by seat"""
+        for player in self.all_players:
+            player.score = calculate_total_score(
+                player,
+                get_left_neighbor(player.position, self.all_players),
+                get_right_neighbor(player.position, self.all_players),
+            )
+        return [player.score for player in self.all_players]
+
+    def resolve_turn(self, executor: Optional[Executor] = None) -> List[Move]:
+        """
+        Play a turn as in the real game: all the players choose at once from the
+        same snapshot (in parallel if an executor is given), then all the moves
+        are applied together. Payments are settled against the snapshot, so
+        coins received in the turn cannot be spent in it, and instant coin
+        effects count the tableaux at the end of the turn. If any move is
+        invalid nothing is applied.
+        """
+        game_view = self.get_game_view()
+
+        def choose_move(player: Player) -> Move:
+            return player.strategy.choose_move(player, game_view)
+
+        if executor is None:
+            moves = [choose_move(player) for player in self.all_players]
+        else:
+            moves = list(executor.map(choose_move, self.all_players))
+
+        self.apply_turn(game_view, moves)
+        return moves
+
+    def is_valid_turn_move(self, player: Player, move: Move, game_view: GameView) -> bool:
+        """Check a move of the player against the snapshot of the turn"""
+        all_player_views = game_view.all_players_no_hand
+        return bool(
+            move.player_name == player.name
+            and move.card in player.hand
+            and is_valid_move(
+                all_player_views[player.position],
+                move,
+                player.get_left_neighbor(all_player_views),
+                player.get_right_neighbor(all_player_views),
+            )
+        )
+
+    def apply_turn(self, game_view: GameView, moves: Sequence[Move]) -> None:
+        """
+        Apply the moves of all the players, chosen from the snapshot of the turn,
+        see resolve_turn. If any move is invalid nothing is applied
+        """
+        if len(moves) != len(self.all_players):
+            raise ValueError("One move per player is needed")
+        all_player_views = game_view.all_players_no_hand
+
+        # Check every move first, pricing a payment may draw from the generators
+        for player, move in zip(self.all_players, moves):
+            if not self.is_valid_turn_move(player, move, game_view):
+                raise ValueError(f"Invalid move suggested by {player.name}")
+
+        # Then price the payments, still before changing anything
+        payments: List[Tuple[int, int, int]] = []
+        stages: List[Optional[WonderStage]] = []
+        for player, move in zip(self.all_players, moves):
+            player_view = all_player_views[player.position]
+            left_view = player.get_left_neighbor(all_player_views)
+            right_view = player.get_right_neighbor(all_player_views)
+
+            stage = None
+            cost: Mapping[Resource, int] = {}
+            if move.action == Action.PLAY and not player_view.can_chain(move.card):
+                cost = move.card.cost
+            elif move.action == Action.WONDER:
+                stage = player_view.get_current_wonder_stage_to_be_built()
+                cost = stage.cost
+            stages.append(stage)
+
+            plan = get_payment_plan(player_view, left_view, right_view, cost, player.rng)
+            assert plan is not None, "Valid moves are affordable"
+            payments.append((cost.get(Resource.COIN, 0) + plan.total, plan.left, plan.right))
+
+        for player, move, (paid, to_left, to_right) in zip(self.all_players, moves, payments):
+            player.add_coins(-paid)
+            get_left_neighbor(player.position, self.all_players).add_coins(to_left)
+            get_right_neighbor(player.position, self.all_players).add_coins(to_right)
+
+            if move.action == Action.PLAY:
+                player.add_card(move.card)
+            elif move.action == Action.WONDER:
+                player.add_stage()
+            elif move.action == Action.DISCARD:
+                player.add_coins(DISCARD_CARD_VALUE)
+                self.discard_cards([move.card])
+            player.remove_from_hand(move.card)
+
+        all_player_views = self.get_all_player_views()
+        for player, move, stage in zip(self.all_players, moves, stages):
+            if move.action == Action.PLAY:
+                player.apply_card_effects(
+                    move.card,
+                    player.get_left_neighbor(all_player_views),
+                    player.get_right_neighbor(all_player_views),
+                )
+            elif stage is not None:
+                player.apply_wonder_effects(stage)
+
     def make_turn(self, current_player: Player) -> None:
         strategy = current_player.strategy
-        game_view = GameView(
-            self.age,
-            self.turn,
-            [player.get_player_view() for player in self.all_players],
-            self.discarded_cards,
-        )
+        game_view = self.get_game_view()
         move = strategy.choose_move(current_player, game_view)
 
-        left_neighbor = current_player.get_left_neighbor(self.get_all_player_views())
-        right_neighbor = current_player.get_right_neighbor(self.get_all_player_views())
+        # The views are immutable, so the one handed to the strategy is reused
+        all_player_views = game_view.all_players_no_hand
+        player_view = all_player_views[current_player.position]
+        left_neighbor = current_player.get_left_neighbor(all_player_views)
+        right_neighbor = current_player.get_right_neighbor(all_player_views)
 
-        if is_valid_move(current_player.get_player_view(), move, left_neighbor, right_neighbor):
+        if is_valid_move(player_view, move, left_neighbor, right_neighbor):
             self.make_move(move)
         else:
             raise ValueError("Invalid move suggested")
@@ -131,42 +330,138 @@ class GameState:
 
         left_neighbor = get_left_neighbor(player.position, self.all_players)
         right_neighbor = get_right_neighbor(player.position, self.all_players)
+        left_view = left_neighbor.get_player_view()
+        right_view = right_neighbor.get_player_view()
 
         if move.action == Action.PLAY:
             if not player.can_chain(card):
-                neighbour_coins = player.pay_costs(
-                    card.cost, left_neighbor.get_player_view(), right_neighbor.get_player_view()
-                )
+                neighbour_coins = player.pay_costs(card.cost, left_view, right_view)
                 left_neighbor.add_coins(neighbour_coins[0])
                 right_neighbor.add_coins(neighbour_coins[1])
                 
             player.add_card(card)
-            player.remove_from_hand(card)
-            player.apply_card_effects(card, left_neighbor.get_player_view(), right_neighbor.get_player_view())
+            player.apply_card_effects(
+                card, left_neighbor.get_player_view(), right_neighbor.get_player_view()
+            )
 
         elif move.action == Action.WONDER:
             stage = player.get_current_wonder_stage_to_be_built()
-            neighbour_coins = player.pay_costs(
-                stage.cost, left_neighbor.get_player_view(), right_neighbor.get_player_view()
-            )
+            neighbour_coins = player.pay_costs(stage.cost, left_view, right_view)
             left_neighbor.add_coins(neighbour_coins[0])
             right_neighbor.add_coins(neighbour_coins[1])
             
             player.add_stage()
-            player.apply_wonder_effects(stage.effect)
+            player.apply_wonder_effects(stage)
 
         elif move.action == Action.DISCARD:
             player.add_coins(DISCARD_CARD_VALUE)
+            self.discard_cards([card])
 
         player.remove_from_hand(card)
 
+    def discard_cards(self, cards: Iterable[Card]) -> None:
+        cards = tuple(cards)
+        if not cards:
+            return
+
+        self.journal.record(self, "discarded_cards", "zobrist")
+        self.journal.record_undo(lambda: self._undiscard_counts(cards))
+        self.discarded_cards += cards
+        for card in cards:
+            self.discarded_counts[card.id] += 1
+            self.zobrist ^= zobrist_key(
+                Feature.DISCARD, card.id, self.discarded_counts[card.id]
+            )
+
+    def _undiscard_counts(self, cards: Tuple[Card, ...]) -> None:
+        for card in cards:
+            self.discarded_counts[card.id] -= 1
+            if not self.discarded_counts[card.id]:
+                del self.discarded_counts[card.id]
+
+    def get_hash(self) -> int:
+        """64-bit hash of the position, kept up to date by every change"""
+        position_hash = self.zobrist
+        for player in self.all_players:
+            position_hash ^= player.zobrist
+        return position_hash
+
+    def compute_hash(self) -> int:
+        """Hash the position from scratch, get_hash must always match it"""
+        position_hash = self._compute_zobrist()
+        for player in self.all_players:
+            position_hash ^= player.compute_zobrist()
+        return position_hash
+
+    def rehash(self) -> None:
+        """Recompute all the hashes, needed only after setting fields directly"""
+        self.zobrist = self._compute_zobrist()
+        for player in self.all_players:
+            player.zobrist = player.compute_zobrist()
+
+    def _compute_zobrist(self) -> int:
+        zobrist = zobrist_key(Feature.AGE, self.age) ^ zobrist_key(Feature.TURN, self.turn)
+        for card_id, count in self.discarded_counts.items():
+            for copy in range(1, count + 1):
+                zobrist ^= zobrist_key(Feature.DISCARD, card_id, copy)
+        return zobrist
+
+    def get_position_key(self) -> Tuple[object, ...]:
+        """
+        Exact identity of the position, equal keys mean equal positions. Slower
+        than the hash, used to rule out collisions in transposition tables.
+        """
+        return (
+            self.age,
+            self.turn,
+            tuple(sorted(self.discarded_counts.items())),
+            tuple(player.get_position_key() for player in self.all_players),
+        )
+
+    def push(self) -> None:
+        """Start recording, the changes made from now on are reverted by pop"""
+        self.journal.push()
+
+    def pop(self) -> None:
+        """Undo everything since the matching push, in time proportional to the changes"""
+        self.journal.pop()
+
+    def snapshot(self) -> GameSnapshot:
+        """Capture the whole position, sharing all the immutable parts"""
+        return GameSnapshot(
+            self.age,
+            self.turn,
+            self.turns_played,
+            self.discarded_cards,
+            tuple(self.discarded_counts.items()),
+            tuple(player.snapshot() for player in self.all_players),
+            self.zobrist,
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Jump to a snapshot. While recording, pop goes back to the current position"""
+        if self.journal.is_recording:
+            previous = self.snapshot()
+            self.journal.record_undo(lambda: self._restore(previous))
+        self._restore(snapshot)
+
+    def _restore(self, snapshot: GameSnapshot) -> None:
+        self.age = snapshot.age
+        self.turn = snapshot.turn
+        self.turns_played = snapshot.turns_played
+        self.discarded_cards = snapshot.discarded_cards
+        self.discarded_counts = Counter(dict(snapshot.discarded_counts))
+        for player, player_snapshot in zip(self.all_players, snapshot.players):
+            player.restore(player_snapshot)
+        self.zobrist = snapshot.zobrist
+
     def get_game_view(self) -> GameView:
         return GameView(
-            deepcopy(self.age),
-            deepcopy(self.turn),
-            deepcopy(self.get_all_player_views()),
-            deepcopy(self.discarded_cards),
+            self.age,
+            self.turn,
+            self.get_all_player_views(),
+            self.discarded_cards,
         )
 
-    def get_all_player_views(self) -> List[PlayerView]:
-        return deepcopy([player.get_player_view() for player in self.all_players])
+    def get_all_player_views(self) -> Tuple[PlayerView, ...]:
+        return tuple(player.get_player_view() for player in self.all_players)
@@ -0,0 +1,62 @@
+from typing import Any, Callable, List, Tuple, Union
+
+# Either the previous value of an attribute or a function that reverts a change
+# that cannot be stored as a single value (e.g. a counter update)
+Entry = Union[Tuple[Any, str, Any], Callable[[], None]]
+
+
+class Journal:
+    """
+    Undo log of the changes made to the game state. Nothing is recorded until a
+    frame is pushed, then each change stores the previous value of the fields it
+    touches, so that popping the frame costs as much as the moves made in it.
+    """
+
+    def __init__(self) -> None:
+        self.entries: List[Entry] = []
+        self.marks: List[int] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self.marks)
+
+    @property
+    def is_recording(self) -> bool:
+        return bool(self.marks)
+
+    def record(self, target: Any, *fields: str) -> None:
+        """Store the current value of the fields, call before changing them"""
+        if self.marks:
+            for field in fields:
+                self.entries.append((target, field, getattr(target, field)))
+
+    def record_undo(self, undo: Callable[[], None]) -> None:
+        if self.marks:
+            self.entries.append(undo)
+
+    def push(self) -> None:
+        """Start a frame, the changes made from now on can be reverted with pop"""
+        self.marks.append(len(self.entries))
+
+    def pop(self) -> None:
+        """Revert all the changes made since the last push, newest first"""
+        if not self.marks:
+            raise IndexError("pop from an empty journal")
+
+        mark = self.marks.pop()
+        while len(self.entries) > mark:
+            entry = self.entries.pop()
+            if isinstance(entry, tuple):
+                target, field, value = entry
+                setattr(target, field, value)
+            else:
+                entry()
+
+    def commit(self) -> None:
+        """Drop the last frame keeping its changes, they join the outer frame if any"""
+        if not self.marks:
+            raise IndexError("commit on an empty journal")
+
+        mark = self.marks.pop()
+        if not self.marks:
+            del self.entries[mark:]
@@ -1,6 +1,6 @@
-from typing import List, Dict
+from typing import Dict, List, Sequence, Union
 from src.core.constants import AGE_MILITARY_TOKENS, MILITARY_DEFEAT_TOKEN
-from src.game.player import Player, get_neighbors
+from src.game.player import Player, PlayerView, get_neighbors
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +16,9 @@ def calculate_battle(player_shields: int, opponent_shields: int, age: int) -> in
 
 
 def calculate_military_outcome(
-    player: Player, neighbors: List[Player], age: int
+    player: Union[Player, PlayerView],
+    neighbors: Sequence[Union[Player, PlayerView]],
+    age: int,
 ) -> int:
     """Calculate total military tokens for a player against both neighbors"""
     player_shields = player.get_shields()
@@ -1,20 +1,25 @@
+import itertools
 import logging
 import random
 from abc import ABC, abstractmethod
-from copy import deepcopy
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from functools import cached_property
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 from src.core.constants import (
     BASE_TRADING_COST,
     DISCOUNTED_TRADING_COST,
-    MAXIMUM_TRADING_RESOURCES,
 )
-from src.core.enums import CARD_TYPE_MAP, RESOURCE_MAP, Action, CardType, Resource
-from src.core.types import Card, Score, Wonder, WonderStage
+from src.core.enums import Action, CardType, Resource
+from src.core.catalog import get_cards_mask
+from src.core.types import Card, Multiplier, Score, Wonder, WonderStage
+from src.game.journal import Journal
 from src.game.move import Move
+from src.game.production import ProductionLedger
+from src.game.trading import PaymentPlan, find_payment_plans, get_cost_signature
+from src.game.zobrist import Feature, hash_cards, zobrist_key
 from src.utils.validators import (
-    is_card_present,
+    is_card_in_mask,
     can_card_be_chained,
     get_left_in_list,
     get_right_in_list,
@@ -22,13 +27,21 @@ from src.utils.validators import (
 
 logger = logging.getLogger(__name__)
 
+# Versions are unique across players and never reused, even if a state is restored
+_versions = itertools.count()
 
-@dataclass
+
+@dataclass(frozen=True)
 class GameView:
+    """
+    Read-only snapshot of the table. The player views and the discard pile are
+    tuples shared with the game state, nothing is copied when building it.
+    """
+
     age: int
     turn: int
-    all_players_no_hand: List["PlayerView"]
-    discarded_cards: List[Card]
+    all_players_no_hand: Tuple["PlayerView", ...]
+    discarded_cards: Tuple[Card, ...]
 
     def get_player_by_name(self, name: str) -> "PlayerView":
         for player in self.all_players_no_hand:
@@ -37,15 +50,21 @@ class GameView:
         raise ValueError(f"Player '{name}' not found")
 
     def get_left_neighbor(self, player: "PlayerView") -> "PlayerView":
-        index = self.all_players_no_hand.index(player)
-        return self.all_players_no_hand[(index - 1) % len(self.all_players_no_hand)]
+        return self.all_players_no_hand[
+            get_left_in_list(player.position, len(self.all_players_no_hand))
+        ]
 
     def get_right_neighbor(self, player: "PlayerView") -> "PlayerView":
-        index = self.all_players_no_hand.index(player)
-        return self.all_players_no_hand[(index + 1) % len(self.all_players_no_hand)]
+        return self.all_players_no_hand[
+            get_right_in_list(player.position, len(self.all_players_no_hand))
+        ]
 
 
 class PlayerStrategy(ABC):
+    # Label of the strategy in results, ratings and stats, the class name if
+    # None. Variants of the same class, e.g. with other budgets, need their own
+    name: Optional[str] = None
+
     @abstractmethod
     def choose_move(self, player: "Player", game_view: GameView) -> Move:
         """
@@ -59,29 +78,47 @@ class PlayerStrategy(ABC):
         pass
 
 
-@dataclass
+def get_variant_name(strategy: PlayerStrategy, **params: object) -> str:
+    """Label of a strategy with the parameters telling its variants apart"""
+    args = ", ".join(f"{key}={value}" for key, value in params.items() if value is not None)
+    return f"{type(strategy).__name__}({args})"
+
+
+@dataclass(frozen=True)
 class PlayerView:
+    """
+    Immutable snapshot of a player without the hand. The wonder, the cards
+    tuple and the score are shared with the player: all are frozen, so no
+    copy is needed.
+    """
+
     name: str
     position: int
     wonder: Wonder
-    cards: List[Card]
+    cards: Tuple[Card, ...]
     coins: int
     military_tokens: int
     stages_built: int
     score: Score
+    card_mask: int
+    production: ProductionLedger
+    version: int  # Version of the player when the view was taken
+    hand_size: int  # The cards of the hand are hidden, but not how many there are
 
     def get_shields(self) -> int:
-        return sum(card.effect.count("M") for card in self.cards)
+        return sum(card.parsed_effect.shields for card in self.cards) + sum(
+            stage.parsed_effect.shields for stage in self.get_built_wonder_stages()
+        )
 
     def count_cards_by_type(self, card_type: CardType) -> int:
         return sum(card.type == card_type for card in self.cards)
 
-    def get_resources(self) -> Dict[Resource, int]:
-        resources: Dict[Resource, int] = {}
-        resources[self.wonder.resource] = resources.get(self.wonder.resource, 0) + 1
-        return resources
+    def get_resources(
+        self, priority_resources: Sequence[Resource] = ()
+    ) -> Dict[Resource, int]:
+        return self.production.get_resources(priority_resources)
 
-    def get_built_wonder_stages(self) -> List[WonderStage]:
+    def get_built_wonder_stages(self) -> Sequence[WonderStage]:
         return self.wonder.stages[: self.stages_built]
 
     def get_current_wonder_stage_to_be_built(self) -> WonderStage:
@@ -91,7 +128,7 @@ class PlayerView:
         return self.military_tokens
 
     def can_play_no_cost(self, card: Card) -> bool:
-        return bool(card in self.cards)
+        return not is_card_in_mask(self.card_mask, card)
 
     def can_build_wonder_no_cost(self) -> bool:
         return bool(self.stages_built < len(self.wonder.stages))
@@ -99,21 +136,37 @@ class PlayerView:
     def can_chain(self, card: Card) -> bool:
         return can_card_be_chained(self.cards, card)
 
-    def get_left_neighbor(self, all_players: List["PlayerView"]) -> "PlayerView":
+    def get_left_neighbor(self, all_players: Sequence["PlayerView"]) -> "PlayerView":
         index = self.position - 1 if self.position > 0 else len(all_players) - 1
         return all_players[index]
 
-    def get_right_neighbor(self, all_players: List["PlayerView"]) -> "PlayerView":
+    def get_right_neighbor(self, all_players: Sequence["PlayerView"]) -> "PlayerView":
         index = self.position + 1 if self.position < len(all_players) - 1 else 0
         return all_players[index]
 
-    def get_neighbors(self, all_players: List["PlayerView"]) -> List["PlayerView"]:
+    def get_neighbors(self, all_players: Sequence["PlayerView"]) -> List["PlayerView"]:
         return [
             self.get_left_neighbor(all_players),
             self.get_right_neighbor(all_players),
         ]
 
 
+@dataclass(frozen=True)
+class PlayerSnapshot:
+    """State of a player at some point of the game, see Player.snapshot"""
+
+    cards: Tuple[Card, ...]
+    card_mask: int
+    coins: int
+    military_tokens: int
+    stages_built: int
+    production: ProductionLedger
+    score: Score
+    hand: Tuple[Card, ...]
+    version: int
+    zobrist: int
+
+
 class Player:
     def __init__(
         self, name: str, position: int, wonder: Wonder, strategy: PlayerStrategy
@@ -121,16 +174,113 @@ class Player:
         self.name: str = name
         self.position: int = position
         self.wonder: Wonder = wonder
-        self.cards: List[Card] = []
-        self.coins: int = 3
-        self.military_tokens: int = 0
-        self.stages_built: int = 0
-        self.score: Score = Score()
-        self.hand: List[Card] = []
+        self._cards: Tuple[Card, ...] = ()
+        self.card_mask: int = 0  # Bitmask of the IDs of the built cards
+        self._coins: int = 3
+        self._military_tokens: int = 0
+        self._stages_built: int = 0
+        # Updated only when a card or a stage is added
+        self.production: ProductionLedger = ProductionLedger.for_wonder(wonder)
+        self._score: Score = Score()
+        self._hand: List[Card] = []
         self.strategy: PlayerStrategy = strategy
+        # Renewed on every change, so derived data can be cached until the next one
+        self.version: int = next(_versions)
+        self.action_mask_cache: Optional[Tuple[Tuple[int, int, int], "ActionMask"]] = None
+        # Set by the game state, records the changes so that they can be undone
+        self.journal: Optional[Journal] = None
+        # Random generator of the game, replaced by the game state with its own
+        # so that strategies and payments draw from the seeded stream
+        self.rng: random.Random = random.Random()
+        # Zobrist hash of the player, updated by each change like the version
+        self.zobrist: int = self.compute_zobrist()
+        # Last view built, valid as long as the version is the same
+        self._view: Optional[PlayerView] = None
 
         logger.info(f"Player {self.name} created with wonder {self.wonder.name}")
 
+    @property
+    def cards(self) -> Tuple[Card, ...]:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: Sequence[Card]) -> None:
+        self._record("_cards", "card_mask", "production")
+        self.zobrist ^= self._hash_tableau()
+        self._cards = tuple(cards)
+        self.card_mask = get_cards_mask(self._cards)
+        self.zobrist ^= self._hash_tableau()
+        self.version = next(_versions)
+        self.production = ProductionLedger.for_player(
+            self.wonder, self._cards, self._stages_built
+        )
+
+    # Coins, tokens and the hand can also be set directly, e.g. in tests, so the
+    # setters keep the journal, the hash and the version up to date
+    @property
+    def coins(self) -> int:
+        return self._coins
+
+    @coins.setter
+    def coins(self, coins: int) -> None:
+        self._record("_coins")
+        self.zobrist ^= zobrist_key(Feature.COINS, self.position, self._coins)
+        self._coins = coins
+        self.zobrist ^= zobrist_key(Feature.COINS, self.position, self._coins)
+        self.version = next(_versions)
+
+    @property
+    def military_tokens(self) -> int:
+        return self._military_tokens
+
+    @military_tokens.setter
+    def military_tokens(self, military_tokens: int) -> None:
+        self._record("_military_tokens")
+        self.zobrist ^= zobrist_key(Feature.MILITARY, self.position, self._military_tokens)
+        self._military_tokens = military_tokens
+        self.zobrist ^= zobrist_key(Feature.MILITARY, self.position, self._military_tokens)
+        self.version = next(_versions)
+
+    # The hand is replaced instead of changed in place, so the journal can keep
+    # the previous list as is
+    @property
+    def hand(self) -> List[Card]:
+        return self._hand
+
+    @hand.setter
+    def hand(self, hand: Sequence[Card]) -> None:
+        self._record("_hand")
+        # Hands have at most 7 cards, rehashing them is as cheap as updating
+        self.zobrist ^= self._hash_hand()
+        self._hand = list(hand)
+        self.zobrist ^= self._hash_hand()
+        self.version = next(_versions)
+
+    @property
+    def score(self) -> Score:
+        return self._score
+
+    @score.setter
+    def score(self, score: Score) -> None:
+        self._record("_score")
+        self._score = score
+        self.version = next(_versions)
+
+    @property
+    def stages_built(self) -> int:
+        return self._stages_built
+
+    @stages_built.setter
+    def stages_built(self, stages_built: int) -> None:
+        self._record("_stages_built", "production")
+        self.zobrist ^= zobrist_key(Feature.STAGES, self.position, self._stages_built)
+        self._stages_built = stages_built
+        self.zobrist ^= zobrist_key(Feature.STAGES, self.position, self._stages_built)
+        self.version = next(_versions)
+        self.production = ProductionLedger.for_player(
+            self.wonder, self._cards, self._stages_built
+        )
+
     # Keep core state modification methods
     def add_card(self, card: Card) -> None:
         assert self.can_add_card(
@@ -139,17 +289,23 @@ class Player:
         logger.debug(
             f"Player {self.name} added the card '{card.name}' ({card.type.name}) with effect '{card.effect}'"
         )
-        self.cards.append(card)
+        self._record("_cards", "card_mask", "production")
+        # Copy-on-write: views built earlier keep sharing the previous tuple
+        self._cards = self._cards + (card,)
+        self.card_mask |= card.mask
+        self.zobrist ^= zobrist_key(Feature.TABLEAU, self.position, card.id, 1)
+        self.production = self.production.with_card(card)
+        self.version = next(_versions)
 
     def add_coins(self, amount: int) -> None:
         logger.debug(f"Player {self.name} received {amount} coins")
         assert (
-            self.coins + amount
+            self._coins + amount
         ) >= 0, f"Player {self.name} cannot have negative coins"
-        self.coins += amount
+        self.coins = self._coins + amount
 
     def add_military_tokens(self, amount: int) -> None:
-        self.military_tokens += amount
+        self.military_tokens = self._military_tokens + amount
         logger.debug(f"Player {self.name} got {amount} military tokens (total: {self.military_tokens})")
 
     def add_stage(self) -> None:
@@ -157,48 +313,131 @@ class Player:
         logger.debug(
             f"Player {self.name} proudly built stage {self.stages_built + 1} with effect '{self.wonder.stages[self.stages_built].effect}'"
         )
-        self.stages_built += 1
+        stage = self.wonder.stages[self._stages_built]
+        self._record("_stages_built", "production")
+        self.production = self.production.with_effect(stage.parsed_effect, tradable=False)
+        self.zobrist ^= zobrist_key(Feature.STAGES, self.position, self._stages_built)
+        self._stages_built += 1
+        self.zobrist ^= zobrist_key(Feature.STAGES, self.position, self._stages_built)
+        self.version = next(_versions)
 
     def add_to_hand(self, cards: List[Card]) -> None:
-        self.hand.extend(cards)
+        self.hand = self._hand + list(cards)
 
     def remove_from_hand(self, card: Card) -> None:
-        self.hand.remove(card)
+        hand = list(self._hand)
+        hand.remove(card)
+        self.hand = hand
 
     def discard_hand(self) -> None:
         self.hand = []
 
+    def _record(self, *fields: str) -> None:
+        if self.journal is not None:
+            self.journal.record(self, "version", "zobrist", *fields)
+
+    def _hash_tableau(self) -> int:
+        return hash_cards(Feature.TABLEAU, self.position, (card.id for card in self._cards))
+
+    def _hash_hand(self) -> int:
+        return hash_cards(Feature.HAND, self.position, (card.id for card in self.hand))
+
+    def compute_zobrist(self) -> int:
+        """Hash the player from scratch, the incremental one must always match it"""
+        return (
+            self._hash_tableau()
+            ^ self._hash_hand()
+            ^ zobrist_key(Feature.COINS, self.position, self.coins)
+            ^ zobrist_key(Feature.STAGES, self.position, self._stages_built)
+            ^ zobrist_key(Feature.MILITARY, self.position, self.military_tokens)
+        )
+
+    def get_position_key(self) -> Tuple[object, ...]:
+        """Exact identity of the player state, to tell apart hash collisions"""
+        return (
+            self.position,
+            self.wonder.name,
+            self.card_mask,
+            self.coins,
+            self._stages_built,
+            self.military_tokens,
+            tuple(sorted(card.id for card in self.hand)),
+        )
+
+    def snapshot(self) -> "PlayerSnapshot":
+        """Capture the state of the player, sharing all the immutable parts"""
+        return PlayerSnapshot(
+            self._cards,
+            self.card_mask,
+            self.coins,
+            self.military_tokens,
+            self._stages_built,
+            self.production,
+            self._score,
+            tuple(self.hand),
+            self.version,
+            self.zobrist,
+        )
+
+    def restore(self, snapshot: "PlayerSnapshot") -> None:
+        """Go back to a snapshot, without recording it in the journal"""
+        self._cards = snapshot.cards
+        self.card_mask = snapshot.card_mask
+        self._coins = snapshot.coins
+        self._military_tokens = snapshot.military_tokens
+        self._stages_built = snapshot.stages_built
+        self.production = snapshot.production
+        self._score = snapshot.score
+        self._hand = list(snapshot.hand)
+        self.version = snapshot.version
+        self.zobrist = snapshot.zobrist
+        self._view = None
+
+    def get_hand_mask(self) -> int:
+        return get_cards_mask(self.hand)
+
     def get_shields(self) -> int:
-        return sum(card.effect.count("M") for card in self.cards)
+        return sum(card.parsed_effect.shields for card in self.cards) + sum(
+            stage.parsed_effect.shields for stage in self.get_built_wonder_stages()
+        )
 
     def get_current_wonder_stage_to_be_built(self) -> WonderStage:
         return self.wonder.stages[self.stages_built]
 
-    def get_built_wonder_stages(self) -> List[WonderStage]:
+    def get_built_wonder_stages(self) -> Sequence[WonderStage]:
         return self.wonder.stages[: self.stages_built]
 
     def get_military_score(self) -> int:
         return self.military_tokens
 
-    def get_player_view(player: "Player") -> PlayerView:
-        return PlayerView(
-            deepcopy(player.name),
-            deepcopy(player.position),
-            deepcopy(player.wonder),
-            deepcopy(player.cards),
-            deepcopy(player.coins),
-            deepcopy(player.military_tokens),
-            deepcopy(player.stages_built),
-            deepcopy(player.score),
+    def get_player_view(self) -> PlayerView:
+        # Every change renews the version, so the last view is reused until then.
+        # Everything in it is immutable, so the view shares it all as is
+        if self._view is not None and self._view.version == self.version:
+            return self._view
+        self._view = PlayerView(
+            self.name,
+            self.position,
+            self.wonder,
+            self._cards,
+            self.coins,
+            self.military_tokens,
+            self.stages_built,
+            self._score,
+            self.card_mask,
+            self.production,
+            self.version,
+            len(self.hand),
         )
+        return self._view
 
-    def get_left_neighbor(self, all_players: List["PlayerView"]) -> "PlayerView":
+    def get_left_neighbor(self, all_players: Sequence["PlayerView"]) -> "PlayerView":
         return all_players[get_left_in_list(self.position, len(all_players))]
 
-    def get_right_neighbor(self, all_players: List["PlayerView"]) -> "PlayerView":
+    def get_right_neighbor(self, all_players: Sequence["PlayerView"]) -> "PlayerView":
         return all_players[get_right_in_list(self.position, len(all_players))]
 
-    def get_neighbors(self, all_players: List["PlayerView"]) -> List["PlayerView"]:
+    def get_neighbors(self, all_players: Sequence["PlayerView"]) -> List["PlayerView"]:
         return [
             self.get_left_neighbor(all_players),
             self.get_right_neighbor(all_players),
@@ -208,7 +447,7 @@ class Player:
         return sum(card.type == card_type for card in self.cards)
 
     def can_add_card(self, card: Card) -> bool:
-        return not is_card_present(self.cards, card)
+        return not is_card_in_mask(self.card_mask, card)
 
     def can_play_no_cost(self, card: Card) -> bool:
         return bool(self.can_add_card(card))
@@ -220,155 +459,29 @@ class Player:
         return can_card_be_chained(self.cards, card)
 
     def get_resources(
-        self, priority_resources: List[Resource] = []
+        self, priority_resources: Sequence[Resource] = ()
     ) -> Dict[Resource, int]:
-        resources: Dict[Resource, int] = {}
-
-        # Add wonder resource
-        resources[self.wonder.resource] = resources.get(self.wonder.resource, 0) + 1
-        # If any of the stages of the wonder has resources, add them
-        for stage in self.wonder.stages:
-            if "-" in stage.effect or "_" in stage.effect:
-                # This is either a special effect or it does not give resources
-                continue
-
-            # Let's check stage.effect
-            # If the effect contains /, it means it has multiple effects
-            if "/" in stage.effect:
-                # Here we check which resources are on higher priority based on input
-                if not priority_resources:
-                    # If nothing is set, just take the first effect
-                    letter = stage.effect[0]
-                    resource = RESOURCE_MAP[letter]
-                    amount = stage.effect.count(letter)
-                    resources[resource] = resources.get(resource, 0) + amount
-                else:
-                    # If we have priority resources, take the first one that is in the effect
-                    for resource in priority_resources:
-                        for letter, res in RESOURCE_MAP.items():
-                            if res == resource:
-                                break
-                        if letter in stage.effect:
-                            amount = stage.effect.count(letter)
-                            resources[resource] = resources.get(resource, 0) + amount
-                            break
-            else:
-                letter = stage.effect[0]
-                resource = RESOURCE_MAP[letter]
-                amount = stage.effect.count(letter)
-                resources[resource] = resources.get(resource, 0) + amount
-
-        for card in self.cards:
-            # Check the effect of the card
-            # If the effect contains /, it means it has multiple effects
-            if "/" in card.effect:
-                # Here we check which resources are on higher priority based on input
-                if not priority_resources:
-                    # If nothing is set, just take the first effect
-                    letter = card.effect[0]
-                    resource = RESOURCE_MAP[letter]
-                    amount = card.effect.count(letter)
-                    resources[resource] = resources.get(resource, 0) + amount
-                else:
-                    # If we have priority resources, take the first one that is in the effect
-                    for resource in priority_resources:
-                        for letter, res in RESOURCE_MAP.items():
-                            if res == resource:
-                                break
-                        if letter in card.effect:
-                            amount = card.effect.count(letter)
-                            resources[resource] = resources.get(resource, 0) + amount
-                            break
-
-            elif (
-                card.type == CardType.RAW_MATERIAL
-                or card.type == CardType.MANUFACTURED_GOOD
-            ):
-                letter = card.effect[0]
-                resource = RESOURCE_MAP[letter]
-                amount = card.effect.count(letter)
-                resources[resource] = resources.get(resource, 0) + amount
-
-            # If commercial, it can be another priority list
-            elif card.type == CardType.COMMERCIAL:
-                if "/" not in card.effect:
-                    continue
-
-                # Here we check which resources are on higher priority based on input
-                if not priority_resources:
-                    # If nothing is set, just take the first effect
-                    letter = card.effect[0]
-                    resource = RESOURCE_MAP[letter]
-                    amount = card.effect.count(letter)
-                    resources[resource] = resources.get(resource, 0) + amount
-                else:
-                    # If we have priority resources, take the first one that is in the effect
-                    for resource in priority_resources:
-                        for letter, res in RESOURCE_MAP.items():
-                            if res == resource:
-                                break
-                        if letter in card.effect:
-                            amount = card.effect.count(letter)
-                            resources[resource] = resources.get(resource, 0) + amount
-                            break
-        return resources
+        return self.production.get_resources(priority_resources)
 
     def pay_costs(
         self,
-        cost: Dict[Resource, int],
+        cost: Mapping[Resource, int],
         left_neighbor: PlayerView,
         right_neighbor: PlayerView,
     ) -> List[int]:
         """Handle payment of costs, including trading with neighbors"""
+        plan = get_payment_plan(
+            self.get_player_view(), left_neighbor, right_neighbor, cost, self.rng
+        )
+        if plan is None:
+            raise ValueError(
+                f"Player {self.name} cannot afford card and neighbors cannot help"
+            )
 
-        resources_required_left = 0
-        resources_required_right = 0
-
-        neighbors_coins: List[int] = [0, 0]
-
-        for resource, cost_amount in cost.items():
-            if resource == Resource.COIN:
-                self.add_coins(
-                    -cost_amount
-                )  # Since the function is pay, here we subtract the amount
-                continue
-
-            # Track how many resources come from neighbors
-            if self.get_resources().get(resource, 0) < cost_amount:
-                # TODO: introduce trading discounts
-
-                missing_amount = cost_amount - self.get_resources().get(resource, 0)
-                if missing_amount > MAXIMUM_TRADING_RESOURCES:
-                    raise ValueError(f"Player {self.name} cannot afford card")
-
-                if (
-                    resources_required_right == 0
-                    and self.coins >= BASE_TRADING_COST
-                    and missing_amount > 0
-                ):
-                    if right_neighbor.get_resources().get(resource, 0) > 0:
-                        resources_required_right += 1
-                        neighbors_coins[1] += BASE_TRADING_COST
-                        self.add_coins(-BASE_TRADING_COST)
-                        missing_amount -= 1
-
-                if (
-                    resources_required_left == 0
-                    and self.coins >= BASE_TRADING_COST
-                    and missing_amount > 0
-                ):
-                    if left_neighbor.get_resources().get(resource, 0) >= 0:
-                        resources_required_left += 1
-                        neighbors_coins[0] += BASE_TRADING_COST
-                        self.add_coins(-BASE_TRADING_COST)
-                        missing_amount -= 1
-
-                if missing_amount > 0:
-                    raise ValueError(
-                        f"Player {self.name} cannot afford card and neighbors cannot help"
-                    )
-
-        return neighbors_coins
+        # Since the function is pay, here we subtract the amount
+        self.add_coins(-(cost.get(Resource.COIN, 0) + plan.total))
+
+        return [plan.left, plan.right]
 
     def apply_card_effects(
         self,
@@ -377,43 +490,24 @@ class Player:
         right_neighbor: PlayerView,
     ) -> None:
         """Apply card effects when played. Only instantaneous ones"""
-        effect = card.effect
-
-        if card.type == CardType.COMMERCIAL:
-            logger.debug(f"Applying commercial card '{card.name}' effect: {effect}")
-            if "$" in effect:
-                coins_multiplier = effect.count("$")
-                if "{" in effect:
-                    bracket_content = effect.split("{")[1].split("}")[0]
-                    if bracket_content == "wonder":
-                        self.add_coins(coins_multiplier * self.stages_built)
-                        return
-
-                    total_cards = 0
-                    required_card_type = CARD_TYPE_MAP[bracket_content]
-
-                    if (
-                        "v" in bracket_content or "<" not in bracket_content
-                    ):  # Either only self or self and neighbors
-                        total_cards += self.count_cards_by_type(required_card_type)
-
-                    if "<" in bracket_content:  # ALl cards with < also have >
-                        total_cards += left_neighbor.count_cards_by_type(
-                            required_card_type
-                        )
-
-                        total_cards += right_neighbor.count_cards_by_type(
-                            required_card_type
-                        )
-
-                    self.add_coins(coins_multiplier * total_cards)
-
-    def apply_wonder_effects(self, effect: str) -> None:
+        effect = card.parsed_effect
+
+        coins = effect.coins
+        if effect.coins_per is not None:
+            coins += count_multiplier(
+                effect.coins_per, self, left_neighbor, right_neighbor
+            )
+
+        if coins:
+            logger.debug(f"Applying card '{card.name}' effect: {card.effect}")
+            self.add_coins(coins)
+
+    def apply_wonder_effects(self, stage: WonderStage) -> None:
         """Apply wonder stage effects when built"""
-        if "$" in effect:
-            # TODO: get moneyyy
-            pass
-        elif "_" in effect:
+        effect = stage.parsed_effect
+        if effect.coins:
+            self.add_coins(effect.coins)
+        if effect.special is not None:
             # TODO: implement custom effects
             pass
 
@@ -456,12 +550,16 @@ def get_best_trade_option(
     left_neighbor: PlayerView,
     right_neighbor: PlayerView,
     resource: Resource,
+    rng: Optional[random.Random] = None,
 ) -> Optional[TradeOption]:
-    """Get the best neighbor to trade with for a specific resource"""
+    """
+    Get the best neighbor to trade with for a specific resource. Ties are broken
+    drawing from rng if given, otherwise from the global random generator
+    """
     options: List[TradeOption] = []
 
     # Check left neighbor resources
-    if left_neighbor.get_resources().get(resource, 0) > 0:
+    if left_neighbor.production.can_trade(resource):
         cost = (
             DISCOUNTED_TRADING_COST
             if is_trading_discounted(player, resource, True)
@@ -470,7 +568,7 @@ def get_best_trade_option(
         options.append(TradeOption(left_neighbor, cost, True))
 
     # Check right neighbor resources
-    if right_neighbor.get_resources().get(resource, 0) > 0:
+    if right_neighbor.production.can_trade(resource):
         cost = (
             DISCOUNTED_TRADING_COST
             if is_trading_discounted(player, resource, False)
@@ -484,7 +582,9 @@ def get_best_trade_option(
     # Get cheapest options
     min_cost = min(opt.cost for opt in options)
     cheapest_options = [opt for opt in options if opt.cost == min_cost]
-    return random.choice(cheapest_options)
+    if rng is None:
+        return random.choice(cheapest_options)
+    return rng.choice(cheapest_options)
 
 
 def is_trading_discounted(
@@ -493,97 +593,167 @@ def is_trading_discounted(
     is_left: bool,
 ) -> bool:
     """Check if trading for a resource with a neighbor is discounted"""
-    for card in player.cards:
-        if card.type != CardType.COMMERCIAL or "trade" not in card.effect:
-            continue
-
-        resources_part = card.effect.split("{")[1].split("}")[0].split("/")
-        discounted_resources = [
-            RESOURCE_MAP[letter] for letter in resources_part if letter in RESOURCE_MAP
-        ]
-
-        if resource not in discounted_resources:
-            continue
+    if is_left:
+        return resource in player.production.left_discounts
+    return resource in player.production.right_discounts
+
+
+def count_multiplier(
+    multiplier: Multiplier,
+    player: Union["Player", PlayerView],
+    left_neighbor: Union["Player", PlayerView],
+    right_neighbor: Union["Player", PlayerView],
+) -> int:
+    """Count the coins or points given by a multiplier effect"""
+
+    def count(target: Union["Player", PlayerView]) -> int:
+        if multiplier.wonder_stages:
+            return target.stages_built
+        if multiplier.military_tokens:
+            return target.military_tokens
+        if multiplier.wonder_complete:
+            return int(target.stages_built == len(target.wonder.stages))
+        return sum(
+            target.count_cards_by_type(card_type)
+            for card_type in multiplier.card_types
+        )
 
-        if is_left and "<" in card.effect:
-            return True
-        if not is_left and ">" in card.effect:
-            return True
+    total = 0
+    if multiplier.own:
+        total += count(player)
+    if multiplier.left:
+        total += count(left_neighbor)
+    if multiplier.right:
+        total += count(right_neighbor)
 
-    return False
+    return multiplier.amount * total
 
 
 def can_afford_cost(
     player: PlayerView,
     left_neighbor: PlayerView,
     right_neighbor: PlayerView,
-    cost: Dict[Resource, int],
+    cost: Mapping[Resource, int],
 ) -> bool:
     """Check if player can afford costs with available resources"""
-    if Resource.COIN in cost:
-        assert len(cost) == 1, "Coin cost should be the only cost"
-        return bool(cost[Resource.COIN] <= player.coins)
+    plans = find_payment_plans(
+        cost, player.production, left_neighbor.production, right_neighbor.production
+    )
+    return bool(plans) and cost.get(Resource.COIN, 0) + plans[0].total <= player.coins
 
-    coins_available = player.coins
-    resources_needed: Dict[Resource, int] = {}
 
-    # Check what resources we need to trade for
-    own_resources = player.get_resources()
-    for resource, amount in cost.items():
-        if own_resources.get(resource, 0) < amount:
-            resources_needed[resource] = amount - own_resources.get(resource, 0)
+def get_payment_plan(
+    player: PlayerView,
+    left_neighbor: PlayerView,
+    right_neighbor: PlayerView,
+    cost: Mapping[Resource, int],
+    rng: Optional[random.Random] = None,
+) -> Optional[PaymentPlan]:
+    """
+    Get the cheapest way to pay for the resources of a cost, None if it is not
+    affordable. Ties between neighbors are broken at random, drawing from rng
+    if given, otherwise from the global random generator
+    """
+    plans = find_payment_plans(
+        cost, player.production, left_neighbor.production, right_neighbor.production
+    )
+    if not plans or cost.get(Resource.COIN, 0) + plans[0].total > player.coins:
+        return None
 
-    if not resources_needed:
-        return True
+    if len(plans) == 1:
+        return plans[0]
+    if rng is None:
+        return random.choice(plans)
+    return rng.choice(plans)
 
-    # Calculate trading costs
-    total_resources_traded = 0
-    for resource, amount_needed in resources_needed.items():
-        remaining = amount_needed
-        while remaining > 0:
-            trade = get_best_trade_option(
-                player, left_neighbor, right_neighbor, resource
-            )
-            if not trade:
-                return False
 
-            total_resources_traded += 1
-            if total_resources_traded > MAXIMUM_TRADING_RESOURCES:
-                return False
+@dataclass(frozen=True)
+class ActionMask:
+    """
+    Valid actions for each card of a hand, in hand order. Discarding is always
+    valid, while building the wonder is valid either with every card or with none
+    """
 
-            coins_available -= trade.cost
-            if coins_available < 0:
-                return False
+    player_name: str
+    hand: Tuple[Card, ...]
+    can_play: Tuple[bool, ...]
+    can_build_wonder: bool
 
-            remaining -= 1
+    def is_valid(self, index: int, action: Action) -> bool:
+        if action == Action.PLAY:
+            return self.can_play[index]
+        if action == Action.WONDER:
+            return self.can_build_wonder
+        return True
 
-    return True
+    @cached_property
+    def moves(self) -> Tuple[Move, ...]:
+        moves: List[Move] = []
+        for card, can_play in zip(self.hand, self.can_play):
+            if can_play:
+                moves.append(Move(self.player_name, Action.PLAY, card))
+            if self.can_build_wonder:
+                moves.append(Move(self.player_name, Action.WONDER, card))
+            moves.append(Move(self.player_name, Action.DISCARD, card))
+        return tuple(moves)
 
 
-def get_valid_moves(
+def get_action_mask(
     player: Player,
     left_neighbor: PlayerView,
     right_neighbor: PlayerView,
-) -> List[Move]:
-    """Get all valid moves for current hand"""
-    valid_moves = []
+) -> ActionMask:
+    """
+    Get the valid actions for the current hand. Each distinct cost is solved
+    once, and the result is cached until the player or a neighbor changes
+    """
+    key = (player.version, left_neighbor.version, right_neighbor.version)
+    if player.action_mask_cache is not None and player.action_mask_cache[0] == key:
+        return player.action_mask_cache[1]
+
+    action_mask = compute_action_mask(
+        player.get_player_view(), player.hand, left_neighbor, right_neighbor
+    )
+    player.action_mask_cache = (key, action_mask)
+    return action_mask
+
 
-    player_view = player.get_player_view()
-    for card in player.hand:
-        if player.can_play_no_cost(card) and (
-            can_afford_cost(player_view, left_neighbor, right_neighbor, card.cost)
-            or player.can_chain(card)
-        ):
-            valid_moves.append(Move(player.name, Action.PLAY, card))
+def compute_action_mask(
+    player_view: PlayerView,
+    hand: Sequence[Card],
+    left_neighbor: PlayerView,
+    right_neighbor: PlayerView,
+) -> ActionMask:
+    """Get the valid actions for a hand, without caching"""
+    affordable: Dict[Tuple[Tuple[int, ...], int], bool] = {}
+
+    def is_affordable(cost: Mapping[Resource, int]) -> bool:
+        cost_key = (get_cost_signature(cost), cost.get(Resource.COIN, 0))
+        if cost_key not in affordable:
+            affordable[cost_key] = can_afford_cost(
+                player_view, left_neighbor, right_neighbor, cost
+            )
+        return affordable[cost_key]
 
-        if player.can_build_wonder_no_cost():
-            stage = player.get_current_wonder_stage_to_be_built()
-            if can_afford_cost(player_view, left_neighbor, right_neighbor, stage.cost):
-                valid_moves.append(Move(player.name, Action.WONDER, card))
+    can_build_wonder = player_view.can_build_wonder_no_cost() and is_affordable(
+        player_view.get_current_wonder_stage_to_be_built().cost
+    )
+    can_play = tuple(
+        player_view.can_play_no_cost(card)
+        and (player_view.can_chain(card) or is_affordable(card.cost))
+        for card in hand
+    )
 
-        valid_moves.append(Move(player.name, Action.DISCARD, card))
+    return ActionMask(player_view.name, tuple(hand), can_play, can_build_wonder)
 
-    return valid_moves.copy()
+
+def get_valid_moves(
+    player: Player,
+    left_neighbor: PlayerView,
+    right_neighbor: PlayerView,
+) -> List[Move]:
+    """Get all valid moves for current hand"""
+    return list(get_action_mask(player, left_neighbor, right_neighbor).moves)
 
 
 def is_valid_move(
@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
+
+from src.core.enums import CardType, Resource
+from src.core.types import Card, Effect, Wonder
+
+# Resources that can be produced and traded, coins are not part of the ledger
+TRADABLE_RESOURCES: Tuple[Resource, ...] = (
+    Resource.WOOD,
+    Resource.STONE,
+    Resource.ORE,
+    Resource.BRICK,
+    Resource.GLASS,
+    Resource.PAPYRUS,
+    Resource.LOOM,
+)
+RESOURCE_INDEX: Dict[Resource, int] = {
+    resource: index for index, resource in enumerate(TRADABLE_RESOURCES)
+}
+
+# Only the wonder resource and the brown and grey cards can be bought by neighbors
+TRADABLE_CARD_TYPES = (CardType.RAW_MATERIAL, CardType.MANUFACTURED_GOOD)
+
+
+@dataclass(frozen=True, slots=True)
+class ProductionLedger:
+    """
+    What a player produces each turn and at which price it buys from its neighbors.
+    Immutable: adding a card or a stage returns a new ledger, so views share it.
+    """
+
+    fixed: Tuple[int, ...]  # Units per resource, indexed like TRADABLE_RESOURCES
+    choices: Tuple[Tuple[Resource, ...], ...]  # One unit of one of the resources
+    tradable_fixed: Tuple[int, ...]  # Part of the production neighbors can buy
+    tradable_choices: Tuple[Tuple[Resource, ...], ...]
+    left_discounts: FrozenSet[Resource] = frozenset()
+    right_discounts: FrozenSet[Resource] = frozenset()
+
+    @classmethod
+    def for_wonder(cls, wonder: Wonder) -> "ProductionLedger":
+        fixed = [0] * len(TRADABLE_RESOURCES)
+        if wonder.resource in RESOURCE_INDEX:
+            fixed[RESOURCE_INDEX[wonder.resource]] = 1
+        return cls(tuple(fixed), (), tuple(fixed), ())
+
+    @classmethod
+    def for_player(
+        cls, wonder: Wonder, cards: Sequence[Card], stages_built: int
+    ) -> "ProductionLedger":
+        """Build the ledger from scratch, only needed when the state is replaced"""
+        ledger = cls.for_wonder(wonder)
+        for stage in wonder.stages[:stages_built]:
+            ledger = ledger.with_effect(stage.parsed_effect, tradable=False)
+        for card in cards:
+            ledger = ledger.with_card(card)
+        return ledger
+
+    def with_card(self, card: Card) -> "ProductionLedger":
+        return self.with_effect(
+            card.parsed_effect, tradable=card.type in TRADABLE_CARD_TYPES
+        )
+
+    def with_effect(self, effect: Effect, tradable: bool) -> "ProductionLedger":
+        if not (effect.production or effect.production_choice or effect.trade_discount):
+            return self
+
+        fixed = list(self.fixed)
+        tradable_fixed = list(self.tradable_fixed)
+        for resource, amount in effect.production:
+            fixed[RESOURCE_INDEX[resource]] += amount
+            if tradable:
+                tradable_fixed[RESOURCE_INDEX[resource]] += amount
+
+        choices = self.choices
+        tradable_choices = self.tradable_choices
+        if effect.production_choice:
+            # Kept sorted, so that equal productions have equal ledgers
+            choice = effect.production_choice
+            choices = tuple(sorted(choices + (choice,), key=_choice_key))
+            if tradable:
+                tradable_choices = tuple(
+                    sorted(tradable_choices + (choice,), key=_choice_key)
+                )
+
+        left_discounts = self.left_discounts
+        right_discounts = self.right_discounts
+        if effect.trade_left:
+            left_discounts = left_discounts | effect.trade_discount
+        if effect.trade_right:
+            right_discounts = right_discounts | effect.trade_discount
+
+        return ProductionLedger(
+            tuple(fixed),
+            choices,
+            tuple(tradable_fixed),
+            tradable_choices,
+            left_discounts,
+            right_discounts,
+        )
+
+    def get_fixed(self, resource: Resource) -> int:
+        index = RESOURCE_INDEX.get(resource)
+        return 0 if index is None else self.fixed[index]
+
+    def can_trade(self, resource: Resource) -> bool:
+        """Check if a neighbor can buy at least one unit of the resource"""
+        index = RESOURCE_INDEX.get(resource)
+        if index is None:
+            return False
+        return self.tradable_fixed[index] > 0 or any(
+            resource in choice for choice in self.tradable_choices
+        )
+
+    def get_resources(
+        self, priority_resources: Sequence[Resource] = ()
+    ) -> Dict[Resource, int]:
+        """
+        Get the production as a dictionary, resolving each multiple choice
+        producer to the first option, or to the first of the priority resources
+        """
+        resources: Dict[Resource, int] = {
+            resource: amount
+            for resource, amount in zip(TRADABLE_RESOURCES, self.fixed)
+            if amount
+        }
+
+        for choice in self.choices:
+            chosen = choose_resource(choice, priority_resources)
+            if chosen is not None:
+                resources[chosen] = resources.get(chosen, 0) + 1
+
+        return resources
+
+
+def _choice_key(choice: Tuple[Resource, ...]) -> Tuple[int, ...]:
+    return tuple(RESOURCE_INDEX[resource] for resource in choice)
+
+
+def choose_resource(
+    options: Sequence[Resource], priority_resources: Sequence[Resource]
+) -> Optional[Resource]:
+    """
+    Choose the resource produced by a multiple choice effect: the first option
+    if there are no priorities, otherwise the first priority among the options
+    """
+    if not priority_resources:
+        return options[0]
+
+    for resource in priority_resources:
+        if resource in options:
+            return resource
+
+    return None
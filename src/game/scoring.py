@@ -1,68 +1,60 @@
-from typing import Counter
+from typing import Counter, Sequence, Union
 
-from src.core.enums import CARD_TYPE_MAP, CardType, ScienceSymbol
+from src.core.enums import CardType, ScienceSymbol
 from src.core.types import Score
 
-from src.game.player import Player
+from src.game.player import Player, PlayerView, count_multiplier
 
+# Scores only read the public state, so views can be scored as well as players
+AnyPlayer = Union[Player, PlayerView]
 
-def calculate_military_score(player: Player) -> int:
+
+def calculate_military_score(player: AnyPlayer) -> int:
     """Calculate military score from military tokens"""
     return player.military_tokens
 
 
-def calculate_treasury_score(player: Player) -> int:
+def calculate_treasury_score(player: AnyPlayer) -> int:
     """Calculate treasury score (3 coins = 1 point)"""
     return player.coins // 3
 
 
-def calculate_wonders_score(player: Player) -> int:
+def calculate_wonders_score(player: AnyPlayer) -> int:
     """Calculate wonder score by counting victory points in built stages"""
-    score = 0
-    built_stages = player.stages_built
-
-    for i in range(built_stages):
-        effect = player.wonder.stages[i].effect
-        score += int(effect.count("V"))
-
-    return score
+    return sum(
+        stage.parsed_effect.victory_points for stage in player.get_built_wonder_stages()
+    )
 
 
-def calculate_civilian_score(player: Player) -> int:
+def calculate_civilian_score(player: AnyPlayer) -> int:
     """Calculate civilian (blue card) score"""
     score = 0
     civilian_cards = [card for card in player.cards if card.type == CardType.CIVILIAN]
 
     for card in civilian_cards:
-        score += card.effect.count("V")
+        score += card.parsed_effect.victory_points
 
     return score
 
 
-def calculate_science_score(player: Player) -> int:
+def calculate_science_score(player: AnyPlayer) -> int:
     """Calculate scientific score using sets and individual symbols, optimizing jolly symbols"""
-    JOLLY_EFFECT_NAME = "C/T/G"
-
     science_cards = [card for card in player.cards if card.type == CardType.SCIENTIFIC]
     jolly_cards = 0
 
     # Count base symbols
     symbols: Counter[ScienceSymbol] = Counter()
     for card in science_cards:
-        if "C" in card.effect:
-            symbols[ScienceSymbol.COMPASS] += 1
-        elif "G" in card.effect:
-            symbols[ScienceSymbol.GEAR] += 1
-        elif "T" in card.effect:
-            symbols[ScienceSymbol.TABLET] += 1
+        if card.parsed_effect.science is not None:
+            symbols[card.parsed_effect.science] += 1
 
     # Count jolly cards from wonder stages and cards
-    for i in range(player.stages_built):
-        if player.wonder.stages[i].effect == JOLLY_EFFECT_NAME:
+    for stage in player.get_built_wonder_stages():
+        if stage.parsed_effect.science_choice:
             jolly_cards += 1
 
     for card in player.cards:
-        if card.effect == JOLLY_EFFECT_NAME:
+        if card.parsed_effect.science_choice:
             jolly_cards += 1
 
     def calculate_score(symbol_counts: Counter[ScienceSymbol]) -> int:
@@ -100,7 +92,7 @@ def calculate_science_score(player: Player) -> int:
     return max_score
 
 
-def calculate_commercial_score(player: Player) -> int:
+def calculate_commercial_score(player: AnyPlayer) -> int:
     """Calculate commercial (yellow card) score"""
     score = 0
     commercial_cards = [
@@ -108,79 +100,36 @@ def calculate_commercial_score(player: Player) -> int:
     ]
 
     for card in commercial_cards:
-        multiplier_score = card.effect.count("V")
-        if multiplier_score == 0:
+        points_per = card.parsed_effect.points_per
+        if points_per is None:
             continue
 
-        brackets_content = card.effect.split("{")[1].split("}")[0]
-
-        if brackets_content == "wonder":
-            score += multiplier_score * player.stages_built
-
-        elif brackets_content == "military":
-            score += multiplier_score * player.military_tokens
-
-        elif brackets_content == "commercial":
-            score += multiplier_score * player.count_cards_by_type(CardType.COMMERCIAL)
-
-        elif brackets_content == "raw_material":
-            score += multiplier_score * player.count_cards_by_type(
-                CardType.RAW_MATERIAL
-            )
-
-        elif brackets_content == "manufactured_good":
-            score += multiplier_score * player.count_cards_by_type(
-                CardType.MANUFACTURED_GOOD
-            )
-
-        else:
-            raise ValueError(f"Unknown commercial card effect: {card.effect}")
+        # Commercial cards only count the player's own cards
+        score += count_multiplier(points_per, player, player, player)
 
     return score
 
 
 def calculate_guild_score(
-    player: Player, left_neighbor: Player, right_neighbor: Player
+    player: AnyPlayer, left_neighbor: AnyPlayer, right_neighbor: AnyPlayer
 ) -> int:
     """Calculate guild (purple card) score based on various conditions"""
     score = 0
     guild_cards = [card for card in player.cards if card.type == CardType.GUILD]
 
     for card in guild_cards:
-        # If no brackets, skip since it is the scientific guild with no direct effect here
-        if "{" not in card.effect:
+        # If no multiplier, skip since it is the scientific guild with no direct effect here
+        points_per = card.parsed_effect.points_per
+        if points_per is None:
             continue
-        
-        brackets_content = card.effect.split("{")[1].split("}")[0]
-
-        if brackets_content == "wonders_complete":
-            if player.stages_built == len(player.wonder.stages):
-                score += 7
-
-        elif brackets_content == "wonder":
-            score += player.stages_built
-            score += left_neighbor.stages_built
-            score += right_neighbor.stages_built
-
-        else:
-            for card_type_brackets in brackets_content.split(";"):
-                card_type = CARD_TYPE_MAP[card_type_brackets]
-
-                # Consider self
-                if "<v>" in card.effect or ("<" not in card.effect and ">" not in card.effect):
-                    score += player.count_cards_by_type(card_type)
-                
-                # Consider neighbors
-                if "<" in card.effect:
-                    score += left_neighbor.count_cards_by_type(card_type)
-                if ">" in card.effect:
-                    score += right_neighbor.count_cards_by_type(card_type)
+
+        score += count_multiplier(points_per, player, left_neighbor, right_neighbor)
 
     return score
 
 
 def calculate_total_score(
-    player: Player, left_neighbor: Player, right_neighbor: Player
+    player: AnyPlayer, left_neighbor: AnyPlayer, right_neighbor: AnyPlayer
 ) -> Score:
     """Calculate total score for a player"""
     return Score(
@@ -192,3 +141,8 @@ def calculate_total_score(
         commercial=calculate_commercial_score(player),
         guilds=calculate_guild_score(player, left_neighbor, right_neighbor),
     )
+
+
+def get_margin(totals: Sequence[int], seat: int) -> int:
+    """Lead of a seat over the best of the others, negative when behind"""
+    return totals[seat] - max(total for other, total in enumerate(totals) if other != seat)
@@ -0,0 +1,96 @@
+import logging
+import random
+from typing import Dict, List, Optional, Sequence
+from weakref import WeakKeyDictionary
+
+from src.core.types import Card
+from src.game.determinization import build_game, get_unseen_cards
+from src.game.endgame import DEFAULT_MAX_CARDS, LAST_AGE, EndgameSolver
+from src.game.move import Move
+from src.game.player import GameView, Player, PlayerStrategy, get_variant_name
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import load_cards
+from src.utils.validators import get_left_in_list
+
+logger = logging.getLogger(__name__)
+
+
+class EndgameStrategy(PlayerStrategy):
+    """
+    Plays like the fallback strategy until the last picks of the game, then
+    solves them exactly. In the last age the hands move to the left, so the
+    hand this player passed on d turns ago is now held by the seat d places to
+    its left, less the cards picked from it since. Those picks are on the
+    table or in the discard pile, except the ones under a wonder stage: the
+    hands are rebuilt from the cards still unseen, drawing at random only
+    where a pick was hidden or the hand was never seen, from a generator
+    seeded from the player's stream of the game.
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[PlayerStrategy] = None,
+        max_cards: int = DEFAULT_MAX_CARDS,
+        deck: Optional[Sequence[Card]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.fallback = fallback if fallback is not None else SimpleStrategy()
+        self.name = name or get_variant_name(
+            self,
+            fallback=self.fallback.name or type(self.fallback).__name__,
+            max_cards=max_cards,
+        )
+        self.max_cards = max_cards
+        self.solver = EndgameSolver(max_cards)
+        self.deck = list(load_cards() if deck is None else deck)
+        # Player -> turn -> cards passed on at the end of the turn, last age only.
+        # A new game has new players, so nothing is carried over from the last one
+        self.passed: WeakKeyDictionary[Player, Dict[int, List[Card]]] = WeakKeyDictionary()
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        if game_view.age == LAST_AGE and len(player.hand) <= self.max_cards:
+            move = self.solve(player, game_view)
+        else:
+            move = self.fallback.choose_move(player, game_view)
+
+        if game_view.age == LAST_AGE:
+            hand = list(player.hand)
+            hand.remove(move.card)
+            self.passed.setdefault(player, {})[game_view.turn] = hand
+        return move
+
+    def solve(self, player: Player, game_view: GameView) -> Move:
+        rng = random.Random(player.rng.getrandbits(64))
+        game = build_game(
+            player, game_view, self.deck, [self] * len(game_view.all_players_no_hand), rng
+        )
+        for seat, hand in self.get_hidden_hands(player, game_view, rng).items():
+            game.all_players[seat].add_to_hand(hand)
+        return self.solver.solve(game, player.position).move
+
+    def get_hidden_hands(
+        self, player: Player, game_view: GameView, rng: random.Random
+    ) -> Dict[int, List[Card]]:
+        """Most likely hands of the other seats, by seat"""
+        views = game_view.all_players_no_hand
+        n_players = len(views)
+        pool = get_unseen_cards(player, game_view, self.deck)
+        passed = self.passed.get(player, {})
+
+        hands: Dict[int, List[Card]] = {}
+        seat = player.position
+        for distance in range(1, n_players):
+            seat = get_left_in_list(seat, n_players)
+            seen = passed.get(game_view.turn - distance, [])
+            candidates = [card for card in seen if card in pool]
+            if len(candidates) >= views[seat].hand_size:
+                hands[seat] = rng.sample(candidates, views[seat].hand_size)
+                for card in hands[seat]:
+                    pool.remove(card)
+
+        for view in views:
+            if view.position != player.position and view.position not in hands:
+                hands[view.position] = rng.sample(pool, view.hand_size)
+                for card in hands[view.position]:
+                    pool.remove(card)
+        return hands
@@ -0,0 +1,286 @@
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.core.enums import Action
+from src.core.types import Card
+from src.game.determinization import build_game, deal_hidden_hands, get_unseen_cards
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import (
+    ActionMask,
+    GameView,
+    Player,
+    PlayerStrategy,
+    PlayerView,
+    can_afford_cost,
+    get_action_mask,
+    get_left_neighbor,
+    get_right_neighbor,
+    get_variant_name,
+)
+from src.game.scoring import calculate_total_score
+from src.utils.parsers import load_cards
+
+logger = logging.getLogger(__name__)
+
+# A move without the player, the same in every determinization
+MoveKey = Tuple[Action, int]  # Action, card ID
+
+
+def get_move_key(move: Move) -> MoveKey:
+    return move.action, move.card.id
+
+
+@dataclass
+class SearchStats:
+    """What a search did for one move"""
+
+    iterations: int = 0
+    elapsed: float = 0.0  # Seconds
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class Node:
+    """
+    Decision of the searching player. A child can only be chosen in the
+    determinizations where it is valid, so its availability counts them
+    """
+
+    visits: int = 0
+    reward: float = 0.0  # Sum over the visits
+    availability: int = 0
+    children: Dict[MoveKey, "Node"] = field(default_factory=dict)
+
+    def get_ucb(self, exploration: float) -> float:
+        return self.reward / self.visits + exploration * math.sqrt(
+            math.log(self.availability) / self.visits
+        )
+
+
+def get_rollout_move(
+    player: Player, left: PlayerView, right: PlayerView, rng: random.Random
+) -> Move:
+    """
+    A random move that builds a card or a stage, or a random discard if none
+    can be built. The options are tried in random order and only until one is
+    valid, so most moves solve one or two costs instead of the whole hand.
+    """
+    view = player.get_player_view()
+    hand = player.hand
+    n_options = len(hand) + 1  # The last option is the wonder, with any card
+    for option in rng.sample(range(n_options), n_options):
+        if option < len(hand):
+            card = hand[option]
+            if view.can_play_no_cost(card) and (
+                view.can_chain(card) or can_afford_cost(view, left, right, card.cost)
+            ):
+                return Move(player.name, Action.PLAY, card)
+        elif view.can_build_wonder_no_cost() and can_afford_cost(
+            view, left, right, view.get_current_wonder_stage_to_be_built().cost
+        ):
+            return Move(player.name, Action.WONDER, rng.choice(hand))
+    return Move(player.name, Action.DISCARD, rng.choice(hand))
+
+
+def get_outcome(totals: Sequence[int], seat: int) -> float:
+    """Share of the other seats beaten, a tie counts as half"""
+    beaten = sum(total < totals[seat] for total in totals)
+    tied = sum(total == totals[seat] for total in totals) - 1
+    return (beaten + 0.5 * tied) / (len(totals) - 1)
+
+
+def get_most_visited_move(root: Node, mask: ActionMask) -> Move:
+    """
+    Valid move whose child of the root was visited the most. A child the mask
+    does not have is never chosen, nor does a move the search missed fail
+    """
+    visits = {key: child.visits for key, child in root.children.items()}
+    return max(mask.moves, key=lambda move: visits.get(get_move_key(move), -1))
+
+
+class MCTSStrategy(PlayerStrategy):
+    """
+    Information set Monte Carlo tree search. The game is rebuilt from the view
+    and the hand of the player, then each iteration deals the hidden hands at
+    random from the unseen cards, descends the tree of the player's own
+    decisions, plays the rest with a random rollout policy for every seat and
+    backs up the share of the table beaten. The iteration runs between a push
+    and a pop of the journal, so nothing is copied between playouts.
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 200,
+        time_limit: Optional[float] = None,  # Seconds per move
+        exploration: float = 0.7,
+        rollout_turns: Optional[int] = None,  # Turns after the tree, None to the end
+        leaf_rollouts: int = 1,  # Rollouts averaged at each leaf
+        deck: Optional[Sequence[Card]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        assert iterations is not None or time_limit is not None, "The search needs a budget"
+        self.name = name or get_variant_name(self, iterations=iterations, time_limit=time_limit)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.leaf_rollouts = leaf_rollouts
+        self.deck = list(load_cards() if deck is None else deck)
+        self.last_search = SearchStats()
+        self.total = SearchStats()
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        player_view = game_view.all_players_no_hand[player.position]
+        mask = get_action_mask(
+            player,
+            game_view.get_left_neighbor(player_view),
+            game_view.get_right_neighbor(player_view),
+        )
+        if len(mask.moves) == 1:
+            return mask.moves[0]
+
+        return get_most_visited_move(self.search(player, game_view), mask)
+
+    def search(
+        self, player: Player, game_view: GameView, rng: Optional[random.Random] = None
+    ) -> Node:
+        """
+        Run the iterations allowed by the budget, returns the root of the tree.
+        Without a generator, one is seeded from the game's stream of the player
+        """
+        if rng is None:
+            rng = random.Random(player.rng.getrandbits(64))
+        game = build_game(
+            player, game_view, self.deck, [self] * len(game_view.all_players_no_hand), rng
+        )
+        unseen = get_unseen_cards(player, game_view, self.deck)
+        root = Node()
+
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else math.inf
+        iterations = 0
+        while (self.iterations is None or iterations < self.iterations) and (
+            time.perf_counter() < deadline
+        ):
+            game.push()
+            deal_hidden_hands(game, game_view, player.position, unseen, rng)
+            self.iterate(game, root, player.position, rng)
+            game.pop()
+            iterations += 1
+
+        self.last_search = SearchStats(iterations, time.perf_counter() - start)
+        self.total.iterations += iterations
+        self.total.elapsed += self.last_search.elapsed
+        logger.info(
+            f"Player {player.name} searched {iterations} playouts "
+            f"({self.last_search.playouts_per_second:.0f}/s)"
+        )
+        return root
+
+    def iterate(self, game: GameState, root: Node, position: int, rng: random.Random) -> None:
+        """One playout from the current position, then the reward is backed up"""
+        path = [root]
+        node: Optional[Node] = root
+        # Seats that already moved this turn hold one card fewer than the player,
+        # the others are still to move, all of them under simultaneous play. The
+        # player moves first, so it decides on the position it was shown; the
+        # later turns are played in seat order, as the game does
+        hand_size = len(game.all_players[position].hand)
+        to_move = [game.all_players[position]] + [
+            player
+            for player in game.all_players
+            if len(player.hand) == hand_size and player.position != position
+        ]
+        is_over = False
+        while node is not None and not is_over:
+            for player in to_move:
+                left = get_left_neighbor(player.position, game.all_players).get_player_view()
+                right = get_right_neighbor(player.position, game.all_players).get_player_view()
+                if player.position == position:
+                    assert node is not None  # The player moves once per turn
+                    move, node = self.select(node, get_action_mask(player, left, right), rng)
+                    path.append(node)
+                    if node.visits == 0:
+                        node = None  # Expanded, the rollout starts after this turn
+                else:
+                    move = get_rollout_move(player, left, right, rng)
+                game.make_move(move)
+            is_over = game.next_turn() and game.next_age()
+            to_move = game.all_players
+
+        reward = (
+            self.evaluate(game, position) if is_over else self.evaluate_leaf(game, position, rng)
+        )
+        for visited in path:
+            visited.visits += 1
+            visited.reward += reward
+
+    def evaluate_leaf(self, game: GameState, position: int, rng: random.Random) -> float:
+        """
+        Mean reward of leaf_rollouts rollouts from the leaf. More than one
+        spreads the cost of the deal and the descent over several rollouts
+        """
+        if self.leaf_rollouts == 1:
+            self.rollout(game, rng)
+            return self.evaluate(game, position)
+
+        reward = 0.0
+        for _ in range(self.leaf_rollouts):
+            game.push()
+            self.rollout(game, rng)
+            reward += self.evaluate(game, position)
+            game.pop()
+        return reward / self.leaf_rollouts
+
+    def rollout(self, game: GameState, rng: random.Random) -> None:
+        """Play every seat with the rollout policy, for rollout_turns or to the end"""
+        turns = 0
+        while self.rollout_turns is None or turns < self.rollout_turns:
+            for player in game.all_players:
+                left = get_left_neighbor(player.position, game.all_players).get_player_view()
+                right = get_right_neighbor(player.position, game.all_players).get_player_view()
+                game.make_move(get_rollout_move(player, left, right, rng))
+            turns += 1
+            if game.next_turn() and game.next_age():
+                return
+
+    def select(self, node: Node, mask: ActionMask, rng: random.Random) -> Tuple[Move, Node]:
+        """Child to descend into, an untried one first, else the best by UCB"""
+        untried = []
+        best: Optional[Tuple[float, Move, Node]] = None
+        for move in mask.moves:
+            child = node.children.get(get_move_key(move))
+            if child is None:
+                child = node.children[get_move_key(move)] = Node()
+            child.availability += 1
+            if child.visits == 0:
+                untried.append((move, child))
+            elif not untried:
+                ucb = child.get_ucb(self.exploration)
+                if best is None or ucb > best[0]:
+                    best = (ucb, move, child)
+
+        if untried:
+            return rng.choice(untried)
+        assert best is not None
+        return best[1], best[2]
+
+    def evaluate(self, game: GameState, position: int) -> float:
+        players = game.all_players
+        totals = [
+            calculate_total_score(
+                player,
+                get_left_neighbor(player.position, players),
+                get_right_neighbor(player.position, players),
+            ).total
+            for player in players
+        ]
+        return get_outcome(totals, position)
@@ -0,0 +1,177 @@
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.core.types import Card
+from src.game.move import Move
+from src.game.player import (
+    GameView,
+    Player,
+    PlayerStrategy,
+    get_action_mask,
+    get_variant_name,
+)
+from src.game.strategies.mcts.mcts import (
+    MCTSStrategy,
+    MoveKey,
+    Node,
+    SearchStats,
+    get_most_visited_move,
+)
+from src.utils.parsers import load_cards
+
+logger = logging.getLogger(__name__)
+
+# Visits and summed reward of each root child
+RootStats = Dict[MoveKey, Tuple[int, float]]
+
+_worker_strategy: Optional[MCTSStrategy] = None
+
+
+def _init_worker(exploration: float, rollout_turns: Optional[int], leaf_rollouts: int) -> None:
+    """Parse the catalog and build the search once per worker"""
+    global _worker_strategy
+    _worker_strategy = MCTSStrategy(
+        iterations=None,
+        time_limit=math.inf,
+        exploration=exploration,
+        rollout_turns=rollout_turns,
+        leaf_rollouts=leaf_rollouts,
+        deck=load_cards(),
+    )
+
+
+def _search(
+    game_view: GameView,
+    position: int,
+    hand: Sequence[Card],
+    iterations: Optional[int],
+    time_limit: Optional[float],
+    seed: int,
+) -> Tuple[RootStats, SearchStats]:
+    """One independent search of the root, only the statistics of its children go back"""
+    strategy = _worker_strategy
+    assert strategy is not None, "The worker was not initialized"
+    strategy.iterations = iterations
+    strategy.time_limit = time_limit
+
+    view = game_view.all_players_no_hand[position]
+    player = Player(view.name, position, view.wonder, strategy)
+    player.hand = hand
+    root = strategy.search(player, game_view, random.Random(seed))
+    return (
+        {key: (child.visits, child.reward) for key, child in root.children.items()},
+        strategy.last_search,
+    )
+
+
+def merge_root_stats(results: Sequence[RootStats]) -> Node:
+    """Root with the visits and rewards of the children summed over the searches"""
+    root = Node()
+    for children in results:
+        for key, (visits, reward) in children.items():
+            child = root.children.setdefault(key, Node())
+            child.visits += visits
+            child.reward += reward
+            root.visits += visits
+            root.reward += reward
+    return root
+
+
+class ParallelMCTSStrategy(PlayerStrategy):
+    """
+    Root parallel MCTS: each worker process searches the same position with
+    its own random generator, and the visit counts of the root children are
+    summed before choosing the most visited move. Only the view, the hand and
+    the root statistics cross the process boundary, so the searches never
+    wait on each other. The pool is started once and kept for every decision;
+    call close, or use the strategy as a context manager, to stop it.
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 200,  # Over all the workers
+        time_limit: Optional[float] = None,  # Seconds per move, for every worker
+        workers: Optional[int] = None,
+        exploration: float = 0.7,
+        rollout_turns: Optional[int] = None,
+        leaf_rollouts: int = 1,
+        name: Optional[str] = None,
+    ) -> None:
+        assert iterations is not None or time_limit is not None, "The search needs a budget"
+        self.name = name or get_variant_name(self, iterations=iterations, time_limit=time_limit)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers or os.cpu_count() or 1
+        self.last_search = SearchStats()
+        self.total = SearchStats()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(exploration, rollout_turns, leaf_rollouts),
+        )
+
+    def __enter__(self) -> "ParallelMCTSStrategy":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_worker_iterations(self) -> List[Optional[int]]:
+        """The iterations split as evenly as possible, None without a count"""
+        if self.iterations is None:
+            return [None] * self.workers
+        workers = max(1, min(self.workers, self.iterations))
+        share, extra = divmod(self.iterations, workers)
+        return [share + (worker < extra) for worker in range(workers)]
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        player_view = game_view.all_players_no_hand[player.position]
+        mask = get_action_mask(
+            player,
+            game_view.get_left_neighbor(player_view),
+            game_view.get_right_neighbor(player_view),
+        )
+        if len(mask.moves) == 1:
+            return mask.moves[0]
+
+        return get_most_visited_move(self.search(player, game_view), mask)
+
+    def search(self, player: Player, game_view: GameView) -> Node:
+        """
+        Run one search per worker and merge their roots. The workers are seeded
+        from the player's stream of the game, so games replay from their seed
+        """
+        start = time.perf_counter()
+        futures: List[Future[Tuple[RootStats, SearchStats]]] = [
+            self.executor.submit(
+                _search,
+                game_view,
+                player.position,
+                tuple(player.hand),
+                iterations,
+                self.time_limit,
+                player.rng.getrandbits(64),
+            )
+            for iterations in self.get_worker_iterations()
+        ]
+        results = [future.result() for future in futures]
+
+        # Wall clock, the searches run side by side
+        self.last_search = SearchStats(
+            sum(stats.iterations for _, stats in results), time.perf_counter() - start
+        )
+        self.total.iterations += self.last_search.iterations
+        self.total.elapsed += self.last_search.elapsed
+        logger.info(
+            f"Player {player.name} searched {self.last_search.iterations} playouts on "
+            f"{len(results)} workers ({self.last_search.playouts_per_second:.0f}/s)"
+        )
+        return merge_root_stats([children for children, _ in results])
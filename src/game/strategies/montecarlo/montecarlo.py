@@ -0,0 +1,115 @@
+import logging
+import random
+import time
+from typing import List, Optional, Sequence
+
+from src.core.types import Card
+from src.game.batch import BatchEngine, BatchPolicy, BatchState, PriorityPolicy
+from src.game.determinization import get_unseen_cards, sample_hidden_hands
+from src.game.move import Move
+from src.game.player import (
+    GameView,
+    Player,
+    PlayerStrategy,
+    get_valid_moves,
+    get_variant_name,
+)
+from src.game.scoring import get_margin
+from src.game.strategies.mcts.mcts import SearchStats
+from src.utils.parsers import load_cards
+
+logger = logging.getLogger(__name__)
+
+
+class MonteCarloStrategy(PlayerStrategy):
+    """
+    Flat Monte Carlo: every valid move is played in the same sampled deals of
+    the hidden hands, then the game is played out by a batch policy for all
+    the seats, and the move with the best mean score margin is chosen. All the
+    playouts of a decision run as one lock-step batch, with no game copied.
+    Deals and seeds are shared by the moves, so the luck of a deal weighs on
+    all of them alike. They are drawn from the player's stream of the game, so
+    games replay from their seed.
+    """
+
+    def __init__(
+        self,
+        playouts: int = 10,  # Per valid move
+        policy: Optional[BatchPolicy] = None,  # Playout policy, greedy by default
+        deck: Optional[Sequence[Card]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.name = name or get_variant_name(self, playouts=playouts)
+        self.playouts = playouts
+        self.policy = policy if policy is not None else PriorityPolicy()
+        self.deck = list(load_cards() if deck is None else deck)
+        self.last_search = SearchStats()
+        self.total = SearchStats()
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        player_view = game_view.all_players_no_hand[player.position]
+        valid_moves = get_valid_moves(
+            player,
+            game_view.get_left_neighbor(player_view),
+            game_view.get_right_neighbor(player_view),
+        )
+        if len(valid_moves) == 1:
+            return valid_moves[0]
+
+        margins = self.evaluate_moves(player, game_view, valid_moves)
+        best = max(range(len(valid_moves)), key=lambda index: margins[index])
+        return valid_moves[best]
+
+    def evaluate_moves(
+        self, player: Player, game_view: GameView, moves: Sequence[Move]
+    ) -> List[float]:
+        """Mean score margin of each move over the playouts"""
+        start = time.perf_counter()
+        n_deals = self.playouts
+        rng = random.Random(player.rng.getrandbits(64))
+        unseen = get_unseen_cards(player, game_view, self.deck)
+        deals = [
+            sample_hidden_hands(game_view, player.position, player.hand, unseen, rng)
+            for _ in range(n_deals)
+        ]
+        seeds = [rng.getrandbits(63) for _ in range(n_deals)]
+
+        # Game index is move * n_deals + deal
+        state = BatchState.from_game_view(game_view, deals * len(moves))
+        views = game_view.all_players_no_hand
+        engine = BatchEngine(
+            self.deck,
+            [[view.wonder for view in views]] * state.n_games,
+            [self.policy] * len(views),
+            seeds * len(moves),
+            [view.name for view in views],
+            state=state,
+        )
+        for game in range(state.n_games):
+            engine.apply_move(game, player.position, moves[game // n_deals])
+        # Seats that already moved this turn hold one card fewer than the player,
+        # the others still have to move, all of them under simultaneous play
+        to_move = [
+            view.position
+            for view in views
+            if view.hand_size == len(player.hand) and view.position != player.position
+        ]
+        scores = engine.play_to_end(to_move)
+
+        margins = [
+            get_margin([score.total for score in game_scores], player.position)
+            for game_scores in scores
+        ]
+        mean_margins = [
+            sum(margins[index * n_deals : (index + 1) * n_deals]) / n_deals
+            for index in range(len(moves))
+        ]
+
+        self.last_search = SearchStats(state.n_games, time.perf_counter() - start)
+        self.total.iterations += state.n_games
+        self.total.elapsed += self.last_search.elapsed
+        logger.info(
+            f"Player {player.name} played {state.n_games} playouts "
+            f"({self.last_search.playouts_per_second:.0f}/s)"
+        )
+        return mean_margins
@@ -0,0 +1,136 @@
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from src.game.async_table import AsyncPlayerStrategy
+from src.game.move import Move
+from src.game.player import GameView, Player, PlayerView, get_valid_moves
+
+logger = logging.getLogger(__name__)
+
+# A bot gets a request and answers with the index of its move in valid_moves
+BotHandler = Callable[[Dict[str, Any]], Union[int, Awaitable[int]]]
+
+
+def serialize_player_view(player: PlayerView) -> Dict[str, Any]:
+    return {
+        "name": player.name,
+        "position": player.position,
+        "wonder": player.wonder.name,
+        "coins": player.coins,
+        "military_tokens": player.military_tokens,
+        "stages_built": player.stages_built,
+        "hand_size": player.hand_size,
+        "cards": [card.name for card in player.cards],
+    }
+
+
+def serialize_request(
+    request_id: int, player: Player, game_view: GameView, valid_moves: List[Move]
+) -> Dict[str, Any]:
+    """What a bot sees of the table: its own hand and the public state of everyone"""
+    return {
+        "id": request_id,
+        "player": player.name,
+        "age": game_view.age,
+        "turn": game_view.turn,
+        "hand": [card.name for card in player.hand],
+        "valid_moves": [
+            {"action": move.action.name, "card": move.card.name} for move in valid_moves
+        ],
+        "players": [serialize_player_view(view) for view in game_view.all_players_no_hand],
+        "discarded": [card.name for card in game_view.discarded_cards],
+    }
+
+
+class RemoteStrategy(AsyncPlayerStrategy):
+    """
+    Bot running as a separate process, reached over a TCP socket. Each request
+    and answer is one JSON object per line; the answer {"id": ..., "move": i}
+    picks valid_moves[i]. The connection is opened on the first move and kept.
+    An index out of range raises ValueError, so the table plays the fallback.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count()
+
+    async def choose_move(self, player: Player, game_view: GameView) -> Move:
+        player_view = game_view.all_players_no_hand[player.position]
+        valid_moves = get_valid_moves(
+            player,
+            game_view.get_left_neighbor(player_view),
+            game_view.get_right_neighbor(player_view),
+        )
+        request_id = next(self._ids)
+        request = serialize_request(request_id, player, game_view, valid_moves)
+
+        async with self._lock:
+            reader, writer = await self._connect()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    await self.close()
+                    raise ConnectionError(f"Bot at {self.host}:{self.port} disconnected")
+                answer = json.loads(line)
+                # Late answers to requests that timed out are skipped
+                if answer.get("id") == request_id:
+                    break
+
+        index = int(answer["move"])
+        # Negative indices would silently pick from the end of the list
+        if not 0 <= index < len(valid_moves):
+            raise ValueError(f"Bot at {self.host}:{self.port} answered move {index}")
+        return valid_moves[index]
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._reader is None or self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        return self._reader, self._writer
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._reader = None
+        self._writer = None
+
+
+async def serve_bot(
+    handler: BotHandler, host: str = "127.0.0.1", port: int = 0
+) -> asyncio.AbstractServer:
+    """
+    Serve a bot with the protocol of RemoteStrategy, for local bot processes
+    and tests. The handler gets each request and returns the chosen index.
+    """
+
+    async def handle_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                move = handler(request)
+                if not isinstance(move, int):
+                    move = await move
+                answer = {"id": request["id"], "move": move}
+                writer.write(json.dumps(answer).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle_connection, host, port)
@@ -24,10 +24,10 @@ class WarriorStrategy(PlayerStrategy):
         for move in valid_moves:
             shields = 0
             if move.action == Action.PLAY:
-                shields = move.card.effect.count("M")
+                shields = move.card.parsed_effect.shields
             elif move.action == Action.WONDER:
-                stage_effect = player.get_current_wonder_stage_to_be_built().effect
-                shields = stage_effect.count("M")
+                stage = player.get_current_wonder_stage_to_be_built()
+                shields = stage.parsed_effect.shields
 
             if shields > max_shields:
                 max_shields = shields
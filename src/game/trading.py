@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Mapping, Set, Tuple
+
+from src.core.constants import (
+    BASE_TRADING_COST,
+    DISCOUNTED_TRADING_COST,
+    MAXIMUM_TRADING_RESOURCES,
+)
+from src.core.enums import Resource
+from src.game.production import RESOURCE_INDEX, TRADABLE_RESOURCES, ProductionLedger
+
+Choices = Tuple[Tuple[Resource, ...], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentPlan:
+    """Coins paid to each neighbor to buy the missing resources of a cost"""
+
+    left: int
+    right: int
+
+    @property
+    def total(self) -> int:
+        return self.left + self.right
+
+
+FREE_PLAN = PaymentPlan(0, 0)
+
+
+def get_cost_signature(cost: Mapping[Resource, int]) -> Tuple[int, ...]:
+    """Resource amounts of a cost indexed like TRADABLE_RESOURCES, coins excluded"""
+    signature = [0] * len(TRADABLE_RESOURCES)
+    for resource, amount in cost.items():
+        index = RESOURCE_INDEX.get(resource)
+        if index is not None:
+            signature[index] = amount
+    return tuple(signature)
+
+
+def find_payment_plans(
+    cost: Mapping[Resource, int],
+    production: ProductionLedger,
+    left_production: ProductionLedger,
+    right_production: ProductionLedger,
+) -> Tuple[PaymentPlan, ...]:
+    """
+    Find all the cheapest ways to get the resources of a cost, using the own
+    production and buying the rest from the neighbors. The plans share the same
+    total and differ in how it is split between the neighbors. Coins in the cost
+    are not included. Empty if the resources cannot be obtained at all.
+    """
+    return _solve(
+        get_cost_signature(cost),
+        production.fixed,
+        production.choices,
+        production.left_discounts,
+        production.right_discounts,
+        left_production.tradable_fixed,
+        left_production.tradable_choices,
+        right_production.tradable_fixed,
+        right_production.tradable_choices,
+    )
+
+
+@lru_cache(maxsize=1 << 16)
+def _solve(
+    cost: Tuple[int, ...],
+    fixed: Tuple[int, ...],
+    choices: Choices,
+    left_discounts: FrozenSet[Resource],
+    right_discounts: FrozenSet[Resource],
+    left_fixed: Tuple[int, ...],
+    left_choices: Choices,
+    right_fixed: Tuple[int, ...],
+    right_choices: Choices,
+) -> Tuple[PaymentPlan, ...]:
+    missing = tuple(max(0, amount - own) for amount, own in zip(cost, fixed))
+    if not any(missing):
+        return (FREE_PLAN,)
+
+    left_prices = tuple(
+        DISCOUNTED_TRADING_COST if resource in left_discounts else BASE_TRADING_COST
+        for resource in TRADABLE_RESOURCES
+    )
+    right_prices = tuple(
+        DISCOUNTED_TRADING_COST if resource in right_discounts else BASE_TRADING_COST
+        for resource in TRADABLE_RESOURCES
+    )
+
+    best_total = -1
+    best_plans: Set[PaymentPlan] = set()
+    for still_missing in _cover_with_choices(missing, choices):
+        if sum(still_missing) > MAXIMUM_TRADING_RESOURCES:
+            continue
+
+        units = [
+            index for index, amount in enumerate(still_missing) for _ in range(amount)
+        ]
+        for plan in _buy(
+            units,
+            list(left_fixed),
+            left_choices,
+            left_prices,
+            list(right_fixed),
+            right_choices,
+            right_prices,
+        ):
+            if best_total < 0 or plan.total < best_total:
+                best_total = plan.total
+                best_plans = {plan}
+            elif plan.total == best_total:
+                best_plans.add(plan)
+
+    return tuple(sorted(best_plans, key=lambda plan: (plan.left, plan.right)))
+
+
+def _cover_with_choices(missing: Tuple[int, ...], choices: Choices) -> Set[Tuple[int, ...]]:
+    """All the missing amounts left after assigning the own multiple choice producers"""
+    results: Set[Tuple[int, ...]] = set()
+
+    def assign(index: int, still_missing: Tuple[int, ...]) -> None:
+        if index == len(choices) or not any(still_missing):
+            results.add(still_missing)
+            return
+
+        useful = False
+        for resource in choices[index]:
+            resource_index = RESOURCE_INDEX[resource]
+            if still_missing[resource_index]:
+                useful = True
+                covered = list(still_missing)
+                covered[resource_index] -= 1
+                assign(index + 1, tuple(covered))
+
+        # A producer that can cover something is always used, skipping it never helps
+        if not useful:
+            assign(index + 1, still_missing)
+
+    assign(0, missing)
+    return results
+
+
+def _buy(
+    units: List[int],
+    left_fixed: List[int],
+    left_choices: Choices,
+    left_prices: Tuple[int, ...],
+    right_fixed: List[int],
+    right_choices: Choices,
+    right_prices: Tuple[int, ...],
+) -> Set[PaymentPlan]:
+    """All the ways (as coins per neighbor) to buy the resource units from the neighbors"""
+    plans: Set[PaymentPlan] = set()
+
+    def buy(
+        unit: int, left_coins: int, right_coins: int, left_used: int, right_used: int
+    ) -> None:
+        if unit == len(units):
+            plans.add(PaymentPlan(left_coins, right_coins))
+            return
+
+        resource_index = units[unit]
+        resource = TRADABLE_RESOURCES[resource_index]
+
+        for fixed, used, choices, is_left in (
+            (left_fixed, left_used, left_choices, True),
+            (right_fixed, right_used, right_choices, False),
+        ):
+            price = left_prices[resource_index] if is_left else right_prices[resource_index]
+            next_left = left_coins + price if is_left else left_coins
+            next_right = right_coins if is_left else right_coins + price
+
+            if fixed[resource_index]:
+                fixed[resource_index] -= 1
+                buy(unit + 1, next_left, next_right, left_used, right_used)
+                fixed[resource_index] += 1
+                continue
+
+            for choice_index, choice in enumerate(choices):
+                if used >> choice_index & 1 or resource not in choice:
+                    continue
+                used_after = used | 1 << choice_index
+                buy(
+                    unit + 1,
+                    next_left,
+                    next_right,
+                    used_after if is_left else left_used,
+                    right_used if is_left else used_after,
+                )
+
+    buy(0, 0, 0, 0, 0)
+    return plans
@@ -0,0 +1,48 @@
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Iterable
+
+MASK_64 = (1 << 64) - 1
+
+
+class Feature(IntEnum):
+    """Parts of a position that get their own Zobrist keys"""
+
+    AGE = 1
+    TURN = 2
+    TABLEAU = 3  # (player position, card ID)
+    HAND = 4  # (player position, card ID, copy number)
+    COINS = 5  # (player position, coins)
+    STAGES = 6  # (player position, stages built)
+    MILITARY = 7  # (player position, military tokens)
+    DISCARD = 8  # (card ID, copy number)
+
+
+def splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(feature: Feature, *values: int) -> int:
+    """
+    Pseudo-random 64-bit key of a feature value. Derived from the values instead
+    of drawn from a table, so keys are the same in every process and run.
+    """
+    key = splitmix64(int(feature))
+    for value in values:
+        key = splitmix64(key ^ (value & MASK_64))
+    return key
+
+
+def hash_cards(feature: Feature, position: int, card_ids: Iterable[int]) -> int:
+    """Hash of a group of cards, order independent and aware of duplicates"""
+    copies: Dict[int, int] = {}
+    key = 0
+    for card_id in card_ids:
+        copy = copies.get(card_id, 0) + 1
+        copies[card_id] = copy
+        key ^= zobrist_key(feature, position, card_id, copy)
+    return key
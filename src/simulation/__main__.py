@@ -0,0 +1,57 @@
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from src.simulation.runner import STRATEGIES, check_seats, simulate
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation", description="Simulate full 7 Wonders games"
+    )
+    parser.add_argument("-n", "--games", type=int, default=100, help="Number of games")
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "simple", "simple"],
+        help="Strategy of each seat, in table order",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of the games")
+    parser.add_argument(
+        "--json", action="store_true", help="Print every game result as JSON"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log at info level")
+    args = parser.parse_args(argv)
+    check_seats(parser, len(args.strategies))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    strategies = [STRATEGIES[name]() for name in args.strategies]
+    result = simulate(args.games, strategies, args.seed)
+
+    if args.json:
+        json.dump(result.to_dict(), sys.stdout, default=str)
+        print()
+        return 0
+
+    print(
+        f"{result.n_games} games in {result.elapsed:.2f}s "
+        f"({result.games_per_second:.1f} games/s)"
+    )
+    for seat, (name, mean, win_rate) in enumerate(
+        zip(args.strategies, result.get_mean_totals(), result.get_win_rates())
+    ):
+        print(f"P{seat + 1} {name:<10} mean score {mean:6.2f}  win rate {win_rate:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from src.simulation.runner import STRATEGIES, GameResult, GameSink, check_seats, get_root_seed
+from src.simulation.stats import MatchupStats
+from src.simulation.tournament import _init_worker, _play_chunk
+from src.utils.files import save_json
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_INTERVAL = 30.0  # Seconds between two checkpoints
+
+
+def merge_ranges(ranges: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sorted ranges of game indexes, with adjacent and overlapping ones joined"""
+    merged: List[Tuple[int, int]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+@dataclass
+class Campaign:
+    """
+    Progress of a long simulation split into work units of chunk_size games.
+    Game seeds are derived from the root seed and the index of the game, so
+    the root seed is all the random state there is to save: any unit can be
+    played again, in any order, on any worker.
+    """
+
+    n_games: int
+    strategies: List[str]  # Names in STRATEGIES, in table order
+    root_seed: int
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    completed: List[Tuple[int, int]] = field(default_factory=list)  # Merged ranges
+    stats: MatchupStats = field(default_factory=MatchupStats)
+    elapsed: float = 0.0  # Seconds, over all the runs
+
+    @property
+    def n_completed(self) -> int:
+        return sum(stop - start for start, stop in self.completed)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.n_completed >= self.n_games
+
+    def get_units(self) -> List[range]:
+        return [
+            range(start, min(start + self.chunk_size, self.n_games))
+            for start in range(0, self.n_games, self.chunk_size)
+        ]
+
+    def is_completed(self, unit: range) -> bool:
+        return any(start <= unit.start and unit.stop <= stop for start, stop in self.completed)
+
+    def get_pending_units(self) -> List[range]:
+        return [unit for unit in self.get_units() if not self.is_completed(unit)]
+
+    def add_unit(self, unit: range, games: Sequence[GameResult]) -> None:
+        for game in games:
+            self.stats.add(game)
+        self.completed = merge_ranges([*self.completed, (unit.start, unit.stop)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "n_games": self.n_games,
+            "strategies": self.strategies,
+            "root_seed": self.root_seed,
+            "chunk_size": self.chunk_size,
+            "completed": self.completed,
+            "stats": self.stats.to_dict(),
+            "elapsed": self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Campaign":
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {data.get('version')}")
+        return cls(
+            n_games=data["n_games"],
+            strategies=data["strategies"],
+            root_seed=data["root_seed"],
+            chunk_size=data["chunk_size"],
+            completed=[(start, stop) for start, stop in data["completed"]],
+            stats=MatchupStats.from_dict(data["stats"]),
+            elapsed=data["elapsed"],
+        )
+
+
+def save_checkpoint(campaign: Campaign, path: Union[str, Path]) -> None:
+    save_json(campaign.to_dict(), path)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Campaign:
+    with open(path, "r") as f:
+        return Campaign.from_dict(json.load(f))
+
+
+def run_campaign(
+    path: Union[str, Path],
+    n_games: int,
+    strategy_names: Sequence[str],
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,  # DEFAULT_CHUNK_SIZE for a new campaign
+    interval: float = DEFAULT_INTERVAL,
+    max_units: Optional[int] = None,
+    sink: Optional[GameSink] = None,
+) -> Campaign:
+    """
+    Play the games of a campaign on a pool of worker processes, saving a
+    checkpoint at most every interval seconds and when the run stops, also on
+    an error or an interrupt. If the checkpoint exists the campaign resumes:
+    completed units are skipped and the others are played with the same seeds.
+    A seed or a chunk size given on resume must match the checkpoint, since
+    the games would not be the same otherwise.
+    max_units bounds the units played by this run, e.g. for a time-boxed job.
+    The sink sees each game at least once: the games of the units finished
+    after the last checkpoint of a crashed run are played again on resume.
+    """
+    path = Path(path)
+    if path.exists():
+        campaign = load_checkpoint(path)
+        if campaign.strategies != list(strategy_names) or campaign.n_games != n_games:
+            raise ValueError(f"Checkpoint {path} is for another campaign")
+        if seed is not None and seed != campaign.root_seed:
+            raise ValueError(f"Checkpoint {path} has root seed {campaign.root_seed}, not {seed}")
+        if chunk_size is not None and chunk_size != campaign.chunk_size:
+            raise ValueError(
+                f"Checkpoint {path} has chunk size {campaign.chunk_size}, not {chunk_size}"
+            )
+        logger.info(f"Resuming {path}: {campaign.n_completed} of {n_games} games done")
+    else:
+        campaign = Campaign(
+            n_games, list(strategy_names), get_root_seed(seed), chunk_size or DEFAULT_CHUNK_SIZE
+        )
+
+    pending = campaign.get_pending_units()[:max_units]
+    workers = workers or os.cpu_count() or 1
+    start = last_save = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(tuple(campaign.strategies),),
+        ) as executor:
+            futures: Dict[Future[List[GameResult]], range] = {
+                executor.submit(_play_chunk, campaign.root_seed, unit): unit
+                for unit in pending
+            }
+            remaining: Set[Future[List[GameResult]]] = set(futures)
+            try:
+                while remaining:
+                    done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        games = future.result()
+                        campaign.add_unit(futures[future], games)
+                        if sink is not None:
+                            for game in games:
+                                sink(game)
+
+                    now = time.perf_counter()
+                    if now - last_save >= interval:
+                        campaign.elapsed += now - start
+                        start = last_save = now
+                        save_checkpoint(campaign, path)
+            except BaseException:
+                # Do not wait for the units not started yet before saving
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        campaign.elapsed += time.perf_counter() - start
+        save_checkpoint(campaign, path)
+
+    logger.info(f"Campaign {path}: {campaign.n_completed} of {n_games} games done")
+    return campaign
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation.checkpoint",
+        description="Run a long campaign of games that can be stopped and resumed",
+    )
+    parser.add_argument("checkpoint", help="JSON checkpoint, resumed if it exists")
+    parser.add_argument("-n", "--games", type=int, default=100_000, help="Number of games")
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "warrior", "simple"],
+        help="Strategy of each seat, in table order",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of a new campaign")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help=f"Games per work unit of a new campaign, {DEFAULT_CHUNK_SIZE} by default",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between checkpoints"
+    )
+    args = parser.parse_args(argv)
+    check_seats(parser, len(args.strategies))
+
+    campaign = run_campaign(
+        args.checkpoint,
+        args.games,
+        args.strategies,
+        args.seed,
+        args.workers,
+        args.chunk_size,
+        args.interval,
+    )
+    print(
+        f"{campaign.n_completed} of {campaign.n_games} games in {campaign.elapsed:.2f}s, "
+        f"root seed {campaign.root_seed}"
+    )
+    for name, stats in sorted(campaign.stats.by_strategy.items()):
+        print(
+            f"{name:<16} seats {stats.games:6d}  mean score {stats.scores['total'].mean:6.2f}"
+            f"  win rate {stats.win_rate:6.1%}"
+        )
+    return 0 if campaign.is_complete else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
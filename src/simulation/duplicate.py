@@ -0,0 +1,201 @@
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+from src.game.player import PlayerStrategy
+from src.simulation.runner import (
+    STRATEGIES,
+    GameResult,
+    GameSink,
+    check_seats,
+    get_game_seed,
+    get_root_seed,
+    get_strategy_name,
+    load_cards,
+    load_wonders,
+    play_game,
+)
+from src.simulation.stats import RunningStats
+
+logger = logging.getLogger(__name__)
+
+
+def get_win_share(game: GameResult, seat: int) -> float:
+    """1 for a win, a fraction of it on a tie"""
+    winners = game.winners
+    return 1 / len(winners) if seat in winners else 0.0
+
+
+@dataclass
+class DuplicateBoard:
+    """
+    One deal and wonder assignment, played by each of the two compared
+    strategies from every seat, against the same field. All the games of a
+    board have the same seed, and the i-th games of both have the compared
+    strategy at seats[i].
+    """
+
+    index: int
+    seed: int
+    seats: List[int] = field(default_factory=list)
+    first_games: List[GameResult] = field(default_factory=list)
+    second_games: List[GameResult] = field(default_factory=list)
+
+    @property
+    def games(self) -> List[GameResult]:
+        return [*self.first_games, *self.second_games]
+
+    def get_difference(self, value: Callable[[GameResult, int], float]) -> float:
+        """Mean over the seats of the paired difference of a per-seat value"""
+        return sum(
+            value(first, seat) - value(second, seat)
+            for seat, first, second in zip(self.seats, self.first_games, self.second_games)
+        ) / len(self.seats)
+
+    def get_score_difference(self) -> float:
+        return self.get_difference(lambda game, seat: game.totals[seat])
+
+    def get_win_difference(self) -> float:
+        return self.get_difference(get_win_share)
+
+
+# Receives each board once all of its games are played
+BoardSink = Callable[[DuplicateBoard], None]
+
+
+@dataclass
+class DuplicateResult:
+    """Paired differences of the first strategy minus the second, one per board"""
+
+    first: str
+    second: str
+    root_seed: int = 0  # With the index of a board, enough to replay it
+    n_boards: int = 0
+    n_games: int = 0
+    score_difference: RunningStats = field(default_factory=RunningStats)
+    win_difference: RunningStats = field(default_factory=RunningStats)
+    elapsed: float = 0.0  # Seconds
+
+    def add_board(self, board: DuplicateBoard) -> None:
+        self.n_boards += 1
+        self.n_games += len(board.games)
+        self.score_difference.add(board.get_score_difference())
+        self.win_difference.add(board.get_win_difference())
+
+
+def get_lineup(
+    strategy: PlayerStrategy, field_strategies: Sequence[PlayerStrategy], seat: int
+) -> List[PlayerStrategy]:
+    """The strategy at the seat, the field around it in the same order from it"""
+    n_seats = len(field_strategies) + 1
+    lineup: List[PlayerStrategy] = [strategy] * n_seats
+    for offset, other in enumerate(field_strategies, start=1):
+        lineup[(seat + offset) % n_seats] = other
+    return lineup
+
+
+def play_board(
+    first: PlayerStrategy,
+    second: PlayerStrategy,
+    field_strategies: Sequence[PlayerStrategy],
+    seed: int,
+    index: int = 0,
+) -> DuplicateBoard:
+    """
+    Play the deal of the seed with each compared strategy at every seat. Each
+    seat has its own stream for trading tie-breaks, so both strategies face the
+    same cards, wonders, opponents and random numbers, and only their own
+    decisions differ
+    """
+    cards = load_cards()
+    wonders = load_wonders()
+    board = DuplicateBoard(index, seed)
+    for seat in range(len(field_strategies) + 1):
+        board.seats.append(seat)
+        for strategy, games in ((first, board.first_games), (second, board.second_games)):
+            lineup = get_lineup(strategy, field_strategies, seat)
+            games.append(play_game(lineup, seed, cards, wonders, index, seat_streams=True))
+    return board
+
+
+def run_duplicate(
+    n_boards: int,
+    first: PlayerStrategy,
+    second: PlayerStrategy,
+    field_strategies: Sequence[PlayerStrategy],
+    seed: Optional[int] = None,
+    sink: Optional[BoardSink] = None,
+    game_sink: Optional[GameSink] = None,
+) -> DuplicateResult:
+    """
+    Duplicate tournament: every deal is played by both strategies from every
+    seat against the same field. The luck of the deal and of the seat is the
+    same on both sides of each paired difference, so it cancels out instead of
+    adding to the variance of the comparison.
+    """
+    root_seed = get_root_seed(seed)
+    result = DuplicateResult(get_strategy_name(first), get_strategy_name(second), root_seed)
+    start = time.perf_counter()
+    for index in range(n_boards):
+        board = play_board(
+            first, second, field_strategies, get_game_seed(root_seed, index), index
+        )
+        result.add_board(board)
+        if game_sink is not None:
+            for game in board.games:
+                game_sink(game)
+        if sink is not None:
+            sink(board)
+    result.elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Duplicate of {n_boards} boards, {result.n_games} games in {result.elapsed:.2f}s"
+    )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation.duplicate",
+        description="Compare two strategies on the same deals, from every seat",
+    )
+    parser.add_argument("-n", "--boards", type=int, default=100, help="Number of deals")
+    parser.add_argument("first", choices=sorted(STRATEGIES))
+    parser.add_argument("second", choices=sorted(STRATEGIES))
+    parser.add_argument(
+        "-f",
+        "--field",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "simple"],
+        help="Strategies of the other seats",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of the deals")
+    args = parser.parse_args(argv)
+    check_seats(parser, 1 + len(args.field))
+
+    result = run_duplicate(
+        args.boards,
+        STRATEGIES[args.first](),
+        STRATEGIES[args.second](),
+        [STRATEGIES[name]() for name in args.field],
+        args.seed,
+    )
+
+    print(
+        f"{result.n_boards} boards, {result.n_games} games in {result.elapsed:.2f}s, "
+        f"root seed {result.root_seed}"
+    )
+    for label, stats in (("score", result.score_difference), ("win rate", result.win_difference)):
+        print(
+            f"{label:<8} {args.first} - {args.second}: "
+            f"{stats.mean:+.3f} ± {1.96 * stats.stderr:.3f} (95%)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import argparse
+import json
+import logging
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.simulation.runner import STRATEGIES, GameResult, check_seats, simulate
+from src.utils.files import save_json
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+
+
+@dataclass
+class Rating:
+    rating: float = INITIAL_RATING
+    games: int = 0  # Seats played, a strategy at two seats of a game plays two
+
+
+@dataclass
+class RatingUpdate:
+    """Changes computed from fixed ratings, so shards can be summed and applied once"""
+
+    deltas: Dict[str, float]
+    games: Dict[str, int]
+
+    def merge(self, other: "RatingUpdate") -> None:
+        for name, delta in other.deltas.items():
+            self.deltas[name] = self.deltas.get(name, 0.0) + delta
+        for name, games in other.games.items():
+            self.games[name] = self.games.get(name, 0) + games
+
+
+def get_outcomes(totals: Sequence[int]) -> List[float]:
+    """
+    Share of the other seats each seat beat, a tie counts as half. Sorting the
+    totals once gives the number of lower and equal totals of each seat.
+    """
+    n_seats = len(totals)
+    if n_seats < 2:
+        return [0.5] * n_seats
+    counts = Counter(totals)
+    lower: Dict[int, int] = {}
+    seen = 0
+    for total in sorted(counts):
+        lower[total] = seen
+        seen += counts[total]
+    return [
+        (lower[total] + 0.5 * (counts[total] - 1)) / (n_seats - 1) for total in totals
+    ]
+
+
+def get_expected_outcome(rating: float, opponents: float) -> float:
+    return 1 / (1 + 10 ** ((opponents - rating) / 400))
+
+
+class RatingPool:
+    """
+    Elo ratings of strategies from multi-player games. Each seat is scored as
+    one match against the mean rating of the others, with the share of the
+    table it beat as result, so an update is linear in the number of seats.
+    Strategies start with a higher K factor until they have played
+    provisional_games seats, so a new strategy converges quickly against an
+    established pool without moving it much.
+    """
+
+    def __init__(
+        self,
+        k_factor: float = 16.0,
+        provisional_k_factor: float = 48.0,
+        provisional_games: int = 30,
+        ratings: Optional[Dict[str, Rating]] = None,
+    ) -> None:
+        self.k_factor = k_factor
+        self.provisional_k_factor = provisional_k_factor
+        self.provisional_games = provisional_games
+        self.ratings: Dict[str, Rating] = ratings if ratings is not None else {}
+
+    def __call__(self, game: GameResult) -> None:
+        self.update(game)
+
+    def get_rating(self, name: str) -> Rating:
+        return self.ratings.get(name) or Rating()
+
+    def get_k_factor(self, name: str) -> float:
+        if self.get_rating(name).games < self.provisional_games:
+            return self.provisional_k_factor
+        return self.k_factor
+
+    def get_update(self, games: Iterable[GameResult]) -> RatingUpdate:
+        """Changes of the ratings for the games, all against the current ratings"""
+        update = RatingUpdate({}, {})
+        for game in games:
+            ratings = [self.get_rating(name).rating for name in game.strategies]
+            rating_sum = sum(ratings)
+            n_others = len(ratings) - 1
+            for name, rating, outcome in zip(
+                game.strategies, ratings, get_outcomes(game.totals)
+            ):
+                opponents = (rating_sum - rating) / n_others if n_others else rating
+                delta = self.get_k_factor(name) * (
+                    outcome - get_expected_outcome(rating, opponents)
+                )
+                update.deltas[name] = update.deltas.get(name, 0.0) + delta
+                update.games[name] = update.games.get(name, 0) + 1
+        return update
+
+    def apply(self, update: RatingUpdate) -> None:
+        for name, delta in update.deltas.items():
+            rating = self.ratings.setdefault(name, Rating())
+            rating.rating += delta
+            rating.games += update.games.get(name, 0)
+
+    def update(self, game: GameResult) -> None:
+        """Rate one game, usable as the sink of a simulation"""
+        self.apply(self.get_update([game]))
+
+    def update_batch(self, games: Iterable[GameResult]) -> None:
+        """
+        Rate a batch of games at once against the ratings before the batch, the
+        result does not depend on the order of the games, e.g. across shards
+        """
+        self.apply(self.get_update(games))
+
+    def get_leaderboard(self) -> List[Tuple[str, Rating]]:
+        return sorted(self.ratings.items(), key=lambda item: item[1].rating, reverse=True)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "k_factor": self.k_factor,
+            "provisional_k_factor": self.provisional_k_factor,
+            "provisional_games": self.provisional_games,
+            "ratings": {name: asdict(rating) for name, rating in self.ratings.items()},
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Replace the file atomically, a crash never leaves a truncated pool"""
+        save_json(self.to_dict(), path, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RatingPool":
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(
+            data["k_factor"],
+            data["provisional_k_factor"],
+            data["provisional_games"],
+            {name: Rating(**rating) for name, rating in data["ratings"].items()},
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation.rating",
+        description="Play games and update the ratings of the strategies",
+    )
+    parser.add_argument("-n", "--games", type=int, default=100, help="Number of games")
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "warrior", "simple"],
+        help="Strategy of each seat, in table order",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of the games")
+    parser.add_argument(
+        "-r",
+        "--ratings",
+        default=None,
+        help="JSON file of the pool, loaded if it exists and saved after the games",
+    )
+    args = parser.parse_args(argv)
+    check_seats(parser, len(args.strategies))
+
+    path = Path(args.ratings) if args.ratings else None
+    pool = RatingPool.load(path) if path is not None and path.exists() else RatingPool()
+    strategies = [STRATEGIES[name]() for name in args.strategies]
+    simulate(args.games, strategies, args.seed, sink=pool.update)
+    if path is not None:
+        pool.save(path)
+
+    for place, (name, rating) in enumerate(pool.get_leaderboard(), start=1):
+        print(f"{place:2d}. {name:<16} {rating.rating:7.1f}  seats {rating.games:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import glob
+import json
+import logging
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from src.core.types import Score
+from src.simulation.runner import GameResult
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = [score_field.name for score_field in fields(Score)]
+
+# One row per seat in the columnar files
+SEAT_COLUMNS = [
+    "index",
+    "seed",
+    "turns",
+    "seat",
+    "player",
+    "strategy",
+    "wonder",
+    *SCORE_FIELDS,
+    "total",
+    "won",
+]
+
+JSONL_SUFFIX = ".jsonl"
+COLUMNS_SUFFIX = ".columns.jsonl"
+
+
+def game_to_record(game: GameResult) -> Dict[str, Any]:
+    """Flat JSON record of a game, the seats are in table order"""
+    return {
+        "index": game.index,
+        "seed": game.seed,
+        "turns": game.turns,
+        "duration": game.duration,
+        "players": game.players,
+        "strategies": game.strategies,
+        "wonders": game.wonders,
+        "scores": [asdict(score) for score in game.scores],
+        "totals": game.totals,
+        "winners": game.winners,
+    }
+
+
+def game_to_rows(game: GameResult) -> Iterator[List[Any]]:
+    """Rows of the seats of a game, in the order of SEAT_COLUMNS"""
+    winners = game.winners
+    for seat, score in enumerate(game.scores):
+        yield [
+            game.index,
+            game.seed,
+            game.turns,
+            seat,
+            game.players[seat],
+            game.strategies[seat],
+            game.wonders[seat],
+            *(getattr(score, name) for name in SCORE_FIELDS),
+            score.total,
+            seat in winners,
+        ]
+
+
+class ResultsWriter:
+    """
+    Streams game results to disk as they complete, so a campaign of any size
+    runs in constant memory. Results are buffered and written every batch_size
+    games, both as JSONL (one game per line) and as a columnar file, where each
+    line is a chunk of columns with one entry per seat. Files are rotated after
+    max_games_per_file games: <prefix>-00000.jsonl, <prefix>-00000.columns.jsonl...
+    Parts are never overwritten: a directory that already holds parts with the
+    same prefix raises FileExistsError, use another prefix or directory.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str = "results",
+        batch_size: int = 1000,
+        max_games_per_file: int = 1_000_000,
+        jsonl: bool = True,
+        columns: bool = True,
+    ) -> None:
+        assert batch_size > 0 and max_games_per_file > 0
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Checked up front, instead of failing on the first flush after hours of games
+        part_pattern = f"{glob.escape(prefix)}-[0-9][0-9][0-9][0-9][0-9]"
+        existing = sorted(
+            path
+            for suffix in (JSONL_SUFFIX, COLUMNS_SUFFIX)
+            for path in self.directory.glob(part_pattern + suffix)
+        )
+        if existing:
+            raise FileExistsError(f"Results already written to {existing[0]}")
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.max_games_per_file = max_games_per_file
+        self.jsonl = jsonl
+        self.columns = columns
+
+        self.n_games = 0  # Written to disk so far
+        self.part = 0
+        self.paths: List[Path] = []
+        self._buffer: List[GameResult] = []
+        self._games_in_part = 0
+        self._jsonl_file: Optional[IO[str]] = None
+        self._columns_file: Optional[IO[str]] = None
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def write(self, game: GameResult) -> None:
+        self._buffer.append(game)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered games, splitting them where a file is rotated"""
+        buffer = self._buffer
+        self._buffer = []
+        while buffer:
+            if self._games_in_part >= self.max_games_per_file:
+                self._rotate()
+            room = self.max_games_per_file - self._games_in_part
+            self._write_batch(buffer[:room])
+            buffer = buffer[room:]
+
+        for file in (self._jsonl_file, self._columns_file):
+            if file is not None:
+                file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._close_files()
+
+    def _write_batch(self, games: Sequence[GameResult]) -> None:
+        self._open_files()
+        if self._jsonl_file is not None:
+            self._jsonl_file.write(
+                "".join(json.dumps(game_to_record(game)) + "\n" for game in games)
+            )
+        if self._columns_file is not None:
+            chunk: Dict[str, List[Any]] = {column: [] for column in SEAT_COLUMNS}
+            for game in games:
+                for row in game_to_rows(game):
+                    for column, value in zip(SEAT_COLUMNS, row):
+                        chunk[column].append(value)
+            self._columns_file.write(json.dumps(chunk) + "\n")
+
+        self._games_in_part += len(games)
+        self.n_games += len(games)
+
+    def _open_files(self) -> None:
+        if self._jsonl_file is not None or self._columns_file is not None:
+            return
+        stem = f"{self.prefix}-{self.part:05d}"
+        if self.jsonl:
+            self._jsonl_file = self._open(self.directory / (stem + JSONL_SUFFIX))
+        if self.columns:
+            self._columns_file = self._open(self.directory / (stem + COLUMNS_SUFFIX))
+
+    def _open(self, path: Path) -> IO[str]:
+        # Exclusive, in case another writer started in the same directory since
+        file = open(path, "x")
+        self.paths.append(path)
+        return file
+
+    def _rotate(self) -> None:
+        self._close_files()
+        self.part += 1
+        self._games_in_part = 0
+        logger.info(f"Rotated results to part {self.part} after {self.n_games} games")
+
+    def _close_files(self) -> None:
+        for file in (self._jsonl_file, self._columns_file):
+            if file is not None:
+                file.close()
+        self._jsonl_file = None
+        self._columns_file = None
+
+
+def read_records(paths: Iterable[Union[str, Path]]) -> Iterator[Dict[str, Any]]:
+    """Iterate over the game records of JSONL result files, one at a time"""
+    for path in paths:
+        with open(path, "r") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def read_columns(paths: Iterable[Union[str, Path]]) -> Iterator[Dict[str, List[Any]]]:
+    """Iterate over the column chunks of columnar result files"""
+    for path in paths:
+        with open(path, "r") as f:
+            for line in f:
+                yield json.loads(line)
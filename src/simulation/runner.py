@@ -0,0 +1,234 @@
+import argparse
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+from src.core.types import Card, Score, Wonder
+from src.game.game_state import GameState, check_player_count
+from src.game.player import Player, PlayerStrategy
+from src.game.strategies.endgame.endgame import EndgameStrategy
+from src.game.strategies.mcts.mcts import MCTSStrategy
+from src.game.strategies.montecarlo.montecarlo import MonteCarloStrategy
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.utils.parsers import load_cards, load_wonders
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES: Dict[str, Type[PlayerStrategy]] = {
+    "simple": SimpleStrategy,
+    "warrior": WarriorStrategy,
+    "mcts": MCTSStrategy,
+    "montecarlo": MonteCarloStrategy,
+    "endgame": EndgameStrategy,
+}
+
+
+def get_strategy_name(strategy: PlayerStrategy) -> str:
+    return strategy.name or type(strategy).__name__
+
+
+@dataclass
+class GameResult:
+    """Outcome of one game, seats are in table order"""
+
+    seed: int
+    players: List[str]
+    strategies: List[str]
+    wonders: List[str]
+    scores: List[Score]
+    duration: float  # Seconds
+    index: int = 0  # Position of the game in its simulation
+    turns: int = 0  # Turns played over the three ages
+
+    @property
+    def totals(self) -> List[int]:
+        return [score.total for score in self.scores]
+
+    @property
+    def winners(self) -> List[int]:
+        """Seats with the highest total, more than one on a tie"""
+        best = max(self.totals)
+        return [seat for seat, total in enumerate(self.totals) if total == best]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["totals"] = self.totals
+        result["winners"] = self.winners
+        return result
+
+
+# Receives each game as soon as it is played
+GameSink = Callable[[GameResult], None]
+
+
+@dataclass
+class SimulationResult:
+    root_seed: int = 0  # With the index of a game, enough to replay it
+    games: List[GameResult] = field(default_factory=list)  # Empty if streamed
+    elapsed: float = 0.0  # Seconds, wall clock for the whole simulation
+    n_games: int = 0  # Played, also when the games are streamed to a sink
+
+    def add_game(self, game: GameResult, sink: Optional[GameSink] = None) -> None:
+        """Keep the game, or hand it to the sink so memory does not grow"""
+        self.n_games += 1
+        if sink is None:
+            self.games.append(game)
+        else:
+            sink(game)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.n_games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def get_mean_totals(self) -> List[float]:
+        """Mean total score of each seat"""
+        if not self.games:
+            return []
+        n_seats = len(self.games[0].scores)
+        return [
+            sum(game.totals[seat] for game in self.games) / len(self.games)
+            for seat in range(n_seats)
+        ]
+
+    def get_win_rates(self) -> List[float]:
+        """Share of the games won by each seat, a tie counts as a fraction of a win"""
+        if not self.games:
+            return []
+        wins = [0.0] * len(self.games[0].scores)
+        for game in self.games:
+            for seat in game.winners:
+                wins[seat] += 1 / len(game.winners)
+        return [win / len(self.games) for win in wins]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "root_seed": self.root_seed,
+            "n_games": self.n_games,
+            "elapsed": self.elapsed,
+            "games_per_second": self.games_per_second,
+            "mean_totals": self.get_mean_totals(),
+            "win_rates": self.get_win_rates(),
+            "games": [game.to_dict() for game in self.games],
+        }
+
+
+def check_seats(parser: argparse.ArgumentParser, n_players: int) -> None:
+    """Stop a command line with a usage error if the catalog cannot seat the players"""
+    try:
+        check_player_count(list(load_cards()), n_players)
+    except ValueError as error:
+        parser.error(str(error))
+
+
+def setup_game(
+    strategies: Sequence[PlayerStrategy],
+    seed: int,
+    cards: Optional[Sequence[Card]] = None,
+    wonders: Optional[Sequence[Wonder]] = None,
+    seat_streams: bool = False,
+) -> GameState:
+    """
+    Seat the strategies in order, with wonders drawn from the seed, ready for
+    the first deal. See play_game for seat_streams
+    """
+    cards = load_cards() if cards is None else cards
+    wonders = load_wonders() if wonders is None else wonders
+    check_player_count(list(cards), len(strategies))
+
+    rng = random.Random(seed)
+    seated_wonders = rng.sample(list(wonders), len(strategies))
+    players = [
+        Player(f"P{seat + 1}", seat, wonder, strategy)
+        for seat, (wonder, strategy) in enumerate(zip(seated_wonders, strategies))
+    ]
+    seat_rngs = (
+        [random.Random(f"{seed}/seat/{seat}") for seat in range(len(players))]
+        if seat_streams
+        else None
+    )
+    return GameState(players, list(cards), rng, seat_rngs)
+
+
+def play_game(
+    strategies: Sequence[PlayerStrategy],
+    seed: int,
+    cards: Optional[Sequence[Card]] = None,
+    wonders: Optional[Sequence[Wonder]] = None,
+    index: int = 0,
+    seat_streams: bool = False,
+) -> GameResult:
+    """
+    Play one full game, from the first deal to the final scores. The seed sets
+    the wonders given to the seats and everything random in the game. With
+    seat_streams, the trading tie-breaks of each seat draw from a stream of
+    their own, so the same seed gives the same deals and the same tie-breaks
+    by seat whichever strategies sit at the table
+    """
+    start = time.perf_counter()
+    game = setup_game(strategies, seed, cards, wonders, seat_streams)
+    scores = game.play_game()
+
+    players = game.all_players
+    return GameResult(
+        seed=seed,
+        players=[player.name for player in players],
+        strategies=[get_strategy_name(strategy) for strategy in strategies],
+        wonders=[player.wonder.name for player in players],
+        scores=scores,
+        duration=time.perf_counter() - start,
+        index=index,
+        turns=game.turns_played,
+    )
+
+
+def get_root_seed(seed: Optional[int] = None) -> int:
+    """The given root seed, or a fresh one so that unseeded runs can be replayed"""
+    return seed if seed is not None else random.SystemRandom().getrandbits(63)
+
+
+def get_game_seed(root_seed: int, index: int) -> int:
+    """
+    Seed of a game of a simulation. Derived from the root seed and the index
+    alone, so each game has its own stream, independent from the others and
+    from the order in which the games are played
+    """
+    return random.Random(f"{root_seed}/{index}").getrandbits(63)
+
+
+def replay_game(
+    strategies: Sequence[PlayerStrategy], root_seed: int, index: int
+) -> GameResult:
+    """Play again a game of a simulation, from its root seed and index"""
+    return play_game(strategies, get_game_seed(root_seed, index), index=index)
+
+
+def simulate(
+    n_games: int,
+    strategies: Sequence[PlayerStrategy],
+    seed: Optional[int] = None,
+    sink: Optional[GameSink] = None,
+) -> SimulationResult:
+    """
+    Play n_games full games with the strategies seated in order. Any game can
+    be replayed alone with replay_game, from the root seed of the result (a
+    random one if no seed is given) and the index of the game. With a sink
+    (e.g. ResultsWriter.write) each game is streamed to it instead of kept.
+    """
+    root_seed = get_root_seed(seed)
+    cards = load_cards()
+    wonders = load_wonders()
+
+    result = SimulationResult(root_seed)
+    start = time.perf_counter()
+    for index in range(n_games):
+        game_seed = get_game_seed(root_seed, index)
+        result.add_game(play_game(strategies, game_seed, cards, wonders, index), sink)
+    result.elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Simulated {n_games} games in {result.elapsed:.2f}s ({result.games_per_second:.1f} games/s)"
+    )
+    return result
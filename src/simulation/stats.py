@@ -0,0 +1,315 @@
+import argparse
+import logging
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass, field, fields
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.types import Score
+from src.game.player import PlayerStrategy
+from src.simulation.runner import (
+    STRATEGIES,
+    GameResult,
+    GameSink,
+    SimulationResult,
+    check_seats,
+    get_game_seed,
+    get_root_seed,
+    get_strategy_name,
+    load_cards,
+    load_wonders,
+    play_game,
+)
+
+logger = logging.getLogger(__name__)
+
+SCORE_COMPONENTS = [score_field.name for score_field in fields(Score)]
+
+
+@dataclass
+class RunningStats:
+    """Mean and variance updated one value at a time (Welford), in constant memory"""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of the squared deviations from the mean
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine with the stats of another stream, e.g. from another worker"""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 until there are two values"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean, unknown until there are two values"""
+        return self.std / math.sqrt(self.n) if self.n > 1 else math.inf
+
+
+@dataclass
+class OutcomeStats:
+    """Results of the seats played by a strategy, or of a seat whoever plays it"""
+
+    games: int = 0
+    wins: float = 0.0  # A tie counts as a fraction of a win
+    scores: Dict[str, RunningStats] = field(
+        default_factory=lambda: {name: RunningStats() for name in [*SCORE_COMPONENTS, "total"]}
+    )
+    ranks: List[int] = field(default_factory=list)  # Games finished at each rank, 1st first
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    def get_rank_distribution(self) -> List[float]:
+        return [count / self.games for count in self.ranks] if self.games else []
+
+    def add(self, score: Score, rank: int, win: float) -> None:
+        self.games += 1
+        self.wins += win
+        for name in SCORE_COMPONENTS:
+            self.scores[name].add(getattr(score, name))
+        self.scores["total"].add(score.total)
+        if len(self.ranks) < rank:
+            self.ranks.extend([0] * (rank - len(self.ranks)))
+        self.ranks[rank - 1] += 1
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutcomeStats":
+        return cls(
+            data["games"],
+            data["wins"],
+            {name: RunningStats(**stats) for name, stats in data["scores"].items()},
+            data["ranks"],
+        )
+
+
+def get_ranks(totals: Sequence[int]) -> List[int]:
+    """Rank of each seat, 1 for the best; tied seats share the best of their ranks"""
+    return [1 + sum(other > total for other in totals) for total in totals]
+
+
+class MatchupStats:
+    """
+    Aggregates games as they are played, by strategy and by seat, without
+    keeping them. Can be used as the sink of simulate or run_tournament.
+    """
+
+    def __init__(self) -> None:
+        self.n_games = 0
+        self.by_strategy: Dict[str, OutcomeStats] = {}
+        self.by_seat: List[OutcomeStats] = []
+
+    def __call__(self, game: GameResult) -> None:
+        self.add(game)
+
+    def add(self, game: GameResult) -> None:
+        self.n_games += 1
+        winners = game.winners
+        ranks = get_ranks(game.totals)
+        while len(self.by_seat) < len(game.scores):
+            self.by_seat.append(OutcomeStats())
+
+        for seat, (strategy, score) in enumerate(zip(game.strategies, game.scores)):
+            win = 1 / len(winners) if seat in winners else 0.0
+            self.by_strategy.setdefault(strategy, OutcomeStats()).add(score, ranks[seat], win)
+            self.by_seat[seat].add(score, ranks[seat], win)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n_games": self.n_games,
+            "by_strategy": {name: asdict(stats) for name, stats in self.by_strategy.items()},
+            "by_seat": [asdict(stats) for stats in self.by_seat],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MatchupStats":
+        stats = cls()
+        stats.n_games = data["n_games"]
+        stats.by_strategy = {
+            name: OutcomeStats.from_dict(outcome) for name, outcome in data["by_strategy"].items()
+        }
+        stats.by_seat = [OutcomeStats.from_dict(outcome) for outcome in data["by_seat"]]
+        return stats
+
+
+class SequentialTest:
+    """
+    Sequential comparison of the win rates of two strategies. Each game gives
+    one paired difference, the mean share of a win of the seats of the first
+    strategy minus the one of the second, and the test stops once the
+    confidence interval on the mean difference is narrower than the threshold
+    on each side. The interval is checked after every game, so it is a bit
+    optimistic; min_games keeps it from stopping on a lucky start.
+    """
+
+    def __init__(
+        self,
+        first: str,
+        second: str,
+        threshold: float = 0.05,
+        confidence: float = 0.95,
+        min_games: int = 100,
+    ) -> None:
+        assert 0 < confidence < 1 and threshold > 0
+        self.first = first
+        self.second = second
+        self.threshold = threshold
+        self.confidence = confidence
+        self.min_games = min_games
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.difference = RunningStats()
+
+    def __call__(self, game: GameResult) -> None:
+        self.add(game)
+
+    def add(self, game: GameResult) -> None:
+        first = [seat for seat, name in enumerate(game.strategies) if name == self.first]
+        second = [seat for seat, name in enumerate(game.strategies) if name == self.second]
+        if not first or not second:
+            return
+        winners = game.winners
+
+        def get_win_share(seats: List[int]) -> float:
+            return sum(1 / len(winners) for seat in seats if seat in winners) / len(seats)
+
+        self.difference.add(get_win_share(first) - get_win_share(second))
+
+    @property
+    def half_width(self) -> float:
+        """Half width of the confidence interval on the win rate difference"""
+        return self.z * self.difference.stderr
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        mean = self.difference.mean
+        return mean - self.half_width, mean + self.half_width
+
+    @property
+    def should_stop(self) -> bool:
+        return self.difference.n >= self.min_games and self.half_width <= self.threshold
+
+
+@dataclass
+class MatchupResult:
+    test: SequentialTest
+    stats: MatchupStats
+    simulation: SimulationResult
+    stopped: bool  # Whether the test was conclusive before max_games
+
+
+def run_matchup(
+    strategies: Sequence[PlayerStrategy],
+    test: SequentialTest,
+    max_games: int = 10_000,
+    seed: Optional[int] = None,
+    rotate: bool = True,
+    sink: Optional[GameSink] = None,
+) -> MatchupResult:
+    """
+    Play seeded games until the sequential test stops or max_games are played.
+    With rotate, game i seats the strategies shifted by i places, so that no
+    strategy keeps the advantage of a seat. Games are only aggregated, or given
+    to the sink, so memory does not grow with the number of games.
+    """
+    root_seed = get_root_seed(seed)
+    cards = load_cards()
+    wonders = load_wonders()
+    stats = MatchupStats()
+    result = SimulationResult(root_seed)
+
+    def add_game(game: GameResult) -> None:
+        stats.add(game)
+        test.add(game)
+        if sink is not None:
+            sink(game)
+
+    start = time.perf_counter()
+    stopped = False
+    for index in range(max_games):
+        shift = index % len(strategies) if rotate else 0
+        seated = [*strategies[shift:], *strategies[:shift]]
+        game = play_game(seated, get_game_seed(root_seed, index), cards, wonders, index)
+        result.add_game(game, add_game)
+        if test.should_stop:
+            stopped = True
+            break
+    result.elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Matchup {test.first} vs {test.second} stopped after {result.n_games} games, "
+        f"difference {test.difference.mean:+.3f} ± {test.half_width:.3f}"
+    )
+    return MatchupResult(test, stats, result, stopped)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation.stats",
+        description="Play a matchup until the win rate difference is known precisely enough",
+    )
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "warrior", "simple"],
+        help="Strategies of the table, the first two distinct ones are compared",
+    )
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.05, help="Half width to stop at"
+    )
+    parser.add_argument("-c", "--confidence", type=float, default=0.95)
+    parser.add_argument("--min-games", type=int, default=100)
+    parser.add_argument("-n", "--max-games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of the games")
+    args = parser.parse_args(argv)
+    check_seats(parser, len(args.strategies))
+
+    strategies = [STRATEGIES[name]() for name in args.strategies]
+    names = list(dict.fromkeys(get_strategy_name(strategy) for strategy in strategies))
+    if len(names) < 2:
+        parser.error("the matchup needs two different strategies")
+
+    test = SequentialTest(names[0], names[1], args.threshold, args.confidence, args.min_games)
+    matchup = run_matchup(strategies, test, args.max_games, args.seed)
+
+    low, high = test.interval
+    print(
+        f"{matchup.simulation.n_games} games ({'stopped' if matchup.stopped else 'max games'}), "
+        f"win rate {test.first} - {test.second}: {test.difference.mean:+.3f} "
+        f"[{low:+.3f}, {high:+.3f}] at {test.confidence:.0%}"
+    )
+    for name, stats in sorted(matchup.stats.by_strategy.items()):
+        total = stats.scores["total"]
+        ranks = "  ".join(f"{share:5.1%}" for share in stats.get_rank_distribution())
+        print(
+            f"{name:<16} seats {stats.games:6d}  mean score {total.mean:6.2f} ± {total.std:5.2f}"
+            f"  win rate {stats.win_rate:6.1%}  ranks {ranks}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
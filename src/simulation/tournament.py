@@ -0,0 +1,224 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+
+from src.game.player import PlayerStrategy
+from src.simulation.results import ResultsWriter
+from src.simulation.runner import (
+    STRATEGIES,
+    GameResult,
+    GameSink,
+    SimulationResult,
+    check_seats,
+    get_game_seed,
+    get_root_seed,
+    load_cards,
+    load_wonders,
+    play_game,
+)
+
+logger = logging.getLogger(__name__)
+
+# Strategies of the worker process, built once by the initializer
+_worker_strategies: List[PlayerStrategy] = []
+
+
+def _init_worker(strategy_names: Sequence[str]) -> None:
+    """Parse the catalogs and build the strategies once per worker"""
+    load_cards()
+    load_wonders()
+    _worker_strategies[:] = [STRATEGIES[name]() for name in strategy_names]
+
+
+def _play_chunk(root_seed: int, indexes: range) -> List[GameResult]:
+    return [
+        play_game(_worker_strategies, get_game_seed(root_seed, index), index=index)
+        for index in indexes
+    ]
+
+
+def _get_worker_pid(delay: float) -> int:
+    """Hold the worker for a moment, so that the other ones take the next tasks"""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def start_workers(
+    executor: ProcessPoolExecutor, workers: int, delay: float = 0.05
+) -> Set[int]:
+    """
+    Wait until every worker process has started and run its initializer, each
+    having answered a task, returns their process IDs. Processes start on the
+    first tasks, not with the pool
+    """
+    pids: Set[int] = set()
+    while len(pids) < workers:
+        pids.update(executor.map(_get_worker_pid, [delay] * workers))
+    return pids
+
+
+@dataclass
+class StrategyStats:
+    """Results of a strategy over all the seats it played"""
+
+    games: int = 0
+    wins: float = 0.0  # A tie counts as a fraction of a win
+    total_score: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_score(self) -> float:
+        return self.total_score / self.games if self.games else 0.0
+
+
+def get_strategy_stats(result: SimulationResult) -> Dict[str, StrategyStats]:
+    """Merge the results of the seats played by the same strategy"""
+    stats: Dict[str, StrategyStats] = {}
+    for game in result.games:
+        winners = game.winners
+        for seat, (strategy, total) in enumerate(zip(game.strategies, game.totals)):
+            strategy_stats = stats.setdefault(strategy, StrategyStats())
+            strategy_stats.games += 1
+            strategy_stats.total_score += total
+            if seat in winners:
+                strategy_stats.wins += 1 / len(winners)
+    return stats
+
+
+def run_tournament(
+    n_games: int,
+    strategy_names: Sequence[str],
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    sink: Optional[GameSink] = None,
+    warm_up: bool = False,
+) -> SimulationResult:
+    """
+    Play n_games on a pool of worker processes, in chunks of seeded games.
+    Strategies are given by name since they are built inside the workers.
+    With the same seed, the games are the same as the ones of simulate, and
+    with a sink they are streamed to it in order instead of being kept. With
+    warm_up, the clock starts once every worker is ready, so the elapsed time
+    leaves out the start of the processes and the parsing of the catalogs.
+    """
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker keep all of them busy until the end
+    chunk_size = chunk_size or max(1, n_games // (workers * 4))
+    root_seed = get_root_seed(seed)
+    chunks = [
+        range(start, min(start + chunk_size, n_games))
+        for start in range(0, n_games, chunk_size)
+    ]
+
+    result = SimulationResult(root_seed)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(tuple(strategy_names),)
+    ) as executor:
+        if warm_up:
+            start_workers(executor, workers)
+            start = time.perf_counter()
+        for games in executor.map(_play_chunk, [root_seed] * len(chunks), chunks):
+            for game in games:
+                result.add_game(game, sink)
+    result.elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Tournament of {n_games} games on {workers} workers in {result.elapsed:.2f}s"
+    )
+    return result
+
+
+def benchmark(
+    n_games: int,
+    strategy_names: Sequence[str],
+    worker_counts: Sequence[int],
+    seed: Optional[int] = None,
+) -> Dict[int, float]:
+    """Games per second for each number of workers, once the workers are started"""
+    return {
+        workers: run_tournament(
+            n_games, strategy_names, seed, workers, warm_up=True
+        ).games_per_second
+        for workers in worker_counts
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulation.tournament",
+        description="Play seeded games on all the cores and merge the results",
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000, help="Number of games")
+    parser.add_argument(
+        "-s",
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=["simple", "simple", "simple"],
+        help="Strategy of each seat, in table order",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Root seed of the games")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Stream the games to JSONL and columnar files in this directory",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        nargs="+",
+        metavar="WORKERS",
+        help="Measure games per second for each number of workers instead",
+    )
+    args = parser.parse_args(argv)
+    check_seats(parser, len(args.strategies))
+
+    if args.benchmark:
+        rates = benchmark(args.games, args.strategies, args.benchmark, args.seed)
+        baseline = rates[args.benchmark[0]] / args.benchmark[0]
+        for workers, rate in rates.items():
+            print(
+                f"{workers:3d} workers: {rate:8.1f} games/s  "
+                f"speedup {rate / baseline:5.2f}x of {workers}"
+            )
+        return 0
+
+    if args.output is not None:
+        try:
+            writer = ResultsWriter(args.output)
+        except FileExistsError as error:
+            parser.error(str(error))
+        with writer:
+            result = run_tournament(
+                args.games, args.strategies, args.seed, args.workers, sink=writer.write
+            )
+        print(f"{result.n_games} games written to {args.output}, root seed {result.root_seed}")
+        return 0
+
+    result = run_tournament(args.games, args.strategies, args.seed, args.workers)
+    print(
+        f"{result.n_games} games in {result.elapsed:.2f}s "
+        f"({result.games_per_second:.1f} games/s)"
+    )
+    for name, stats in sorted(get_strategy_stats(result).items()):
+        print(
+            f"{name:<16} seats {stats.games:6d}  mean score {stats.mean_score:6.2f}"
+            f"  win rate {stats.win_rate:6.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+def save_json(data: Any, path: Union[str, Path], indent: Optional[int] = None) -> None:
+    """
+    Write the JSON to a temporary file next to the path, then rename it over
+    the old file, so a crash at any point leaves a complete file
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -1,8 +1,20 @@
-from typing import List, Dict
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
 import csv
 from enum import Enum
-from ..core.enums import Resource, CARD_TYPE_MAP, RESOURCE_MAP
-from ..core.types import Card, Wonder, WonderStage
+from functools import lru_cache
+from pathlib import Path
+from ..core.enums import (
+    CardType,
+    Resource,
+    CARD_TYPE_MAP,
+    RESOURCE_MAP,
+    SCIENCE_SYMBOL_MAP,
+)
+from ..core.types import MAX_CATALOG_CARDS, Card, Effect, Multiplier, Wonder, WonderStage
+
+
+# Resolved from the package, so the catalogs load from any working directory
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 
 
 class CardsCsvHeaders(Enum):
@@ -25,23 +37,32 @@ class WondersCsvHeaders(Enum):
 def parse_cards(csv_content: str) -> List[Card]:
     """
     Parse cards CSV content into Card objects.
+    Cards are numbered in the order their names first appear in the catalog,
+    so the IDs only depend on the catalog and copies share the same one.
     """
     cards = []
+    card_ids: Dict[str, int] = {}
     reader = csv.DictReader(csv_content.splitlines())
 
     for row in reader:
+        card_type = CARD_TYPE_MAP[row[CardsCsvHeaders.TYPE.value]]
+        name = row[CardsCsvHeaders.NAME.value]
+        card_id = card_ids.setdefault(name, len(card_ids))
+        assert card_id < MAX_CATALOG_CARDS, "Too many cards in the catalog"
         card = Card(
-            name=row[CardsCsvHeaders.NAME.value],
-            type=CARD_TYPE_MAP[row[CardsCsvHeaders.TYPE.value]],
+            name=name,
+            type=card_type,
             age=int(row[CardsCsvHeaders.AGE.value]),
             min_players=int(row[CardsCsvHeaders.MIN_PLAYERS.value]),
             cost=parse_cost(row[CardsCsvHeaders.COST.value]),
             chain_to=(
-                row[CardsCsvHeaders.CHAIN_TO.value].split(";")
+                tuple(row[CardsCsvHeaders.CHAIN_TO.value].split(";"))
                 if row[CardsCsvHeaders.CHAIN_TO.value]
-                else []
+                else ()
             ),
             effect=row[CardsCsvHeaders.EFFECT.value],
+            parsed_effect=compile_effect(row[CardsCsvHeaders.EFFECT.value], card_type),
+            id=card_id,
         )
         cards.append(card)
 
@@ -60,7 +81,7 @@ def parse_wonder_stages(stages_str: str) -> List[WonderStage]:
     for pattern in stage_patterns:
         cost_str, effect = pattern.split(";")
         cost = parse_cost(cost_str)
-        stages.append(WonderStage(cost=cost, effect=effect))
+        stages.append(make_wonder_stage(cost, effect))
 
     return stages
 
@@ -88,6 +109,32 @@ def parse_wonders(csv_content: str, day: bool = True) -> List[Wonder]:
     return wonders
 
 
+def make_card(
+    name: str,
+    type: CardType,
+    age: int,
+    min_players: int,
+    cost: Mapping[Resource, int],
+    chain_to: Optional[Sequence[str]],
+    effect: str,
+) -> Card:
+    """Build a card outside of a catalog, its ID is given by name, see intern_card_id"""
+    return Card(
+        name,
+        type,
+        age,
+        min_players,
+        cost,
+        tuple(chain_to or ()),
+        effect,
+        compile_effect(effect, type),
+    )
+
+
+def make_wonder_stage(cost: Mapping[Resource, int], effect: str) -> WonderStage:
+    return WonderStage(cost, effect, compile_effect(effect))
+
+
 def parse_cost(cost_str: str) -> Dict[Resource, int]:
     """
     Parse cost string into a dictionary.
@@ -103,3 +150,123 @@ def parse_cost(cost_str: str) -> Dict[Resource, int]:
         cost[resource] = cost.get(resource, 0) + 1
 
     return cost
+
+
+@lru_cache(maxsize=None)
+def compile_effect(effect: str, card_type: Optional[CardType] = None) -> Effect:
+    """
+    Compile an effect string into an Effect, so that the engine never has to
+    parse strings during the game. Cached, so equal effects share the same object.
+    Format: tokens separated by "-", e.g. "WW", "S/W", "MMM", "$$$-V-{wonder}",
+    "V-{raw_material;manufactured_good}_<>", "trade_{W/O/B/S}_>" or "C/T/G"
+    """
+    if not effect:
+        return Effect()
+
+    if effect.startswith("trade_"):
+        _, resources_part, directions = effect.split("_")
+        return Effect(
+            trade_discount=frozenset(
+                RESOURCE_MAP[letter] for letter in resources_part.strip("{}").split("/")
+            ),
+            trade_left="<" in directions,
+            trade_right=">" in directions,
+        )
+
+    production: Dict[Resource, int] = {}
+    production_choice: List[Resource] = []
+    shields = 0
+    victory_points = 0
+    coins = 0
+    science = None
+    science_choice = False
+    target: Optional[str] = None
+    directions = ""
+    special: List[str] = []
+
+    for token in effect.split("-"):
+        if token.startswith("{"):
+            target, _, directions = token[1:].partition("}")
+        elif set(token) == {"V"}:
+            victory_points += len(token)
+        elif set(token) == {"$"}:
+            coins += len(token)
+        elif set(token) == {"M"}:
+            shields += len(token)
+        elif "/" in token and all(
+            letter in SCIENCE_SYMBOL_MAP for letter in token.split("/")
+        ):
+            science_choice = True
+        elif "/" in token and all(letter in RESOURCE_MAP for letter in token.split("/")):
+            production_choice.extend(RESOURCE_MAP[letter] for letter in token.split("/"))
+        elif token in SCIENCE_SYMBOL_MAP:
+            science = SCIENCE_SYMBOL_MAP[token]
+        elif all(letter in RESOURCE_MAP for letter in token):
+            for letter in token:
+                resource = RESOURCE_MAP[letter]
+                production[resource] = production.get(resource, 0) + 1
+        else:
+            special.append(token)
+
+    coins_per = None
+    points_per = None
+    if target is not None:
+        # With a target, the coins and the points are given per counted item
+        if coins:
+            coins_per = _parse_multiplier(target, directions, coins, False)
+        if victory_points:
+            # Commercial cards count the military tokens, guilds the military cards
+            points_per = _parse_multiplier(
+                target, directions, victory_points, card_type == CardType.COMMERCIAL
+            )
+        coins = 0
+        victory_points = 0
+
+    return Effect(
+        production=tuple(production.items()),
+        production_choice=tuple(production_choice),
+        shields=shields,
+        victory_points=victory_points,
+        coins=coins,
+        coins_per=coins_per,
+        points_per=points_per,
+        science=science,
+        science_choice=science_choice,
+        special="-".join(special) if special else None,
+    )
+
+
+def _parse_multiplier(
+    target: str, directions: str, amount: int, military_tokens: bool
+) -> Multiplier:
+    """
+    Parse the target of a multiplier effect.
+    Format: "wonder", "wonders_complete", "military" or card types separated by ";",
+    followed by the directions "_<", "_>", "_<>" or "_<v>" (no directions means self)
+    """
+    own = "v" in directions or ("<" not in directions and ">" not in directions)
+    left = "<" in directions
+    right = ">" in directions
+
+    if target == "wonder":
+        return Multiplier(amount, wonder_stages=True, own=own, left=left, right=right)
+    if target == "wonders_complete":
+        return Multiplier(amount, wonder_complete=True)
+    if target == "military" and military_tokens:
+        return Multiplier(amount, military_tokens=True, own=own, left=left, right=right)
+
+    card_types = tuple(CARD_TYPE_MAP[card_type] for card_type in target.split(";"))
+    return Multiplier(amount, card_types=card_types, own=own, left=left, right=right)
+
+
+@lru_cache(maxsize=None)
+def load_cards(path: Optional[Path] = None) -> Tuple[Card, ...]:
+    """Parse the card catalog once, cards are immutable so it is shared"""
+    with open(path or DATA_DIR / "cards.csv", "r") as f:
+        return tuple(parse_cards(f.read()))
+
+
+@lru_cache(maxsize=None)
+def load_wonders(path: Optional[Path] = None, day: bool = True) -> Tuple[Wonder, ...]:
+    with open(path or DATA_DIR / "wonders.csv", "r") as f:
+        return tuple(parse_wonders(f.read(), day))
@@ -1,14 +1,20 @@
-from typing import List
+from typing import List, Optional, Sequence
 from ..core.types import Card, CardType
 import random
 
 
-def is_card_present(cards: List[Card], card_to_check: Card) -> bool:
+def is_card_present(cards: Sequence[Card], card_to_check: Card) -> bool:
     """Check if a card is present in a list of cards"""
-    return any(card_to_check.name == card.name for card in cards)
+    # Cards compare by ID, which is shared by all the copies with the same name
+    return card_to_check in cards
 
 
-def can_card_be_chained(cards: List[Card], new_card: Card) -> bool:
+def is_card_in_mask(mask: int, card_to_check: Card) -> bool:
+    """Check if a card is present in a bitmask of card IDs"""
+    return bool((mask >> card_to_check.id) & 1)
+
+
+def can_card_be_chained(cards: Sequence[Card], new_card: Card) -> bool:
     return bool(any(new_card.name in c.chain_to for c in cards))
 
 
@@ -30,8 +36,12 @@ def get_random_cards(
     filter_min_players: List[int] = [],
     filter_type: List[CardType] = [],
     unique: bool = False,
+    rng: Optional[random.Random] = None,
 ) -> List[Card]:
-    """Get n random cards from a list of cards with optional filters"""
+    """
+    Get n random cards from a list of cards with optional filters. Draws from
+    rng if given, otherwise from the global random generator
+    """
     if filter_age:
         cards = [card for card in cards if card.age in filter_age]
     if filter_min_players:
@@ -42,7 +52,9 @@ def get_random_cards(
     if unique:
         cards = drop_duplicates_cards(cards)
 
-    return random.sample(cards, n)
+    if rng is None:
+        return random.sample(cards, n)
+    return rng.sample(cards, n)
 
 def get_left_in_list(index: int, list_length: int) -> int:
     """Get the left neighbor of an element in a list"""
@@ -0,0 +1,72 @@
+import pickle
+from typing import List
+
+import pytest
+
+from src.core.catalog import CardCatalog, get_cards_mask
+from src.core.enums import CardType, Resource
+from src.core.types import Card
+from src.utils.parsers import make_card, parse_cards
+
+
+@pytest.fixture
+def cards() -> List[Card]:
+    with open("data/cards.csv", "r") as f:
+        return parse_cards(f.read())
+
+
+def test_copies_share_id(cards: List[Card]) -> None:
+    """All the copies of a card in the deck get the same ID"""
+    looms = [card for card in cards if card.name == "loom"]
+    assert len(looms) == 4
+    assert len({card.id for card in looms}) == 1
+    assert looms[0] == looms[1]
+    assert len(set(looms)) == 1
+
+
+def test_ids_follow_the_catalog_order(cards: List[Card]) -> None:
+    """IDs only depend on the catalog, not on the cards created before it"""
+    make_card("catalog_order_card", CardType.CIVILIAN, 1, 3, {}, None, "V")
+    with open("data/cards.csv", "r") as f:
+        again = parse_cards(f.read())
+
+    assert [card.id for card in again] == [card.id for card in cards]
+    names = list(dict.fromkeys(card.name for card in cards))
+    assert all(card.id == names.index(card.name) for card in cards)
+
+
+def test_catalog_lookup(cards: List[Card]) -> None:
+    catalog = CardCatalog(cards)
+
+    assert len(catalog) == 77
+    altar = catalog.get_by_name("altar")
+    assert catalog.get(altar.id) is altar
+    assert altar in catalog
+    assert catalog.get_ids() == sorted({card.id for card in cards})
+
+
+def test_iter_mask(cards: List[Card]) -> None:
+    catalog = CardCatalog(cards)
+    chosen = [catalog.get_by_name(name) for name in ["altar", "loom", "palace"]]
+
+    mask = get_cards_mask(chosen + chosen)
+
+    assert bin(mask).count("1") == 3
+    assert sorted(catalog.iter_mask(mask), key=lambda c: c.id) == sorted(
+        chosen, key=lambda c: c.id
+    )
+
+
+def test_card_is_frozen_and_picklable() -> None:
+    card = make_card(
+        "catalog_test_card", CardType.CIVILIAN, 1, 3, {Resource.WOOD: 1}, None, "VVV"
+    )
+
+    assert card.chain_to == ()
+    with pytest.raises(AttributeError):
+        card.name = "other"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        card.cost[Resource.WOOD] = 0  # type: ignore[index]
+    copy = pickle.loads(pickle.dumps(card))
+    assert copy.id == card.id
+    assert copy.cost == {Resource.WOOD: 1}
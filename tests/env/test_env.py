@@ -0,0 +1,88 @@
+import random
+from array import array
+from typing import List
+
+import pytest
+
+from src.core.catalog import CardCatalog
+from src.env.encoding import ActionCodec
+from src.env.env import SevenWondersEnv
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import load_cards
+
+
+def get_valid_actions(mask: "array[int]") -> List[int]:
+    return [action for action, valid in enumerate(mask) if valid]
+
+
+@pytest.fixture
+def env() -> SevenWondersEnv:
+    return SevenWondersEnv([SimpleStrategy(), SimpleStrategy()], seat=1, seed=3)
+
+
+def test_action_codec() -> None:
+    cards = load_cards()
+    codec = ActionCodec(CardCatalog(cards))
+    hand = list(cards[:3])
+    env = SevenWondersEnv([SimpleStrategy(), SimpleStrategy()], seed=0)
+    env.reset()
+    for move in env.get_valid_actions().moves:
+        assert codec.decode(codec.encode(move), move.player_name, env.player.hand) == move
+
+    with pytest.raises(ValueError):
+        codec.decode(codec.encode(env.get_valid_actions().moves[0]), "P1", hand[:0])
+    with pytest.raises(ValueError):
+        codec.decode(codec.size, "P1", hand)
+
+
+def test_plays_a_full_episode(env: SevenWondersEnv) -> None:
+    observation, info = env.reset()
+    assert len(observation) == env.observation_size
+    assert observation[0] == 1 and observation[1] == 1  # Age and turn
+
+    rng = random.Random(0)
+    steps = 0
+    terminated = False
+    while not terminated:
+        valid_actions = get_valid_actions(info["action_mask"])
+        assert len(valid_actions) == len(env.get_valid_actions().moves)
+        observation, reward, terminated, truncated, info = env.step(rng.choice(valid_actions))
+        assert not truncated
+        steps += 1
+        if not terminated:
+            assert reward == 0.0
+
+    assert steps == 18  # Six turns in each of the three ages
+    totals = info["totals"]
+    assert reward == totals[1] - max(totals[0], totals[2])
+    assert not any(info["action_mask"])
+    with pytest.raises(RuntimeError):
+        env.step(0)
+
+
+def test_invalid_action(env: SevenWondersEnv) -> None:
+    _, info = env.reset()
+    invalid_actions = [action for action, valid in enumerate(info["action_mask"]) if not valid]
+    with pytest.raises(ValueError):
+        env.step(invalid_actions[0])
+
+
+def test_observation_is_from_the_agent_seat(env: SevenWondersEnv) -> None:
+    observation, _ = env.reset()
+    encoder = env.encoder
+    assert env.game is not None
+    view = env.game.get_game_view()
+
+    # The first seat already moved: its hand is smaller, seen as the left neighbor
+    assert observation[2 + 5] == view.all_players_no_hand[1].hand_size == 7
+    assert observation[2 + encoder.seat_size + 5] == 6
+    hand_ids = [card.id for card in env.player.hand]
+    for card_id in range(encoder.n_card_ids):
+        assert observation[encoder.hand_offset + card_id] == hand_ids.count(card_id)
+
+
+def test_episodes_are_reproducible() -> None:
+    first = SevenWondersEnv([SimpleStrategy(), SimpleStrategy()], seed=7)
+    second = SevenWondersEnv([SimpleStrategy(), SimpleStrategy()], seed=7)
+    for _ in range(2):
+        assert first.reset() == second.reset()
@@ -0,0 +1,39 @@
+import random
+
+from src.env.vector import VectorEnv
+from src.game.strategies.simple.simple import SimpleStrategy
+
+
+def test_steps_and_resets_all_environments() -> None:
+    envs = VectorEnv(3, lambda: [SimpleStrategy(), SimpleStrategy()], seed=1)
+    observations, info = envs.reset()
+    assert len(observations) == 3 * envs.observation_size
+    assert len(info["action_mask"]) == 3 * envs.n_actions
+
+    rng = random.Random(0)
+    episodes = []
+    for step in range(18):
+        masks = envs.action_masks
+        actions = []
+        for index in range(envs.n_envs):
+            row = masks[index * envs.n_actions : (index + 1) * envs.n_actions]
+            actions.append(rng.choice([action for action, valid in enumerate(row) if valid]))
+        observations, rewards, terminated, truncated, info = envs.step(actions)
+        episodes.extend(info["episodes"])
+
+    # Every game lasts 18 steps, so they all ended on the last one and restarted
+    assert list(terminated) == [1, 1, 1] and not any(truncated)
+    assert [index for index, _ in episodes] == [0, 1, 2]
+    for index, totals in episodes:
+        assert rewards[index] == totals[0] - max(totals[1:])
+    assert all(env.episode == 1 and not env.is_over for env in envs.envs)
+    assert observations[0] == 1 and observations[1] == 1  # First turn of the next game
+    n_actions = envs.n_actions
+    assert all(any(masks[index * n_actions : (index + 1) * n_actions]) for index in range(3))
+
+
+def test_environments_have_their_own_games() -> None:
+    envs = VectorEnv(2, lambda: [SimpleStrategy(), SimpleStrategy()], seed=2)
+    observations, _ = envs.reset()
+    size = envs.observation_size
+    assert observations[:size] != observations[size:]
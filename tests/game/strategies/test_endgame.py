@@ -0,0 +1,77 @@
+import random
+from typing import List
+
+import pytest
+
+from src.game.game_state import GameState
+from src.game.player import Player
+from src.game.strategies.endgame.endgame import EndgameStrategy
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders, setup_game, simulate
+
+
+def play_until(game: GameState, players: List[Player], hand_size: int) -> None:
+    game.deal_age()
+    while not (game.age == 3 and len(players[0].hand) == hand_size):
+        for player in players:
+            game.make_turn(player)
+        if game.next_turn():
+            game.next_age()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_rebuilds_the_hidden_hands(seed: int) -> None:
+    wonders = load_wonders()
+    strategy = EndgameStrategy()
+    players = [Player("P1", 0, wonders[0], strategy)] + [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in (1, 2)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(seed))
+    play_until(game, players, 2)
+
+    hands = strategy.get_hidden_hands(players[0], game.get_game_view(), random.Random(0))
+
+    assert set(hands) == {1, 2}
+    for seat, hand in hands.items():
+        assert sorted(card.id for card in hand) == sorted(card.id for card in players[seat].hand)
+
+
+def test_hands_never_seen_are_drawn_from_the_unseen_cards() -> None:
+    wonders = load_wonders()
+    players = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(4))
+    play_until(game, players, 2)
+
+    # Joins late, so it passed no hand in this age
+    strategy = EndgameStrategy()
+    move = strategy.choose_move(players[0], game.get_game_view())
+
+    assert move.card in players[0].hand
+    assert game.get_hash() == game.compute_hash()
+
+
+def test_plays_full_games() -> None:
+    strategy = EndgameStrategy()
+    result = simulate(3, [strategy, SimpleStrategy(), SimpleStrategy()], seed=1)
+
+    assert len(result.games) == 3
+    assert strategy.solver.nodes > 0
+    again = simulate(3, [EndgameStrategy(), SimpleStrategy(), SimpleStrategy()], seed=1)
+    assert [game.totals for game in again.games] == [game.totals for game in result.games]
+
+
+def test_passed_hands_are_kept_per_game() -> None:
+    strategy = EndgameStrategy()
+    for seed in range(2):
+        game = setup_game([strategy, SimpleStrategy(), SimpleStrategy()], seed)
+        game.play_game()
+        assert set(strategy.passed[game.all_players[0]]) == {1, 2, 3, 4, 5, 6}
+
+
+def test_plays_simultaneous_turns() -> None:
+    """Every seat is still to move, the solver answers for the seat of the player"""
+    for seed in range(3):
+        game = setup_game([SimpleStrategy(), SimpleStrategy(), EndgameStrategy()], seed)
+        assert len(game.play_game(simultaneous=True)) == 3
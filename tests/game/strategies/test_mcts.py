@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from src.core.enums import Action
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player, get_action_mask, get_valid_moves
+from src.game.strategies.mcts.mcts import MCTSStrategy, Node, get_move_key, get_outcome
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders, setup_game, simulate
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonders = load_wonders()
+    players = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(5))
+    game.deal_age()
+    return game
+
+
+def test_outcome_is_the_share_of_the_table_beaten() -> None:
+    assert get_outcome([50, 40, 30], 0) == 1.0
+    assert get_outcome([50, 40, 30], 1) == 0.5
+    assert get_outcome([50, 50, 30], 0) == 0.75
+
+
+def test_search_leaves_the_game_untouched(game: GameState) -> None:
+    player = game.all_players[0]
+    position_hash = game.get_hash()
+    hand = list(player.hand)
+    strategy = MCTSStrategy(iterations=20)
+
+    move = strategy.choose_move(player, game.get_game_view())
+
+    view = game.get_game_view()
+    valid_moves = get_valid_moves(
+        player, view.get_left_neighbor(view.all_players_no_hand[0]),
+        view.get_right_neighbor(view.all_players_no_hand[0]),
+    )
+    assert move in valid_moves
+    assert game.get_hash() == position_hash and player.hand == hand
+    assert strategy.last_search.iterations == 20
+    assert strategy.last_search.playouts_per_second > 0
+
+
+def test_search_is_reproducible(game: GameState) -> None:
+    """The search draws from the game's stream of the player"""
+    player = game.all_players[1]
+    player.rng.seed(2)
+    first = MCTSStrategy(iterations=15).choose_move(player, game.get_game_view())
+    player.rng.seed(2)
+    second = MCTSStrategy(iterations=15).choose_move(player, game.get_game_view())
+    assert first == second
+
+
+def test_time_budget(game: GameState) -> None:
+    strategy = MCTSStrategy(iterations=None, time_limit=0.05)
+    strategy.choose_move(game.all_players[2], game.get_game_view())
+    assert strategy.last_search.iterations > 0
+    assert strategy.last_search.elapsed < 0.5
+
+
+def test_tree_visits_add_up(game: GameState) -> None:
+    player = game.all_players[0]
+    strategy = MCTSStrategy(iterations=30, rollout_turns=2)
+    root = strategy.search(player, game.get_game_view())
+
+    assert root.visits == 30
+    assert sum(child.visits for child in root.children.values()) == 30
+    assert all(child.availability == 30 for child in root.children.values())
+    assert {action for action, _ in root.children} <= set(Action)
+
+
+def test_plays_full_games() -> None:
+    strategy = MCTSStrategy(iterations=10, rollout_turns=3)
+    result = simulate(2, [strategy, SimpleStrategy(), SimpleStrategy()], seed=1)
+
+    assert len(result.games) == 2
+    assert all(len(game.totals) == 3 for game in result.games)
+    assert strategy.total.iterations > 0
+    # Replayed from the seed alone
+    replay = MCTSStrategy(iterations=10, rollout_turns=3)
+    again = simulate(2, [replay, SimpleStrategy(), SimpleStrategy()], seed=1)
+    assert [game.totals for game in again.games] == [game.totals for game in result.games]
+
+
+def test_plays_simultaneous_turns() -> None:
+    """Every seat still has to move when the search starts, not only the ones after it"""
+    for seed in range(3):
+        game = setup_game([SimpleStrategy(), SimpleStrategy(), MCTSStrategy(iterations=10)], seed)
+        assert len(game.play_game(simultaneous=True)) == 3
+
+
+def test_player_moves_first_then_seat_order(game: GameState) -> None:
+    """Only the root turn puts the player first, the later turns follow the seats"""
+    player = game.all_players[1]
+    left, right = game.all_players[0], game.all_players[2]
+    mask = get_action_mask(player, left.get_player_view(), right.get_player_view())
+    # Every root move already tried, so the descent goes on to the second turn
+    root = Node(visits=len(mask.moves), availability=len(mask.moves))
+    for move in mask.moves:
+        root.children[get_move_key(move)] = Node(visits=1, availability=1)
+
+    movers = []
+    make_move = game.make_move
+
+    def record(move: Move) -> None:
+        movers.append(move.player_name)
+        make_move(move)
+
+    game.make_move = record  # type: ignore[method-assign]
+    game.push()
+    MCTSStrategy(iterations=1, rollout_turns=0).iterate(game, root, 1, random.Random(0))
+    game.pop()
+
+    assert movers == ["P2", "P1", "P3", "P1", "P2", "P3"]
@@ -0,0 +1,81 @@
+import random
+from typing import Iterator
+
+import pytest
+
+from src.game.game_state import GameState
+from src.game.player import Player, get_valid_moves
+from src.game.strategies.mcts.mcts import MCTSStrategy
+from src.game.strategies.mcts.parallel import ParallelMCTSStrategy, merge_root_stats
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonders = load_wonders()
+    players = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(5))
+    game.deal_age()
+    return game
+
+
+@pytest.fixture(scope="module")
+def strategy() -> Iterator[ParallelMCTSStrategy]:
+    with ParallelMCTSStrategy(iterations=21, workers=2, rollout_turns=2) as strategy:
+        yield strategy
+
+
+def test_iterations_are_split_between_workers(strategy: ParallelMCTSStrategy) -> None:
+    assert strategy.get_worker_iterations() == [11, 10]
+    # The pool only starts processes on the first search
+    with ParallelMCTSStrategy(iterations=1, workers=4) as small:
+        assert small.get_worker_iterations() == [1]
+    with ParallelMCTSStrategy(iterations=None, time_limit=0.1, workers=3) as timed:
+        assert timed.get_worker_iterations() == [None, None, None]
+
+
+def test_merge_root_stats() -> None:
+    root = merge_root_stats([{(1, 2): (3, 1.5)}, {(1, 2): (2, 0.5), (0, 4): (1, 1.0)}])
+    assert root.visits == 6
+    assert root.children[(1, 2)].visits == 5 and root.children[(1, 2)].reward == 2.0
+    assert root.children[(0, 4)].visits == 1
+
+
+def test_parallel_search(game: GameState, strategy: ParallelMCTSStrategy) -> None:
+    player = game.all_players[0]
+    position_hash = game.get_hash()
+    view = game.get_game_view()
+
+    move = strategy.choose_move(player, view)
+
+    player_view = view.all_players_no_hand[0]
+    valid_moves = get_valid_moves(
+        player, view.get_left_neighbor(player_view), view.get_right_neighbor(player_view)
+    )
+    assert move in valid_moves
+    assert game.get_hash() == position_hash
+    assert strategy.last_search.iterations == 21
+
+
+def test_parallel_search_is_reproducible(
+    game: GameState, strategy: ParallelMCTSStrategy
+) -> None:
+    """The workers are seeded from the game's stream of the player"""
+    player = game.all_players[1]
+    player.rng.seed(3)
+    first = strategy.search(player, game.get_game_view())
+    player.rng.seed(3)
+    second = strategy.search(player, game.get_game_view())
+    assert {key: child.visits for key, child in first.children.items()} == {
+        key: child.visits for key, child in second.children.items()
+    }
+
+
+def test_leaf_rollouts(game: GameState) -> None:
+    strategy = MCTSStrategy(iterations=10, rollout_turns=1, leaf_rollouts=3)
+    root = strategy.search(game.all_players[1], game.get_game_view())
+    assert root.visits == 10
+    assert all(0.0 <= child.reward <= child.visits for child in root.children.values())
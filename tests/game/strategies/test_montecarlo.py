@@ -0,0 +1,94 @@
+import random
+from typing import Dict, List, Sequence
+
+import pytest
+
+from src.game.batch import PriorityPolicy, RandomPolicy
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import ActionMask, Player, PlayerView, get_valid_moves
+from src.game.strategies.montecarlo.montecarlo import MonteCarloStrategy
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders, simulate
+
+
+class RecordingPolicy(PriorityPolicy):
+    """Records the hand size each seat is first asked to move with"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_hand_sizes: Dict[str, int] = {}
+
+    def choose_moves(
+        self, players: Sequence[PlayerView], masks: Sequence[ActionMask]
+    ) -> List[Move]:
+        self.first_hand_sizes.setdefault(masks[0].player_name, len(masks[0].hand))
+        return super().choose_moves(players, masks)
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonders = load_wonders()
+    players = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(5))
+    game.deal_age()
+    return game
+
+
+def test_chooses_a_valid_move_without_changing_the_game(game: GameState) -> None:
+    player = game.all_players[1]
+    game.make_turn(game.all_players[0])  # Mid-turn, the first seat already moved
+    position_hash = game.get_hash()
+    view = game.get_game_view()
+    player_view = view.all_players_no_hand[1]
+    valid_moves = get_valid_moves(
+        player, view.get_left_neighbor(player_view), view.get_right_neighbor(player_view)
+    )
+
+    strategy = MonteCarloStrategy(playouts=3)
+    move = strategy.choose_move(player, view)
+
+    assert move in valid_moves
+    assert game.get_hash() == position_hash
+    assert strategy.last_search.iterations == 3 * len(valid_moves)
+
+
+def test_seats_yet_to_move_play_the_turn(game: GameState) -> None:
+    """With simultaneous turns nobody has moved yet, the seats before the player included"""
+    player = game.all_players[1]
+    view = game.get_game_view()
+    player_view = view.all_players_no_hand[1]
+    moves = get_valid_moves(
+        player, view.get_left_neighbor(player_view), view.get_right_neighbor(player_view)
+    )
+    policy = RecordingPolicy()
+
+    MonteCarloStrategy(playouts=2, policy=policy).evaluate_moves(player, view, moves)
+
+    assert policy.first_hand_sizes == {"P1": 7, "P3": 7, "P2": 6}
+
+
+def test_is_reproducible(game: GameState) -> None:
+    player = game.all_players[0]
+    view = game.get_game_view()
+    player_view = view.all_players_no_hand[0]
+    moves = get_valid_moves(
+        player, view.get_left_neighbor(player_view), view.get_right_neighbor(player_view)
+    )
+    first = MonteCarloStrategy(playouts=2, policy=RandomPolicy(random.Random(0)))
+    second = MonteCarloStrategy(playouts=2, policy=RandomPolicy(random.Random(0)))
+    # The deals are drawn from the game's stream of the player
+    player.rng.seed(3)
+    first_margins = first.evaluate_moves(player, view, moves)
+    player.rng.seed(3)
+    assert second.evaluate_moves(player, view, moves) == first_margins
+
+
+def test_plays_full_games() -> None:
+    strategy = MonteCarloStrategy(playouts=2)
+    result = simulate(1, [strategy, SimpleStrategy(), SimpleStrategy()], seed=1)
+
+    assert len(result.games[0].totals) == 3
+    assert strategy.total.iterations > 0
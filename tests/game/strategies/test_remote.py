@@ -0,0 +1,133 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, List
+
+from src.core.enums import Action
+from src.game.async_table import AsyncTable, SyncStrategyAdapter
+from src.game.game_state import GameState
+from src.game.player import Player
+from src.game.strategies.remote.remote import RemoteStrategy, serve_bot
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders
+
+
+def make_game(seed: int = 0) -> GameState:
+    wonders = load_wonders()
+    players = [Player(f"P{i + 1}", i, wonders[i], SimpleStrategy()) for i in range(3)]
+    return GameState(players, list(load_cards()), random.Random(seed))
+
+
+def test_remote_bots_play_a_game() -> None:
+    requests: List[Dict[str, Any]] = []
+
+    def first_move(request: Dict[str, Any]) -> int:
+        requests.append(request)
+        return 0
+
+    async def play() -> None:
+        server = await serve_bot(first_move)
+        port = server.sockets[0].getsockname()[1]
+        strategies = [RemoteStrategy("127.0.0.1", port) for _ in range(3)]
+        table = AsyncTable(make_game(), strategies, move_timeout=5)
+        async with server:
+            scores = await table.play_game()
+            await table.close()
+        assert len(scores) == 3
+        assert table.fallbacks == [0, 0, 0]
+
+    asyncio.run(play())
+
+    # 6 turns per age, 3 ages, 3 seats
+    assert len(requests) == 54
+    assert requests[0]["age"] == 1 and len(requests[0]["hand"]) == 7
+    assert {"action", "card"} == set(requests[0]["valid_moves"][0])
+
+
+def test_seats_are_asked_concurrently() -> None:
+    """A turn lasts as long as the slowest bot, not the sum of all of them"""
+    delay = 0.2
+
+    async def slow_bot(request: Dict[str, Any]) -> int:
+        await asyncio.sleep(delay)
+        return 0
+
+    async def play() -> float:
+        servers = [await serve_bot(slow_bot) for _ in range(3)]
+        strategies = [
+            RemoteStrategy("127.0.0.1", server.sockets[0].getsockname()[1])
+            for server in servers
+        ]
+        game = make_game()
+        game.deal_age()
+        table = AsyncTable(game, strategies, move_timeout=5)
+
+        start = time.perf_counter()
+        await table.play_turn()
+        elapsed = time.perf_counter() - start
+
+        await table.close()
+        for server in servers:
+            server.close()
+        return elapsed
+
+    assert asyncio.run(play()) < 2 * delay
+
+
+def test_slow_or_broken_bots_get_the_fallback_move() -> None:
+    async def never_answers(request: Dict[str, Any]) -> int:
+        await asyncio.sleep(10)
+        return 0
+
+    def invalid_answer(request: Dict[str, Any]) -> int:
+        return len(request["valid_moves"])  # Out of range
+
+    async def play() -> AsyncTable:
+        slow = await serve_bot(never_answers)
+        broken = await serve_bot(invalid_answer)
+        game = make_game()
+        game.deal_age()
+        table = AsyncTable(
+            game,
+            [
+                SyncStrategyAdapter(SimpleStrategy()),
+                RemoteStrategy("127.0.0.1", slow.sockets[0].getsockname()[1]),
+                RemoteStrategy("127.0.0.1", broken.sockets[0].getsockname()[1]),
+            ],
+            move_timeout=0.2,
+        )
+        moves = await table.play_turn()
+        assert [move.action for move in moves[1:]] == [Action.DISCARD] * 2
+        await table.close()
+        slow.close()
+        broken.close()
+        return table
+
+    table = asyncio.run(play())
+
+    assert table.fallbacks == [0, 1, 1]
+    assert all(len(player.hand) == 6 for player in table.game.all_players)
+
+
+def test_negative_indices_get_the_fallback_move() -> None:
+    def negative_answer(request: Dict[str, Any]) -> int:
+        return -1
+
+    async def play() -> AsyncTable:
+        server = await serve_bot(negative_answer)
+        game = make_game()
+        game.deal_age()
+        table = AsyncTable(
+            game,
+            [
+                SyncStrategyAdapter(SimpleStrategy()),
+                RemoteStrategy("127.0.0.1", server.sockets[0].getsockname()[1]),
+                SyncStrategyAdapter(SimpleStrategy()),
+            ],
+        )
+        await table.play_turn()
+        await table.close()
+        server.close()
+        return table
+
+    assert asyncio.run(play()).fallbacks == [0, 1, 0]
@@ -3,10 +3,11 @@ import logging
 import pytest
 
 from src.core.enums import Action, CardType, Resource
-from src.core.types import Card, Wonder, WonderStage
+from src.core.types import Card, Wonder
 from src.game.player import Player
 from src.game.game_state import GameState
 from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card, make_wonder_stage
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,8 @@ def strategy() -> SimpleStrategy:
 @pytest.fixture
 def wonder() -> Wonder:
     stages = [
-        WonderStage({Resource.WOOD: 1}, "WW"),
-        WonderStage({Resource.WOOD: 1}, "SSS"),
+        make_wonder_stage({Resource.WOOD: 1}, "WW"),
+        make_wonder_stage({Resource.WOOD: 1}, "SSS"),
     ]
     return Wonder("Test Wonder", Resource.WOOD, stages)
 
@@ -33,15 +34,15 @@ def player(wonder: Wonder) -> Player:
 @pytest.fixture
 def sample_cards() -> list[Card]:
     return [
-        Card("Card1", CardType.RAW_MATERIAL, 1, 3, {}, None, "W"),
-        Card("Card2", CardType.CIVILIAN, 1, 3, {}, None, "VVV"),
-        Card("Card3", CardType.MILITARY, 1, 3, {}, None, "M"),
+        make_card("Card1", CardType.RAW_MATERIAL, 1, 3, {}, None, "W"),
+        make_card("Card2", CardType.CIVILIAN, 1, 3, {}, None, "VVV"),
+        make_card("Card3", CardType.MILITARY, 1, 3, {}, None, "M"),
     ]
 
 
 @pytest.fixture
 def sample_costly_card() -> Card:
-    return Card(
+    return make_card(
         "Costly Card", CardType.RAW_MATERIAL, 1, 3, {Resource.WOOD: 10}, None, "SSS"
     )
 
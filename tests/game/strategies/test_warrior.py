@@ -3,10 +3,11 @@ import logging
 import pytest
 
 from src.core.enums import Action, CardType, Resource
-from src.core.types import Card, Wonder, WonderStage
+from src.core.types import Card, Wonder
 from src.game.player import Player
 from src.game.game_state import GameState
 from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.utils.parsers import make_card, make_wonder_stage
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,9 @@ def strategy() -> WarriorStrategy:
 @pytest.fixture
 def wonder() -> Wonder:
     stages = [
-        WonderStage({Resource.WOOD: 1}, "M"),  # Military stage
-        WonderStage({Resource.WOOD: 1}, "MMM"),
-        WonderStage({Resource.WOOD: 10}, "VV"),
+        make_wonder_stage({Resource.WOOD: 1}, "M"),  # Military stage
+        make_wonder_stage({Resource.WOOD: 1}, "MMM"),
+        make_wonder_stage({Resource.WOOD: 10}, "VV"),
     ]
     return Wonder("Test Wonder", Resource.WOOD, stages)
 
@@ -34,15 +35,15 @@ def player(wonder: Wonder) -> Player:
 @pytest.fixture
 def sample_cards() -> list[Card]:
     return [
-        Card("Shields2", CardType.MILITARY, 1, 3, {}, None, "MM"),  # 2 shields
-        Card("Shields1", CardType.MILITARY, 1, 3, {}, None, "M"),  # 1 shield
-        Card("NoShields", CardType.CIVILIAN, 1, 3, {}, None, "VVV"),  # 0 shields
+        make_card("Shields2", CardType.MILITARY, 1, 3, {}, None, "MM"),  # 2 shields
+        make_card("Shields1", CardType.MILITARY, 1, 3, {}, None, "M"),  # 1 shield
+        make_card("NoShields", CardType.CIVILIAN, 1, 3, {}, None, "VVV"),  # 0 shields
     ]
 
 
 @pytest.fixture
 def sample_costly_card() -> Card:
-    return Card(
+    return make_card(
         "Costly Card", CardType.RAW_MATERIAL, 1, 3, {Resource.WOOD: 10}, None, "SSS"
     )
 
@@ -0,0 +1,95 @@
+import random
+from typing import List, Sequence
+
+import pytest
+
+from src.core.enums import Action
+from src.core.types import Card, Wonder
+from src.game.batch import BatchEngine, BatchPolicy, BatchState, PriorityPolicy
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import ActionMask, Player, PlayerView
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import parse_cards, parse_wonders
+
+
+@pytest.fixture
+def cards() -> List[Card]:
+    with open("data/cards.csv", "r") as f:
+        return parse_cards(f.read())
+
+
+@pytest.fixture
+def wonders() -> List[Wonder]:
+    with open("data/wonders.csv", "r") as f:
+        return parse_wonders(f.read())
+
+
+def test_matches_reference_engine(cards: List[Card], wonders: List[Wonder]) -> None:
+    """A batch game seeded with s plays exactly like GameState with random.Random(s)"""
+    seeds = list(range(8))
+    seats = [wonders[:3], wonders[3:6]] * 4
+
+    scores = BatchEngine(cards, seats, [PriorityPolicy()] * 3, seeds).run()
+
+    for seed, game_wonders, game_scores in zip(seeds, seats, scores):
+        players = [
+            Player(f"P{i + 1}", i, wonder, SimpleStrategy())
+            for i, wonder in enumerate(game_wonders)
+        ]
+        game = GameState(players, cards, random.Random(seed))
+        assert game.play_game() == game_scores
+
+
+def test_games_are_independent(cards: List[Card], wonders: List[Wonder]) -> None:
+    """The result of a game depends only on its seed, not on the rest of the batch"""
+    alone = BatchEngine(cards, [wonders[:3]], [PriorityPolicy()] * 3, [7]).run()
+    batch = BatchEngine(cards, [wonders[:3]] * 3, [PriorityPolicy()] * 3, [1, 7, 2]).run()
+
+    assert batch[1] == alone[0]
+
+
+class InvalidPolicy(BatchPolicy):
+    def choose_moves(
+        self, players: Sequence[PlayerView], masks: Sequence[ActionMask]
+    ) -> List[Move]:
+        return [Move(mask.player_name, Action.WONDER, mask.hand[0]) for mask in masks]
+
+
+def test_invalid_move(cards: List[Card], wonders: List[Wonder]) -> None:
+    engine = BatchEngine(cards, [wonders[:3]], [InvalidPolicy()] * 3, [0])
+    with pytest.raises(ValueError):
+        engine.run()
+
+
+@pytest.mark.parametrize("turns, moved", [(3, 0), (8, 2)])
+def test_resumes_from_game_view(
+    cards: List[Card], wonders: List[Wonder], turns: int, moved: int
+) -> None:
+    """A batch started from the view of a game, mid-turn too, plays on like the game"""
+    players = [
+        Player(f"P{i + 1}", i, wonder, SimpleStrategy()) for i, wonder in enumerate(wonders[:3])
+    ]
+    game = GameState(players, cards, random.Random(3))
+    game.deal_age()
+    for _ in range(turns):
+        for player in players:
+            game.make_turn(player)
+        if game.next_turn():
+            game.next_age()
+    for player in players[:moved]:
+        game.make_turn(player)
+
+    state = BatchState.from_game_view(
+        game.get_game_view(), [[list(player.hand) for player in players]]
+    )
+    engine = BatchEngine(cards, [wonders[:3]], [PriorityPolicy()] * 3, [0], state=state)
+    engine.rngs[0].setstate(game.rng.getstate())
+    scores = engine.play_to_end(range(moved, 3))
+
+    for player in players[moved:]:
+        game.make_turn(player)
+    while not (game.next_turn() and game.next_age()):
+        for player in players:
+            game.make_turn(player)
+    assert game.get_final_scores() == scores[0]
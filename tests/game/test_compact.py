@@ -0,0 +1,91 @@
+from typing import List
+
+import pytest
+
+from src.core.enums import Action
+from src.core.types import Card, Wonder
+from src.game.compact import CompactState, from_compact, to_compact
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player, get_valid_moves
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import parse_cards, parse_wonders
+
+
+@pytest.fixture
+def cards() -> List[Card]:
+    with open("data/cards.csv", "r") as f:
+        return parse_cards(f.read())
+
+
+@pytest.fixture
+def wonders() -> List[Wonder]:
+    with open("data/wonders.csv", "r") as f:
+        return parse_wonders(f.read())
+
+
+@pytest.fixture
+def game(cards: List[Card], wonders: List[Wonder]) -> GameState:
+    players = [
+        Player(f"P{i + 1}", i, wonders[i], SimpleStrategy()) for i in range(3)
+    ]
+    game = GameState(players, cards)
+    game.deal_age()
+
+    # Play the first valid move of each player for a couple of turns
+    for _ in range(2):
+        for player in players:
+            left = player.get_left_neighbor(game.get_all_player_views())
+            right = player.get_right_neighbor(game.get_all_player_views())
+            game.make_move(get_valid_moves(player, left, right)[0])
+        game.next_turn()
+    game.make_move(Move("P1", Action.DISCARD, players[0].hand[0]))
+    return game
+
+
+def test_round_trip(game: GameState) -> None:
+    state = to_compact(game)
+    restored = from_compact(state, [SimpleStrategy()] * 3, game.deck)
+
+    assert restored.age == game.age and restored.turn == game.turn
+    assert restored.discarded_counts == game.discarded_counts
+    assert restored.get_position_key() == game.get_position_key()
+    assert restored.get_hash() == game.get_hash()
+    for player, other in zip(game.all_players, restored.all_players):
+        assert set(other.cards) == set(player.cards)
+        assert other.production == player.production
+        assert state.get_production(player.position) == player.production.fixed
+        assert state.get_ledger(player.position) == player.production
+
+    assert to_compact(restored, state.layout) == state
+
+
+def test_copy_is_independent(game: GameState) -> None:
+    state = to_compact(game)
+    clone = state.copy()
+    card = clone.get_hand(1)[0]
+
+    clone.remove_from_hand(1, card)
+    clone.add_card(1, card)
+    clone.add_coins(1, 5)
+
+    assert clone != state
+    assert card in state.get_hand(1) and card not in clone.get_hand(1)
+    assert clone.get_tableau_mask(1) == state.get_tableau_mask(1) | card.mask
+    assert clone.get_coins(1) == state.get_coins(1) + 5
+
+
+def test_bitsets_span_words(game: GameState) -> None:
+    """Card IDs past the first 63 land in the next word of the bitset"""
+    state = to_compact(game)
+    assert state.layout.n_words > 1
+
+    card = max(state.layout.catalog.cards, key=lambda card: card.id)
+    state.set_hand_mask(0, card.mask)
+    assert state.get_hand(0) == [card]
+
+
+def test_compact_state_is_small(game: GameState) -> None:
+    state = to_compact(game)
+    assert isinstance(state, CompactState)
+    assert state.nbytes < 2048
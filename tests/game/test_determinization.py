@@ -0,0 +1,75 @@
+import random
+from collections import Counter
+from typing import List
+
+import pytest
+
+from src.game.determinization import build_game, deal_hidden_hands, get_unseen_cards
+from src.game.game_state import GameState, get_age_deck
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders
+
+
+@pytest.fixture
+def game() -> GameState:
+    """A sequential game stopped in the middle of a turn of age 1"""
+    wonders = load_wonders()
+    players: List[Player] = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(3))
+    game.deal_age()
+    for _ in range(2):
+        for player in players:
+            game.make_turn(player)
+        game.next_turn()
+    game.make_turn(players[0])  # P1 moved, P2 and P3 did not yet
+    return game
+
+
+def test_unseen_cards_are_the_hidden_ones(game: GameState) -> None:
+    player = game.all_players[1]
+    unseen = get_unseen_cards(player, game.get_game_view(), load_cards())
+
+    hidden = [card for seat in (0, 2) for card in game.all_players[seat].hand]
+    assert Counter(card.id for card in hidden) <= Counter(card.id for card in unseen)
+    assert not set(card.id for card in player.hand) & set(card.id for card in unseen)
+    # Only the cards tucked under a stage are unseen without being in a hand
+    stages = sum(view.stages_built for view in game.get_all_player_views())
+    assert len(unseen) == len(hidden) + stages
+    assert len(unseen) < len(get_age_deck(list(load_cards()), 1, 3))
+
+
+def test_rebuilt_game_matches_the_public_state(game: GameState) -> None:
+    player = game.all_players[1]
+    game_view = game.get_game_view()
+    rebuilt = build_game(player, game_view, load_cards(), [SimpleStrategy()] * 3)
+
+    assert rebuilt.get_game_view().age == game.age and rebuilt.turn == game.turn
+    for original, copy in zip(game.all_players, rebuilt.all_players):
+        assert copy.cards == original.cards and copy.coins == original.coins
+        assert copy.production == original.production
+    assert rebuilt.all_players[1].hand == player.hand
+    assert rebuilt.all_players[0].hand == rebuilt.all_players[2].hand == []
+    assert rebuilt.get_hash() == rebuilt.compute_hash()
+
+
+def test_hidden_hands_are_dealt_and_taken_back(game: GameState) -> None:
+    player = game.all_players[1]
+    game_view = game.get_game_view()
+    unseen = get_unseen_cards(player, game_view, load_cards())
+    rebuilt = build_game(player, game_view, load_cards(), [SimpleStrategy()] * 3)
+    position_hash = rebuilt.get_hash()
+
+    rebuilt.push()
+    deal_hidden_hands(rebuilt, game_view, player.position, unseen, random.Random(0))
+    sizes = [len(copy.hand) for copy in rebuilt.all_players]
+    assert sizes == [len(original.hand) for original in game.all_players]
+    assert sizes[0] == sizes[1] - 1  # P1 already moved this turn
+    dealt = [card for seat in (0, 2) for card in rebuilt.all_players[seat].hand]
+    assert Counter(card.id for card in dealt) <= Counter(card.id for card in unseen)
+    rebuilt.pop()
+
+    assert rebuilt.all_players[0].hand == rebuilt.all_players[2].hand == []
+    assert rebuilt.get_hash() == position_hash
@@ -0,0 +1,114 @@
+import random
+from typing import List, Tuple
+
+import pytest
+
+from src.game.endgame import (
+    EndgameSolver,
+    FirstChoice,
+    get_final_totals,
+    get_seats_to_move,
+    is_endgame,
+)
+from src.game.game_state import GameState
+from src.game.player import Player, get_left_neighbor, get_right_neighbor, get_valid_moves
+from src.game.scoring import get_margin
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders
+
+
+def play_to_endgame(seed: int, max_cards: int = 2) -> GameState:
+    wonders = load_wonders()
+    players = [
+        Player(f"P{seat + 1}", seat, wonders[seat], SimpleStrategy()) for seat in range(3)
+    ]
+    game = GameState(players, list(load_cards()), random.Random(seed))
+    game.deal_age()
+    while not is_endgame(game, max_cards):
+        for player in players:
+            game.make_turn(player)
+        if game.next_turn():
+            game.next_age()
+    return game
+
+
+def brute_force(game: GameState, seat: int) -> Tuple[int, ...]:
+    """Max-n over every valid move, without the table or the pruned repeats"""
+    if seat == len(game.all_players):
+        assert game.next_turn()
+        return get_final_totals(game)
+    player = game.all_players[seat]
+    best: List[Tuple[int, ...]] = []
+    for move in get_valid_moves(
+        player,
+        get_left_neighbor(seat, game.all_players).get_player_view(),
+        get_right_neighbor(seat, game.all_players).get_player_view(),
+    ):
+        game.push()
+        game.make_move(move)
+        totals = brute_force(game, seat + 1)
+        game.pop()
+        if not best or get_margin(totals, seat) > get_margin(best[0], seat):
+            best = [totals]
+    return best[0]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_brute_force(seed: int) -> None:
+    game = play_to_endgame(seed)
+    for player in game.all_players:
+        player.rng = FirstChoice()
+    expected = brute_force(game, 0)
+
+    solution = EndgameSolver().solve(game, 0)
+    assert get_margin(solution.totals, 0) == get_margin(expected, 0)
+
+
+def test_leaves_the_game_as_it_was() -> None:
+    game = play_to_endgame(3)
+    position_hash = game.get_hash()
+    rng_state = game.rng.getstate()
+
+    solution = EndgameSolver().solve(game, 0)
+
+    assert game.get_hash() == position_hash == game.compute_hash()
+    assert game.rng.getstate() == rng_state
+    assert solution.move.player_name == "P1" and solution.nodes > 0
+
+
+def test_later_seats_reuse_the_table() -> None:
+    game = play_to_endgame(4)
+    for player in game.all_players:
+        player.rng = FirstChoice()  # The ties the solver expects
+    solver = EndgameSolver()
+    first = solver.solve(game, 0)
+    game.make_move(first.move)
+
+    assert get_seats_to_move(game, 1) == (1, 2)
+    second = solver.solve(game, 1)
+    assert second.nodes == 0 and solver.hits > 0
+    assert second.totals == first.totals
+
+
+def test_last_two_picks() -> None:
+    game = play_to_endgame(5, max_cards=3)
+    assert max(len(player.hand) for player in game.all_players) == 3
+    position_hash = game.get_hash()
+    solution = EndgameSolver(max_cards=3).solve(game, 0)
+    assert solution.move.card in game.all_players[0].hand
+    assert game.get_hash() == position_hash
+
+
+def test_not_an_endgame() -> None:
+    game = play_to_endgame(6, max_cards=3)
+    with pytest.raises(ValueError):
+        EndgameSolver(max_cards=2).solve(game, 0)
+
+
+def test_seats_yet_to_move_under_simultaneous_play() -> None:
+    """Nobody has moved yet, so the seat solved for goes first and the others follow"""
+    game = play_to_endgame(7)
+    assert get_seats_to_move(game, 2) == (2, 0, 1)
+
+    solution = EndgameSolver().solve(game, 2)
+    assert solution.move.player_name == "P3"
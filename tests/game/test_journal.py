@@ -0,0 +1,111 @@
+import pytest
+
+from src.core.enums import Action, CardType, Resource
+from src.core.types import Card, Wonder
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card, make_wonder_stage
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonder = Wonder("W1", Resource.WOOD, [make_wonder_stage({Resource.BRICK: 1}, "VVV")])
+    players = [
+        Player("P1", 0, wonder, SimpleStrategy()),
+        Player("P2", 1, Wonder("W2", Resource.BRICK, []), SimpleStrategy()),
+        Player("P3", 2, Wonder("W3", Resource.STONE, []), SimpleStrategy()),
+    ]
+    hands = [
+        [
+            make_card(f"Card {i}{j}", CardType.MILITARY, 1, 3, {Resource.STONE: 1}, [], "M")
+            for j in range(3)
+        ]
+        for i in range(3)
+    ]
+    for player, hand in zip(players, hands):
+        player.add_to_hand(hand)
+    return GameState(players, [])
+
+
+def test_pop_reverts_moves_and_rotation(game: GameState) -> None:
+    p1, p2, p3 = game.all_players
+    p1.add_coins(2)
+    before = game.snapshot()
+
+    game.push()
+    game.make_move(Move("P1", Action.PLAY, p1.hand[0]))  # Buys stone from P3
+    game.make_move(Move("P2", Action.DISCARD, p2.hand[0]))
+    game.make_move(Move("P1", Action.WONDER, p1.hand[0]))  # Buys brick from P2
+    game.next_turn()
+    assert game.snapshot() != before
+    assert game.turn == 2
+
+    game.pop()
+
+    assert game.snapshot() == before
+    assert not game.journal.entries
+
+
+def test_nested_frames(game: GameState) -> None:
+    p1 = game.all_players[0]
+    game.push()
+    game.make_move(Move("P1", Action.DISCARD, p1.hand[0]))
+    after_first = game.snapshot()
+
+    game.push()
+    game.make_move(Move("P1", Action.DISCARD, p1.hand[0]))
+    game.pop()
+
+    assert game.snapshot() == after_first
+    game.pop()
+    assert p1.coins == 3 and len(p1.hand) == 3 and not game.discarded_counts
+
+
+def test_pop_reverts_end_of_age(game: GameState) -> None:
+    for player in game.all_players:
+        player.discard_hand()
+        player.add_to_hand(
+            [make_card(f"Last {player.name}", CardType.CIVILIAN, 1, 3, {}, [], "V")]
+        )
+    before = game.snapshot()
+
+    game.push()
+    assert game.next_turn()
+    assert len(game.discarded_cards) == 3
+    game.pop()
+
+    assert game.snapshot() == before
+
+
+def test_snapshot_restore(game: GameState) -> None:
+    p1 = game.all_players[0]
+    start = game.snapshot()
+
+    game.make_move(Move("P1", Action.PLAY, p1.hand[0]))
+    played = game.snapshot()
+
+    game.restore(start)
+    assert p1.cards == () and p1.coins == 3 and len(p1.hand) == 3
+    assert p1.production == start.players[0].production
+
+    game.restore(played)
+    assert game.snapshot() == played
+
+
+def test_restore_is_undone_by_pop(game: GameState) -> None:
+    start = game.snapshot()
+    game.make_move(Move("P1", Action.DISCARD, game.all_players[0].hand[0]))
+    played = game.snapshot()
+
+    game.push()
+    game.restore(start)
+    game.pop()
+
+    assert game.snapshot() == played
+
+
+def test_pop_without_push(game: GameState) -> None:
+    with pytest.raises(IndexError):
+        game.pop()
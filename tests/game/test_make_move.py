@@ -0,0 +1,66 @@
+import pytest
+
+from src.core.enums import Action, CardType, Resource
+from src.core.types import Wonder
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card
+
+
+@pytest.fixture
+def game() -> GameState:
+    players = [
+        Player("P1", 0, Wonder("W1", Resource.WOOD, []), SimpleStrategy()),
+        Player("P2", 1, Wonder("W2", Resource.BRICK, []), SimpleStrategy()),
+        Player("P3", 2, Wonder("W3", Resource.STONE, []), SimpleStrategy()),
+    ]
+    return GameState(players, [])
+
+
+def test_play_card(game: GameState) -> None:
+    player = game.all_players[0]
+    card = make_card("Altar", CardType.CIVILIAN, 1, 3, {}, [], "VVV")
+    other = make_card("Theatre", CardType.CIVILIAN, 1, 3, {}, [], "VVV")
+    player.add_to_hand([card, other])
+
+    game.make_move(Move("P1", Action.PLAY, card))
+
+    assert player.hand == [other]
+    assert player.cards == (card,)
+    assert not player.can_add_card(card)
+    assert player.can_add_card(other)
+
+
+def test_discard_card(game: GameState) -> None:
+    player = game.all_players[1]
+    card = make_card("Altar", CardType.CIVILIAN, 1, 3, {}, [], "VVV")
+    player.add_to_hand([card])
+
+    game.make_move(Move("P2", Action.DISCARD, card))
+
+    assert player.hand == []
+    assert player.coins == 6
+    assert game.discarded_cards == (card,)
+    assert game.discarded_counts[card.id] == 1
+
+
+def test_play_card_gives_coins(game: GameState) -> None:
+    player = game.all_players[0]
+    left, right = game.all_players[2], game.all_players[1]
+    left.add_card(make_card("Lumber Yard", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"))
+    right.add_card(make_card("Stone Pit", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"))
+    player.add_card(make_card("Clay Pool", CardType.RAW_MATERIAL, 1, 3, {}, [], "B"))
+
+    tavern = make_card("Tavern", CardType.COMMERCIAL, 1, 3, {}, [], "$$$$$")
+    vineyard = make_card(
+        "Vineyard", CardType.COMMERCIAL, 2, 3, {}, [], "$-{raw_material}_<v>"
+    )
+    player.add_to_hand([tavern, vineyard])
+
+    game.make_move(Move("P1", Action.PLAY, tavern))
+    assert player.coins == 8
+
+    game.make_move(Move("P1", Action.PLAY, vineyard))
+    assert player.coins == 11
@@ -4,7 +4,7 @@ from typing import Dict, List
 import pytest
 
 from src.core.enums import CardType, Resource
-from src.core.types import Card, Wonder
+from src.core.types import Wonder
 from src.game.military import (
     apply_military_tokens_to_all,
     calculate_battle,
@@ -14,6 +14,7 @@ from src.game.military import (
 from src.core.constants import MILITARY_DEFEAT_TOKEN, AGE_MILITARY_TOKENS
 from src.game.player import Player
 from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card
 
 logger = logging.getLogger(__name__)
 
@@ -58,8 +59,8 @@ def test_calculate_military_outcome(three_players: List[Player]) -> None:
     p1, p2, p3 = three_players
 
     # P1: 1 shield, P2: 2 shields, P3: 0 shields
-    p1.add_card(Card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
-    p2.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p1.add_card(make_card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
+    p2.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
 
     logging.info(f"p1: {p1.get_shields()} shields")
     logging.info(f"p2: {p2.get_shields()} shields")
@@ -80,7 +81,7 @@ def test_military_conflicts_age1(three_players: List[Player]) -> None:
     p1, p2, p3 = three_players
 
     # Add 1 shield to P1
-    p1.add_card(Card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
+    p1.add_card(make_card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
 
     logging.info(f"p1: {p1.get_shields()} shields")
     logging.info(f"p2: {p2.get_shields()} shields")
@@ -102,8 +103,8 @@ def test_military_conflicts_age2(three_players: List[Player]) -> None:
     p1, p2, p3 = three_players
 
     # P1: 1 shield, P2: 2 shields, P3: 0 shields
-    p1.add_card(Card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
-    p2.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p1.add_card(make_card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
+    p2.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
 
     logging.info(f"p1: {p1.get_shields()} shields")
     logging.info(f"p2: {p2.get_shields()} shields")
@@ -123,9 +124,9 @@ def test_military_conflicts_age3(three_players: List[Player]) -> None:
     p1, p2, p3 = three_players
 
     # P1: 3 shields, P2: 2 shields, P3: 3 shields
-    p1.add_card(Card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
-    p2.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
-    p3.add_card(Card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
+    p1.add_card(make_card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
+    p2.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p3.add_card(make_card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
 
     outcomes = resolve_military_conflicts(three_players, 3)
 
@@ -139,7 +140,7 @@ def test_accumulating_military_tokens(three_players: List[Player]) -> None:
     p1, p2, p3 = three_players
 
     # Age 1: P1 wins against P2 and P3
-    p1.add_card(Card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
+    p1.add_card(make_card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
     
     outcomes = resolve_military_conflicts(three_players, 1)
 
@@ -149,7 +150,7 @@ def test_accumulating_military_tokens(three_players: List[Player]) -> None:
     assert p3.get_military_score() == -1 # D, L
 
     # Age 2: P2 wins against P1 and P3
-    p2.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p2.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
 
     outcomes = resolve_military_conflicts(three_players, 2)
 
@@ -165,7 +166,7 @@ def test_max_shields(three_players: List[Player]) -> None:
 
     # Add maximum reasonable number of shields to P1
     for i in range(10):  # No game should have more than 10 military cards
-        p1.add_card(Card(f"Shield_{i}", CardType.MILITARY, 1, 3, {}, [], "MMM"))
+        p1.add_card(make_card(f"Shield_{i}", CardType.MILITARY, 1, 3, {}, [], "MMM"))
 
     outcomes = resolve_military_conflicts(three_players, 3)
     
@@ -3,10 +3,11 @@ import logging
 import pytest
 
 from src.core.enums import CardType, Resource
-from src.core.types import Card, Wonder
+from src.core.types import Wonder
 from src.game.game_state import GameState
 from src.game.player import Player
 from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +25,19 @@ def turn_game() -> GameState:
 def test_hand_rotation_age1(turn_game: GameState) -> None:
     """Test clockwise hand rotation in age 1"""
     p1_cards = [
-        Card("C1", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
-        Card("C4", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
-        Card("C7", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C1", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C4", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C7", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
     ]
     p2_cards = [
-        Card("C2", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
-        Card("C5", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
-        Card("C8", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C2", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C5", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C8", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
     ]
     p3_cards = [
-        Card("C3", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
-        Card("C6", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
-        Card("C9", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C3", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C6", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C9", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
     ]
 
     turn_game.all_players[0].add_to_hand(p1_cards)
@@ -57,19 +58,19 @@ def test_hand_rotation_age2(turn_game: GameState) -> None:
     # Similar to above but counter-clockwise
 
     p1_cards = [
-        Card("C1", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
-        Card("C4", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
-        Card("C7", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C1", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C4", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
+        make_card("C7", CardType.RAW_MATERIAL, 1, 3, {}, [], "W"),
     ]
     p2_cards = [
-        Card("C2", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
-        Card("C5", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
-        Card("C8", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C2", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C5", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
+        make_card("C8", CardType.RAW_MATERIAL, 1, 3, {}, [], "S"),
     ]
     p3_cards = [
-        Card("C3", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
-        Card("C6", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
-        Card("C9", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C3", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C6", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
+        make_card("C9", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"),
     ]
 
     turn_game.all_players[0].add_to_hand(p1_cards)
@@ -90,7 +91,7 @@ def test_military_conflict_end_age(turn_game: GameState) -> None:
     p2 = turn_game.all_players[1]
     p3 = turn_game.all_players[2]
 
-    p1.add_card(Card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
+    p1.add_card(make_card("Shield1", CardType.MILITARY, 1, 3, {}, [], "M"))
 
     # P1: M, P2: , P3:
     turn_game.next_turn()
@@ -106,7 +107,7 @@ def test_military_conflict_end_age(turn_game: GameState) -> None:
     )
 
     # Now give player 2 a military card
-    p2.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p2.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
 
     # P1: M, P2: MM, P3:
     turn_game.next_turn()
@@ -122,8 +123,8 @@ def test_military_conflict_end_age(turn_game: GameState) -> None:
     turn_game.age = 3
 
     # Now give player 3 a military card
-    p1.add_card(Card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
-    p3.add_card(Card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
+    p1.add_card(make_card("Shield2", CardType.MILITARY, 1, 3, {}, [], "MM"))
+    p3.add_card(make_card("Shield3", CardType.MILITARY, 1, 3, {}, [], "MMM"))
 
     # P1: MMM, P2: MM, P3: MMM
     turn_game.next_turn()
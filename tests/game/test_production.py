@@ -0,0 +1,87 @@
+from typing import List
+
+import pytest
+
+from src.core.enums import CardType, Resource
+from src.core.types import Wonder
+from src.game.player import Player
+from src.game.production import ProductionLedger
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card, parse_wonders
+
+
+@pytest.fixture
+def wonders() -> List[Wonder]:
+    with open("data/wonders.csv", "r") as f:
+        return parse_wonders(f.read())
+
+
+@pytest.fixture
+def player() -> Player:
+    return Player("P1", 0, Wonder("W1", Resource.WOOD, []), SimpleStrategy())
+
+
+def test_ledger_tracks_cards(player: Player) -> None:
+    player.add_card(make_card("Lumber Yard", CardType.RAW_MATERIAL, 1, 3, {}, [], "WW"))
+    player.add_card(make_card("Tree Farm", CardType.RAW_MATERIAL, 1, 6, {}, [], "W/B"))
+    player.add_card(make_card("Forum", CardType.COMMERCIAL, 2, 3, {}, [], "F/L/P"))
+
+    ledger = player.production
+    assert ledger.get_fixed(Resource.WOOD) == 3
+    assert ledger.choices == (
+        (Resource.WOOD, Resource.BRICK),
+        (Resource.GLASS, Resource.LOOM, Resource.PAPYRUS),
+    )
+    # Yellow cards cannot be bought by the neighbors
+    assert ledger.tradable_choices == ((Resource.WOOD, Resource.BRICK),)
+    assert ledger.can_trade(Resource.BRICK)
+    assert not ledger.can_trade(Resource.GLASS)
+
+    assert player.get_resources() == {Resource.WOOD: 4, Resource.GLASS: 1}
+    assert player.get_resources([Resource.BRICK, Resource.LOOM]) == {
+        Resource.WOOD: 3,
+        Resource.BRICK: 1,
+        Resource.LOOM: 1,
+    }
+
+
+def test_ledger_counts_only_built_stages(wonders: List[Wonder]) -> None:
+    alexandria = next(w for w in wonders if w.name == "alexandria")
+    player = Player("P1", 0, alexandria, SimpleStrategy())
+
+    assert player.production.choices == ()
+
+    player.add_stage()
+    player.add_stage()  # W/S/O/B
+
+    assert player.production.choices == (
+        (Resource.WOOD, Resource.STONE, Resource.ORE, Resource.BRICK),
+    )
+    assert player.production.tradable_choices == ()
+
+
+def test_ledger_discounts(player: Player) -> None:
+    player.add_card(
+        make_card("West Post", CardType.COMMERCIAL, 1, 3, {}, [], "trade_{W/O/B/S}_<")
+    )
+
+    assert Resource.ORE in player.production.left_discounts
+    assert Resource.ORE not in player.production.right_discounts
+
+
+def test_view_shares_ledger(player: Player) -> None:
+    view = player.get_player_view()
+    player.add_card(make_card("Ore Vein", CardType.RAW_MATERIAL, 1, 3, {}, [], "O"))
+
+    assert view.production is not player.production
+    assert view.production.get_fixed(Resource.ORE) == 0
+    assert player.get_player_view().production is player.production
+
+
+def test_ledger_rebuilt_when_cards_replaced(player: Player) -> None:
+    player.cards = [make_card("Ore Vein", CardType.RAW_MATERIAL, 1, 3, {}, [], "O")]
+
+    assert player.production == ProductionLedger.for_player(
+        player.wonder, player.cards, 0
+    )
+    assert player.production.get_fixed(Resource.ORE) == 1
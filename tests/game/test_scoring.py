@@ -1,7 +1,7 @@
 import pytest
 
 from src.core.enums import CardType, Resource
-from src.core.types import Card, Score, Wonder, WonderStage
+from src.core.types import Score, Wonder
 from src.game.player import Player
 from src.game.strategies.simple.simple import SimpleStrategy
 from src.game.scoring import (
@@ -13,7 +13,9 @@ from src.game.scoring import (
     calculate_total_score,
     calculate_treasury_score,
     calculate_wonders_score,
+    get_margin,
 )
+from src.utils.parsers import make_card, make_wonder_stage
 
 
 @pytest.fixture
@@ -22,9 +24,9 @@ def basic_wonder() -> Wonder:
         name="test_wonder",
         resource=Resource.WOOD,
         stages=[
-            WonderStage(cost={}, effect="VVV"),
-            WonderStage(cost={}, effect="VVV"),
-            WonderStage(cost={}, effect="VVVV"),
+            make_wonder_stage(cost={}, effect="VVV"),
+            make_wonder_stage(cost={}, effect="VVV"),
+            make_wonder_stage(cost={}, effect="VVVV"),
         ],
     )
 
@@ -52,7 +54,7 @@ def test_wonders_score(basic_player: Player) -> None:
 
 
 def test_civilian_score(basic_player: Player) -> None:
-    civilian_card1 = Card(
+    civilian_card1 = make_card(
         name="test_civil1",
         type=CardType.CIVILIAN,
         age=1,
@@ -61,7 +63,7 @@ def test_civilian_score(basic_player: Player) -> None:
         chain_to=None,
         effect="VVV",
     )
-    civilian_card2 = Card(
+    civilian_card2 = make_card(
         name="test_civil2",
         type=CardType.CIVILIAN,
         age=1,
@@ -78,7 +80,7 @@ def test_civilian_score(basic_player: Player) -> None:
 def test_science_score(basic_player: Player) -> None:
     # Test with 2 of each symbol (no jokers)
     basic_player.cards = [
-        Card(
+        make_card(
             name="test_science1",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -87,7 +89,7 @@ def test_science_score(basic_player: Player) -> None:
             chain_to=None,
             effect="C",
         ),
-        Card(
+        make_card(
             name="test_science2",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -96,7 +98,7 @@ def test_science_score(basic_player: Player) -> None:
             chain_to=None,
             effect="C",
         ),
-        Card(
+        make_card(
             name="test_science3",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -105,7 +107,7 @@ def test_science_score(basic_player: Player) -> None:
             chain_to=None,
             effect="T",
         ),
-        Card(
+        make_card(
             name="test_science4",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -114,7 +116,7 @@ def test_science_score(basic_player: Player) -> None:
             chain_to=None,
             effect="T",
         ),
-        Card(
+        make_card(
             name="test_science5",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -123,7 +125,7 @@ def test_science_score(basic_player: Player) -> None:
             chain_to=None,
             effect="G",
         ),
-        Card(
+        make_card(
             name="test_science6",
             type=CardType.SCIENTIFIC,
             age=1,
@@ -139,7 +141,7 @@ def test_science_score(basic_player: Player) -> None:
 
 def test_commercial_score(basic_player: Player) -> None:
     basic_player.cards = [
-        Card(
+        make_card(
             name="test_commercial",
             type=CardType.COMMERCIAL,
             age=1,
@@ -157,7 +159,7 @@ def test_guild_score() -> None:
     wonder = Wonder(
         name="test_wonder",
         resource=Resource.WOOD,
-        stages=[WonderStage(cost={}, effect="VVV")],
+        stages=[make_wonder_stage(cost={}, effect="VVV")],
     )
 
     player1 = Player("p1", 0, wonder, SimpleStrategy())
@@ -165,7 +167,7 @@ def test_guild_score() -> None:
     player3 = Player("p3", 2, wonder, SimpleStrategy())
 
     # Add some cards to neighbors
-    civilian_card = Card(
+    civilian_card = make_card(
         name="test_civil",
         type=CardType.CIVILIAN,
         age=1,
@@ -180,7 +182,7 @@ def test_guild_score() -> None:
 
     # Add guild card to main player
     player1.cards = [
-        Card(
+        make_card(
             name="test_guild",
             type=CardType.GUILD,
             age=3,
@@ -200,7 +202,7 @@ def test_total_score(basic_player: Player) -> None:
     basic_player.coins = 9
     basic_player.stages_built = 2
     basic_player.cards = [
-        Card(
+        make_card(
             name="test_civil",
             type=CardType.CIVILIAN,
             age=1,
@@ -222,3 +224,9 @@ def test_total_score(basic_player: Player) -> None:
     assert score.commercial == 0
     assert score.guilds == 0
     assert score.total == 17
+
+
+def test_margin() -> None:
+    assert get_margin([50, 40, 30], 0) == 10
+    assert get_margin([50, 40, 30], 2) == -20
+    assert get_margin([45, 45], 1) == 0
@@ -0,0 +1,131 @@
+import pytest
+
+from src.core.enums import CardType, Resource
+from src.core.types import Wonder
+from src.game.player import Player, can_afford_cost, get_payment_plan
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.trading import PaymentPlan, find_payment_plans
+from src.utils.parsers import make_card
+
+
+def make_player(name: str, position: int, resource: Resource, *effects: str) -> Player:
+    player = Player(name, position, Wonder(name, resource, []), SimpleStrategy())
+    for effect in effects:
+        player.add_card(
+            make_card(f"{name}_{effect}", CardType.RAW_MATERIAL, 1, 3, {}, [], effect)
+        )
+    return player
+
+
+@pytest.fixture
+def left() -> Player:
+    return make_player("left", 2, Resource.GLASS, "W", "S/O")
+
+
+@pytest.fixture
+def right() -> Player:
+    return make_player("right", 1, Resource.PAPYRUS, "W")
+
+
+def test_own_production_is_free(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.WOOD, "S/W")
+
+    # The choice producer has to give wood, not its first option
+    plans = find_payment_plans(
+        {Resource.WOOD: 2}, player.production, left.production, right.production
+    )
+    assert plans == (PaymentPlan(0, 0),)
+
+
+def test_cheapest_neighbor_is_chosen(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+    player.add_card(
+        make_card("East Post", CardType.COMMERCIAL, 1, 3, {}, [], "trade_{W/O/B/S}_>")
+    )
+
+    plans = find_payment_plans(
+        {Resource.WOOD: 1}, player.production, left.production, right.production
+    )
+    assert plans == (PaymentPlan(0, 1),)
+
+
+def test_ties_return_all_splits(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+
+    plans = find_payment_plans(
+        {Resource.WOOD: 1}, player.production, left.production, right.production
+    )
+    assert plans == (PaymentPlan(0, 2), PaymentPlan(2, 0))
+
+
+def test_neighbor_choice_sells_one_unit(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+
+    # Only one stone from the left S/O card, the ore cannot come from it too
+    assert find_payment_plans(
+        {Resource.STONE: 1, Resource.ORE: 1},
+        player.production,
+        left.production,
+        right.production,
+    ) == ()
+    assert find_payment_plans(
+        {Resource.STONE: 1, Resource.WOOD: 1},
+        player.production,
+        left.production,
+        right.production,
+    ) == (PaymentPlan(2, 2), PaymentPlan(4, 0))
+
+
+def test_wonder_stage_production_is_not_tradable(right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+    left = make_player("left", 2, Resource.GLASS)
+    left.add_card(make_card("Forum", CardType.COMMERCIAL, 2, 3, {}, [], "F/L/P"))
+
+    assert find_payment_plans(
+        {Resource.LOOM: 1}, player.production, left.production, right.production
+    ) == ()
+
+
+def test_maximum_trading_resources(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+    player.coins = 10
+
+    assert find_payment_plans(
+        {Resource.WOOD: 2, Resource.STONE: 1},
+        player.production,
+        left.production,
+        right.production,
+    ) == ()
+
+
+def test_affordability_checks_coins(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+    player_view = player.get_player_view()
+    left_view = left.get_player_view()
+    right_view = right.get_player_view()
+
+    assert can_afford_cost(player_view, left_view, right_view, {Resource.WOOD: 1})
+    assert not can_afford_cost(player_view, left_view, right_view, {Resource.WOOD: 2})
+    assert can_afford_cost(player_view, left_view, right_view, {Resource.COIN: 3})
+    assert not can_afford_cost(player_view, left_view, right_view, {Resource.COIN: 4})
+
+    player.coins = 1
+    assert get_payment_plan(
+        player.get_player_view(), left_view, right_view, {Resource.WOOD: 1}
+    ) is None
+
+
+def test_pay_costs(left: Player, right: Player) -> None:
+    player = make_player("player", 0, Resource.BRICK)
+    player.add_card(
+        make_card("West Post", CardType.COMMERCIAL, 1, 3, {}, [], "trade_{W/O/B/S}_<")
+    )
+
+    coins = player.pay_costs(
+        {Resource.WOOD: 1, Resource.PAPYRUS: 1},
+        left.get_player_view(),
+        right.get_player_view(),
+    )
+
+    assert coins == [1, 2]
+    assert player.coins == 0
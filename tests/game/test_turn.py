@@ -0,0 +1,120 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import pytest
+
+from src.core.enums import Action, CardType, Resource
+from src.core.types import Wonder
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import GameView, Player, PlayerStrategy
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.runner import load_cards, load_wonders
+from src.utils.parsers import make_card
+
+
+class FixedStrategy(PlayerStrategy):
+    """Plays the moves it is given, recording the view it was shown"""
+
+    def __init__(self, moves: Dict[str, Move]) -> None:
+        self.moves = moves
+        self.views: Dict[str, GameView] = {}
+
+    def choose_move(self, player: Player, game_view: GameView) -> Move:
+        self.views[player.name] = game_view
+        return self.moves[player.name]
+
+
+TIMBER = make_card("Timber yard", CardType.RAW_MATERIAL, 1, 3, {}, [], "W")
+BARRACKS = make_card("Barracks", CardType.MILITARY, 1, 3, {Resource.WOOD: 1}, [], "M")
+MARKET = make_card("Market", CardType.CIVILIAN, 1, 3, {Resource.COIN: 2}, [], "VV")
+VINEYARD = make_card("Vineyard", CardType.COMMERCIAL, 1, 3, {}, [], "$-{raw_material}_<v>")
+
+
+def make_game(moves: Dict[str, Move]) -> GameState:
+    strategy = FixedStrategy(moves)
+    players = [
+        Player("P1", 0, Wonder("W1", Resource.STONE, []), strategy),
+        Player("P2", 1, Wonder("W2", Resource.WOOD, []), strategy),
+        Player("P3", 2, Wonder("W3", Resource.ORE, []), strategy),
+    ]
+    players[0].add_to_hand([BARRACKS])
+    players[1].add_to_hand([TIMBER, VINEYARD])
+    players[2].add_to_hand([MARKET])
+    return GameState(players, [])
+
+
+def test_moves_are_applied_together() -> None:
+    game = make_game(
+        {
+            "P1": Move("P1", Action.PLAY, BARRACKS),  # Buys wood from P2
+            "P2": Move("P2", Action.PLAY, VINEYARD),
+            "P3": Move("P3", Action.DISCARD, MARKET),
+        }
+    )
+    p1, p2, p3 = game.all_players
+
+    moves = game.resolve_turn()
+
+    assert [move.player_name for move in moves] == ["P1", "P2", "P3"]
+    # Everyone was shown the same snapshot
+    views = game.all_players[0].strategy.views  # type: ignore[attr-defined]
+    assert views["P1"] is views["P2"] is views["P3"]
+    assert p1.cards == (BARRACKS,) and p1.coins == 1
+    assert p2.cards == (VINEYARD,) and p2.hand == [TIMBER]
+    assert p3.coins == 6 and game.discarded_cards == (MARKET,)
+    # Got 2 for the wood, and no coins from the vineyard: no brown cards around
+    assert p2.coins == 5
+
+
+def test_coins_received_cannot_be_spent_in_the_same_turn() -> None:
+    """P3 gets coins from discarding, but the market is priced on the snapshot"""
+    game = make_game(
+        {
+            "P1": Move("P1", Action.PLAY, BARRACKS),
+            "P2": Move("P2", Action.PLAY, TIMBER),
+            "P3": Move("P3", Action.PLAY, MARKET),
+        }
+    )
+    p3 = game.all_players[2]
+    p3.add_coins(-2)  # 1 coin left, the market costs 2
+    before = game.snapshot()
+    rng_states = [player.rng.getstate() for player in game.all_players]
+
+    with pytest.raises(ValueError):
+        game.resolve_turn()
+
+    # Nothing was applied, and no payment was priced
+    assert game.snapshot() == before
+    assert [player.rng.getstate() for player in game.all_players] == rng_states
+
+
+def test_instant_effects_see_the_end_of_the_turn() -> None:
+    """A commercial card counts the brown card a neighbor plays in the same turn"""
+    game = make_game(
+        {
+            "P1": Move("P1", Action.PLAY, TIMBER),
+            "P2": Move("P2", Action.PLAY, VINEYARD),
+            "P3": Move("P3", Action.DISCARD, MARKET),
+        }
+    )
+    p1, p2, _ = game.all_players
+    p1.discard_hand()
+    p1.add_to_hand([TIMBER])
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        game.resolve_turn(executor)
+
+    assert p2.coins == 3 + 1
+
+
+def test_simultaneous_game() -> None:
+    wonders = load_wonders()
+    players = [Player(f"P{i + 1}", i, wonders[i], SimpleStrategy()) for i in range(3)]
+    scores = GameState(players, list(load_cards()), random.Random(4)).play_game(
+        simultaneous=True
+    )
+
+    assert len(scores) == 3
+    assert all(player.hand == [] for player in players)
@@ -0,0 +1,64 @@
+import pytest
+
+from src.core.enums import Action, CardType, Resource
+from src.core.types import Wonder
+from src.game.player import Player, get_action_mask, get_valid_moves
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card, make_wonder_stage
+
+
+@pytest.fixture
+def players() -> tuple[Player, Player, Player]:
+    wonder = Wonder("W1", Resource.WOOD, [make_wonder_stage({Resource.WOOD: 2}, "VVV")])
+    return (
+        Player("P1", 0, wonder, SimpleStrategy()),
+        Player("P2", 1, Wonder("W2", Resource.WOOD, []), SimpleStrategy()),
+        Player("P3", 2, Wonder("W3", Resource.STONE, []), SimpleStrategy()),
+    )
+
+
+def test_valid_moves_order(players: tuple[Player, Player, Player]) -> None:
+    """Each card gives PLAY if valid, then WONDER if valid, then DISCARD"""
+    player, right, left = players
+    free = make_card("Free", CardType.CIVILIAN, 1, 3, {}, [], "VV")
+    expensive = make_card("Expensive", CardType.CIVILIAN, 1, 3, {Resource.GLASS: 3}, [], "VVVVV")
+    player.add_to_hand([free, expensive])
+
+    moves = get_valid_moves(player, left.get_player_view(), right.get_player_view())
+
+    assert [(move.action, move.card) for move in moves] == [
+        (Action.PLAY, free),
+        (Action.WONDER, free),
+        (Action.DISCARD, free),
+        (Action.WONDER, expensive),
+        (Action.DISCARD, expensive),
+    ]
+
+
+def test_action_mask_is_cached(players: tuple[Player, Player, Player]) -> None:
+    """The mask is reused until the player or a neighbor changes"""
+    player, right, left = players
+    player.add_to_hand([make_card("Free", CardType.CIVILIAN, 1, 3, {}, [], "VV")])
+
+    mask = get_action_mask(player, left.get_player_view(), right.get_player_view())
+    assert get_action_mask(player, left.get_player_view(), right.get_player_view()) is mask
+
+    right.add_coins(1)
+    assert get_action_mask(player, left.get_player_view(), right.get_player_view()) is not mask
+
+
+def test_action_mask_follows_changes(players: tuple[Player, Player, Player]) -> None:
+    """A card that becomes affordable after a change is playable in the new mask"""
+    player, right, left = players
+    card = make_card(
+        "Temple", CardType.CIVILIAN, 1, 3, {Resource.WOOD: 1, Resource.COIN: 4}, [], "VVV"
+    )
+    player.add_to_hand([card])
+
+    mask = get_action_mask(player, left.get_player_view(), right.get_player_view())
+    assert not mask.is_valid(0, Action.PLAY)
+    assert mask.is_valid(0, Action.DISCARD)
+
+    player.add_coins(1)
+    mask = get_action_mask(player, left.get_player_view(), right.get_player_view())
+    assert mask.is_valid(0, Action.PLAY)
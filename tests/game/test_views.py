@@ -0,0 +1,88 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from src.core.enums import CardType, Resource
+from src.core.types import Wonder
+from src.game.game_state import GameState
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.utils.parsers import make_card, make_wonder_stage
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonder = Wonder("W1", Resource.WOOD, [make_wonder_stage({}, "VVV")])
+    players = [
+        Player("P1", 0, wonder, SimpleStrategy()),
+        Player("P2", 1, Wonder("W2", Resource.BRICK, []), SimpleStrategy()),
+        Player("P3", 2, Wonder("W3", Resource.STONE, []), SimpleStrategy()),
+    ]
+    return GameState(players, [])
+
+
+def test_player_view_shares_structure(game: GameState) -> None:
+    """Views share the cards tuple and the wonder instead of copying them"""
+    player = game.all_players[0]
+    player.add_card(make_card("C1", CardType.CIVILIAN, 1, 3, {}, [], "VVV"))
+
+    view = player.get_player_view()
+
+    assert view.cards is player.cards
+    assert view.wonder is player.wonder
+
+
+def test_player_view_is_a_snapshot(game: GameState) -> None:
+    """Changes to the player after the view was taken are not visible in it"""
+    player = game.all_players[0]
+    view = player.get_player_view()
+
+    player.add_card(make_card("C1", CardType.CIVILIAN, 1, 3, {}, [], "VVV"))
+    player.add_coins(2)
+
+    assert view.cards == ()
+    assert view.coins == 3
+    assert len(player.get_player_view().cards) == 1
+
+
+def test_views_are_read_only(game: GameState) -> None:
+    """Strategies cannot mutate the engine state through the views"""
+    game_view = game.get_game_view()
+    view = game_view.all_players_no_hand[0]
+
+    with pytest.raises(FrozenInstanceError):
+        view.coins = 100  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        view.wonder.stages[0].effect = "VVVVVVV"  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        card = make_card("C1", CardType.CIVILIAN, 1, 3, {}, [], "V")
+        view.cards.append(card)  # type: ignore[attr-defined]
+
+    with pytest.raises(FrozenInstanceError):
+        view.score.civilian = 100  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        view.wonder.stages[0].cost[Resource.WOOD] = 0  # type: ignore[index]
+
+
+def test_game_view_neighbors(game: GameState) -> None:
+    game_view = game.get_game_view()
+    p1, p2, p3 = game_view.all_players_no_hand
+
+    assert game_view.get_left_neighbor(p1) is p3
+    assert game_view.get_right_neighbor(p1) is p2
+    assert game_view.get_left_neighbor(p3) is p2
+
+
+def test_player_view_is_reused_until_a_change(game: GameState) -> None:
+    player = game.all_players[0]
+    view = player.get_player_view()
+    assert player.get_player_view() is view
+    assert view.hand_size == 0
+
+    # Fields set directly are changes too
+    player.coins = 7
+    assert player.get_player_view() is not view
+    assert player.get_player_view().coins == 7
+    player.hand = [make_card("C1", CardType.CIVILIAN, 1, 3, {}, [], "VVV")]
+    assert player.get_player_view().hand_size == 1
+    assert game.get_hash() == game.compute_hash()
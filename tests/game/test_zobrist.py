@@ -0,0 +1,84 @@
+import pytest
+
+from src.core.enums import Action, CardType, Resource
+from src.core.types import Wonder
+from src.game.game_state import GameState
+from src.game.move import Move
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.zobrist import Feature, zobrist_key
+from src.utils.parsers import make_card, make_wonder_stage
+
+
+@pytest.fixture
+def game() -> GameState:
+    wonder = Wonder("W1", Resource.WOOD, [make_wonder_stage({}, "VVV")])
+    players = [
+        Player("P1", 0, wonder, SimpleStrategy()),
+        Player("P2", 1, Wonder("W2", Resource.BRICK, []), SimpleStrategy()),
+        Player("P3", 2, Wonder("W3", Resource.STONE, []), SimpleStrategy()),
+    ]
+    for i, player in enumerate(players):
+        player.add_to_hand(
+            [make_card(f"Hash {i}{j}", CardType.CIVILIAN, 1, 3, {}, [], "VV") for j in range(2)]
+        )
+    deck = [make_card(f"Age 2 card {i}", CardType.CIVILIAN, 2, 3, {}, [], "V") for i in range(21)]
+    return GameState(players, deck)
+
+
+def test_zobrist_keys_are_stable() -> None:
+    assert zobrist_key(Feature.COINS, 0, 3) == zobrist_key(Feature.COINS, 0, 3)
+    assert zobrist_key(Feature.COINS, 0, 3) != zobrist_key(Feature.COINS, 1, 3)
+    assert 0 <= zobrist_key(Feature.MILITARY, 0, -1) < 1 << 64
+
+
+def test_incremental_hash_matches_full_hash(game: GameState) -> None:
+    p1, p2, p3 = game.all_players
+    hashes = {game.get_hash()}
+
+    game.make_move(Move("P1", Action.WONDER, p1.hand[0]))
+    game.make_move(Move("P2", Action.PLAY, p2.hand[0]))
+    game.make_move(Move("P3", Action.DISCARD, p3.hand[0]))
+    assert game.get_hash() == game.compute_hash()
+    hashes.add(game.get_hash())
+
+    assert game.next_turn()  # End of age, military and discard
+    assert game.get_hash() == game.compute_hash()
+    hashes.add(game.get_hash())
+
+    assert not game.next_age()
+    assert game.get_hash() == game.compute_hash()
+    hashes.add(game.get_hash())
+
+    game.make_move(Move("P1", Action.PLAY, p1.hand[0]))
+    assert not game.next_turn()  # Rotation
+    assert game.get_hash() == game.compute_hash()
+    hashes.add(game.get_hash())
+
+    assert len(hashes) == 5
+
+
+def test_transpositions_share_hash_and_key(game: GameState) -> None:
+    p1, p2, _ = game.all_players
+    start = game.snapshot()
+
+    game.make_move(Move("P1", Action.DISCARD, p1.hand[0]))
+    game.make_move(Move("P2", Action.DISCARD, p2.hand[0]))
+    first = (game.get_hash(), game.get_position_key())
+
+    game.restore(start)
+    game.make_move(Move("P2", Action.DISCARD, p2.hand[0]))
+    game.make_move(Move("P1", Action.DISCARD, p1.hand[0]))
+
+    assert (game.get_hash(), game.get_position_key()) == first
+
+
+def test_pop_restores_hash(game: GameState) -> None:
+    before = game.get_hash()
+
+    game.push()
+    game.make_move(Move("P1", Action.PLAY, game.all_players[0].hand[0]))
+    assert game.get_hash() != before
+    game.pop()
+
+    assert game.get_hash() == before == game.compute_hash()
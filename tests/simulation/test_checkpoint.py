@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.checkpoint import (
+    Campaign,
+    load_checkpoint,
+    merge_ranges,
+    run_campaign,
+    save_checkpoint,
+)
+from src.simulation.runner import simulate
+from src.simulation.stats import MatchupStats
+
+STRATEGIES = ["simple", "warrior", "simple"]
+
+
+def test_ranges_are_merged() -> None:
+    assert merge_ranges([(10, 20), (0, 10), (30, 40), (15, 25)]) == [(0, 25), (30, 40)]
+
+
+def test_checkpoint_round_trip(tmp_path: Path) -> None:
+    stats = MatchupStats()
+    for game in simulate(3, [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], seed=1).games:
+        stats.add(game)
+    campaign = Campaign(10, STRATEGIES, 1, 5, [(0, 5)], stats, 1.5)
+    path = tmp_path / "campaign.json"
+
+    save_checkpoint(campaign, path)
+    loaded = load_checkpoint(path)
+
+    assert list(tmp_path.iterdir()) == [path]  # No temporary file left behind
+    assert loaded.to_dict() == campaign.to_dict()
+    assert [(unit.start, unit.stop) for unit in loaded.get_pending_units()] == [(5, 10)]
+
+
+def test_resume_skips_completed_units(tmp_path: Path) -> None:
+    path = tmp_path / "campaign.json"
+    seen = []
+
+    first = run_campaign(path, 12, STRATEGIES, seed=7, workers=2, chunk_size=4, max_units=2)
+    assert first.n_completed == 8 and not first.is_complete
+    assert json.loads(path.read_text())["completed"] == [[0, 8]]
+
+    second = run_campaign(
+        path, 12, STRATEGIES, workers=2, chunk_size=4, sink=lambda game: seen.append(game.index)
+    )
+    assert second.is_complete and second.root_seed == 7
+    assert sorted(seen) == [8, 9, 10, 11]  # Only the remaining unit was played
+
+    # Same aggregate as playing all the games at once
+    kept = simulate(12, [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], seed=7)
+    expected = MatchupStats()
+    for game in kept.games:
+        expected.add(game)
+    assert second.stats.n_games == 12
+    for name, stats in expected.by_strategy.items():
+        resumed = second.stats.by_strategy[name]
+        assert resumed.games == stats.games and resumed.ranks == stats.ranks
+        assert resumed.wins == pytest.approx(stats.wins)
+        assert resumed.scores["total"].mean == pytest.approx(stats.scores["total"].mean)
+
+    # A finished campaign has nothing left to play
+    assert run_campaign(path, 12, STRATEGIES, workers=1).stats.n_games == 12
+
+
+def test_checkpoint_of_another_campaign_is_refused(tmp_path: Path) -> None:
+    path = tmp_path / "campaign.json"
+    run_campaign(path, 2, STRATEGIES, seed=1, workers=1, chunk_size=2)
+    with pytest.raises(ValueError):
+        run_campaign(path, 2, ["simple", "simple", "simple"], workers=1)
+    with pytest.raises(ValueError, match="root seed"):
+        run_campaign(path, 2, STRATEGIES, seed=2, workers=1)
+    with pytest.raises(ValueError, match="chunk size"):
+        run_campaign(path, 2, STRATEGIES, workers=1, chunk_size=1)
+    # The same values, or none, resume it
+    assert run_campaign(path, 2, STRATEGIES, seed=1, workers=1, chunk_size=2).is_complete
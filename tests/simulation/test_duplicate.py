@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from src.game.game_state import GameState
+from src.game.player import Player
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.duplicate import get_lineup, main, play_board, run_duplicate
+from src.simulation.runner import load_cards, load_wonders, play_game
+
+
+def test_lineup_keeps_the_field_order() -> None:
+    first, a, b = SimpleStrategy(), WarriorStrategy(), SimpleStrategy()
+    assert get_lineup(first, [a, b], 0) == [first, a, b]
+    assert get_lineup(first, [a, b], 1) == [b, first, a]
+    assert get_lineup(first, [a, b], 2) == [a, b, first]
+
+
+def test_seat_streams_keep_the_deals_apart_from_the_moves() -> None:
+    def get_hands(strategies: list) -> list:
+        wonders = load_wonders()
+        players = [
+            Player(f"P{seat + 1}", seat, wonders[seat], strategy)
+            for seat, strategy in enumerate(strategies)
+        ]
+        seat_rngs = [random.Random(f"7/seat/{seat}") for seat in range(3)]
+        game = GameState(players, list(load_cards()), random.Random(7), seat_rngs)
+        hands = []
+        game.deal_age()
+        while True:
+            if game.turn == 1:
+                hands.append([[card.name for card in player.hand] for player in players])
+            for player in players:
+                game.make_turn(player)
+            if game.next_turn() and game.next_age():
+                return hands
+
+    assert get_hands([SimpleStrategy()] * 3) == get_hands(
+        [WarriorStrategy(), SimpleStrategy(), WarriorStrategy()]
+    )
+
+
+def test_same_strategy_has_no_difference() -> None:
+    result = run_duplicate(3, SimpleStrategy(), SimpleStrategy(), [SimpleStrategy()] * 2, seed=1)
+
+    assert result.n_boards == 3 and result.n_games == 18
+    assert result.score_difference.mean == 0 and result.score_difference.variance == 0
+    assert result.win_difference.mean == 0
+
+
+def test_board_is_reproducible_and_paired() -> None:
+    field = [SimpleStrategy(), SimpleStrategy()]
+    board = play_board(WarriorStrategy(), SimpleStrategy(), field, seed=11)
+    again = play_board(WarriorStrategy(), SimpleStrategy(), field, seed=11)
+
+    assert board.seats == [0, 1, 2]
+    assert [game.scores for game in board.games] == [game.scores for game in again.games]
+    for seat, first, second in zip(board.seats, board.first_games, board.second_games):
+        assert first.strategies[seat] == "WarriorStrategy"
+        assert second.strategies[seat] == "SimpleStrategy"
+        assert first.wonders == second.wonders
+    assert board.get_score_difference() == sum(
+        first.totals[seat] - second.totals[seat]
+        for seat, first, second in zip(board.seats, board.first_games, board.second_games)
+    ) / 3
+
+    # Without seat streams the seed still gives the same game as before
+    assert play_game(field + [SimpleStrategy()], 11).scores == play_game(
+        [SimpleStrategy()] * 3, 11
+    ).scores
+
+
+def test_boards_are_streamed() -> None:
+    boards, games = [], []
+    result = run_duplicate(
+        2,
+        WarriorStrategy(),
+        SimpleStrategy(),
+        [SimpleStrategy()] * 2,
+        seed=4,
+        sink=boards.append,
+        game_sink=games.append,
+    )
+
+    assert [board.index for board in boards] == [0, 1]
+    assert len(games) == result.n_games == 12
+    assert result.score_difference.mean == sum(
+        board.get_score_difference() for board in boards
+    ) / 2
+
+
+def test_main(capsys: pytest.CaptureFixture[str]) -> None:
+    """One compared strategy sits with the field, so two field seats make 3-player games"""
+    assert main(["warrior", "simple", "-n", "2", "--seed", "1"]) == 0
+    assert "2 boards, 12 games" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        main(["warrior", "simple", "--field", "simple", "-n", "1"])
+    assert "cannot seat 2 players" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.core.types import Score
+from src.game.strategies.mcts.mcts import MCTSStrategy
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.rating import INITIAL_RATING, RatingPool, get_outcomes
+from src.simulation.runner import GameResult, get_strategy_name, simulate
+
+
+def make_game(strategies: List[str], totals: List[int]) -> GameResult:
+    return GameResult(
+        seed=0,
+        players=[f"P{seat + 1}" for seat in range(len(strategies))],
+        strategies=strategies,
+        wonders=[""] * len(strategies),
+        scores=[Score(civilian=total) for total in totals],
+        duration=0.0,
+    )
+
+
+def test_outcomes_count_ties_as_half() -> None:
+    assert get_outcomes([50, 40, 60]) == [0.5, 0.0, 1.0]
+    assert get_outcomes([50, 50, 40]) == [0.75, 0.75, 0.0]
+    assert get_outcomes([45, 45, 45, 45]) == [0.5] * 4
+
+
+def test_winner_gains_what_the_others_lose() -> None:
+    pool = RatingPool()
+    pool.update(make_game(["a", "b", "c"], [60, 50, 40]))
+
+    a, b, c = (pool.get_rating(name) for name in "abc")
+    assert a.rating > INITIAL_RATING == b.rating > c.rating
+    assert a.rating + b.rating + c.rating == pytest.approx(3 * INITIAL_RATING)
+    assert a.games == b.games == c.games == 1
+
+
+def test_batch_update_does_not_depend_on_order_or_shards() -> None:
+    games = [
+        make_game(["a", "b", "c"], [60, 50, 40]),
+        make_game(["b", "c", "a"], [55, 52, 41]),
+        make_game(["c", "a", "b"], [48, 48, 47]),
+    ]
+    whole = RatingPool()
+    whole.update_batch(games)
+    reversed_pool = RatingPool()
+    reversed_pool.update_batch(games[::-1])
+
+    sharded = RatingPool()
+    update = sharded.get_update(games[:1])
+    update.merge(sharded.get_update(games[1:]))
+    sharded.apply(update)
+
+    for name in "abc":
+        assert whole.get_rating(name).rating == pytest.approx(reversed_pool.get_rating(name).rating)
+        assert whole.get_rating(name).rating == pytest.approx(sharded.get_rating(name).rating)
+        assert whole.get_rating(name).games == sharded.get_rating(name).games == 3
+
+
+def test_pool_is_saved_and_extended(tmp_path: Path) -> None:
+    pool = RatingPool()
+    simulate(60, [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], seed=1, sink=pool)
+    assert [name for name, _ in pool.get_leaderboard()] == ["SimpleStrategy", "WarriorStrategy"]
+
+    path = tmp_path / "ratings.json"
+    pool.save(path)
+    loaded = RatingPool.load(path)
+    assert loaded.ratings == pool.ratings
+
+    # A new strategy is rated against the pool without replaying the history
+    loaded.update(make_game(["newcomer", "SimpleStrategy", "WarriorStrategy"], [70, 50, 40]))
+    assert loaded.get_k_factor("newcomer") == loaded.provisional_k_factor
+    assert loaded.get_k_factor("SimpleStrategy") == loaded.k_factor
+    assert loaded.get_rating("newcomer").rating > INITIAL_RATING
+
+
+def test_variants_of_a_strategy_are_rated_apart() -> None:
+    cautious = SimpleStrategy()
+    cautious.name = "simple-cautious"
+    pool = RatingPool()
+    simulate(2, [SimpleStrategy(), cautious, WarriorStrategy()], seed=3, sink=pool.update)
+
+    assert set(pool.ratings) == {"SimpleStrategy", "simple-cautious", "WarriorStrategy"}
+    assert get_strategy_name(MCTSStrategy(iterations=50)) == "MCTSStrategy(iterations=50)"
+    assert get_strategy_name(MCTSStrategy(iterations=500)) == "MCTSStrategy(iterations=500)"
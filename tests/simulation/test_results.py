@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.simulation.results import (
+    COLUMNS_SUFFIX,
+    JSONL_SUFFIX,
+    SEAT_COLUMNS,
+    ResultsWriter,
+    read_columns,
+    read_records,
+)
+from src.simulation.runner import simulate
+from src.simulation.tournament import run_tournament
+
+
+def test_games_are_streamed_not_kept(tmp_path: Path) -> None:
+    with ResultsWriter(tmp_path, batch_size=2) as writer:
+        result = simulate(5, [SimpleStrategy()] * 3, seed=1, sink=writer.write)
+
+    assert result.n_games == 5 and result.games == []
+    records = list(read_records([tmp_path / "results-00000.jsonl"]))
+    assert [record["index"] for record in records] == [0, 1, 2, 3, 4]
+    assert records[0]["turns"] == 18
+    assert set(records[0]["scores"][0]) == {
+        "military", "treasury", "wonders", "civilian", "scientific", "commercial", "guilds"
+    }
+
+    # Same games as when they are kept in memory
+    kept = simulate(5, [SimpleStrategy()] * 3, seed=1)
+    assert [record["totals"] for record in records] == [game.totals for game in kept.games]
+
+
+def test_buffered_flushing(tmp_path: Path) -> None:
+    writer = ResultsWriter(tmp_path, batch_size=3, columns=False)
+    games = simulate(4, [SimpleStrategy()] * 3, seed=2).games
+
+    for game in games[:2]:
+        writer.write(game)
+    assert writer.n_games == 0  # Still in the buffer
+    writer.write(games[2])
+    assert writer.n_games == 3
+    writer.write(games[3])
+    writer.close()
+
+    assert writer.n_games == 4
+    assert list(tmp_path.iterdir()) == [tmp_path / "results-00000.jsonl"]
+
+
+def test_rotation_and_columns(tmp_path: Path) -> None:
+    with ResultsWriter(tmp_path, batch_size=2, max_games_per_file=3) as writer:
+        run_tournament(7, ["simple"] * 3, seed=3, workers=2, sink=writer.write)
+
+    jsonl = sorted(tmp_path.glob("*" + JSONL_SUFFIX))
+    columns = sorted(tmp_path.glob("*" + COLUMNS_SUFFIX))
+    jsonl = [path for path in jsonl if path not in columns]
+    assert [path.name for path in columns] == [
+        "results-00000.columns.jsonl",
+        "results-00001.columns.jsonl",
+        "results-00002.columns.jsonl",
+    ]
+    assert [len(list(read_records([path]))) for path in jsonl] == [3, 3, 1]
+
+    chunks = list(read_columns(columns))
+    assert all(set(chunk) == set(SEAT_COLUMNS) for chunk in chunks)
+    indexes = [index for chunk in chunks for index in chunk["index"]]
+    assert indexes == [game for game in range(7) for _ in range(3)]
+    # Exactly one winner or a shared win per game
+    assert sum(sum(chunk["won"]) for chunk in chunks) >= 7
+
+
+def test_existing_parts_are_not_overwritten(tmp_path: Path) -> None:
+    with ResultsWriter(tmp_path, batch_size=2) as writer:
+        simulate(2, [SimpleStrategy()] * 3, seed=1, sink=writer.write)
+    written = (tmp_path / "results-00000.jsonl").read_text()
+
+    with pytest.raises(FileExistsError):
+        ResultsWriter(tmp_path)
+    assert (tmp_path / "results-00000.jsonl").read_text() == written
+
+    # Another prefix can share the directory
+    with ResultsWriter(tmp_path, prefix="rerun") as writer:
+        simulate(1, [SimpleStrategy()] * 3, seed=2, sink=writer.write)
+    assert (tmp_path / "rerun-00000.jsonl").exists()
+
+
+def test_only_parts_of_the_same_prefix_are_existing(tmp_path: Path) -> None:
+    (tmp_path / "results-old-00000.jsonl").write_text("")
+    with ResultsWriter(tmp_path) as writer:
+        simulate(1, [SimpleStrategy()] * 3, seed=1, sink=writer.write)
+    assert (tmp_path / "results-00000.jsonl").exists()
+
+    # Columnar parts alone are results too
+    (tmp_path / "columns-00000.columns.jsonl").write_text("")
+    with pytest.raises(FileExistsError):
+        ResultsWriter(tmp_path, prefix="columns")
@@ -0,0 +1,92 @@
+import json
+import random
+
+import pytest
+
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.__main__ import main
+from src.simulation.runner import (
+    get_game_seed,
+    load_cards,
+    load_wonders,
+    play_game,
+    replay_game,
+    simulate,
+)
+
+
+def test_loads_the_catalogs() -> None:
+    assert len(load_cards()) > 0
+    assert len(load_wonders()) == 7
+    assert load_cards() is load_cards()
+
+
+def test_simulate_is_reproducible() -> None:
+    strategies = [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()]
+
+    first = simulate(3, strategies, seed=42)
+    second = simulate(3, strategies, seed=42)
+
+    assert len(first.games) == 3
+    assert [game.scores for game in first.games] == [game.scores for game in second.games]
+    assert first.elapsed > 0 and first.games_per_second > 0
+    assert first.games[0].strategies == ["SimpleStrategy", "WarriorStrategy", "SimpleStrategy"]
+
+
+def test_game_can_be_replayed_from_its_seed() -> None:
+    strategies = [SimpleStrategy()] * 3
+    game = simulate(2, strategies, seed=1).games[1]
+
+    replay = play_game(strategies, game.seed)
+
+    assert replay.scores == game.scores
+    assert replay.wonders == game.wonders
+
+
+def test_game_can_be_replayed_from_root_seed_and_index() -> None:
+    """Without a seed a root seed is drawn, and it is enough to replay any game"""
+    strategies = [SimpleStrategy()] * 3
+    result = simulate(3, strategies)
+
+    replay = replay_game(strategies, result.root_seed, 2)
+
+    assert replay.seed == result.games[2].seed == get_game_seed(result.root_seed, 2)
+    assert replay.scores == result.games[2].scores
+
+
+def test_games_ignore_the_global_random_state() -> None:
+    strategies = [SimpleStrategy()] * 3
+    random.seed(1)
+    first = play_game(strategies, 123)
+    random.seed(2)
+    second = play_game(strategies, 123)
+
+    assert first.scores == second.scores
+
+
+def test_summary() -> None:
+    result = simulate(4, [SimpleStrategy()] * 3, seed=3)
+
+    assert sum(result.get_win_rates()) == pytest.approx(1)
+    assert len(result.get_mean_totals()) == 3
+    for game in result.games:
+        assert all(game.totals[seat] == max(game.totals) for seat in game.winners)
+
+
+def test_cli(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["-n", "2", "--seed", "5", "--json"]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert output["n_games"] == 2
+    assert len(output["games"]) == 2
+    assert len(output["games"][0]["scores"]) == 3
+
+
+def test_unsupported_player_counts_are_rejected(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(ValueError, match="cannot seat 4 players"):
+        play_game([SimpleStrategy()] * 4, 1)
+
+    with pytest.raises(SystemExit):
+        main(["-n", "1", "--strategies", "simple", "simple", "simple", "simple"])
+    assert "cannot seat 4 players" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+import random
+import statistics
+
+import pytest
+
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.runner import simulate
+from src.simulation.stats import (
+    MatchupStats,
+    RunningStats,
+    SequentialTest,
+    get_ranks,
+    run_matchup,
+)
+
+
+def test_running_stats_match_the_batch_formulas() -> None:
+    rng = random.Random(0)
+    values = [rng.gauss(40, 8) for _ in range(500)]
+
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+
+    first, second = RunningStats(), RunningStats()
+    for value in values[:123]:
+        first.add(value)
+    for value in values[123:]:
+        second.add(value)
+    first.merge(second)
+    assert first.n == 500
+    assert first.mean == pytest.approx(stats.mean)
+    assert first.variance == pytest.approx(stats.variance)
+
+
+def test_ranks_share_ties() -> None:
+    assert get_ranks([50, 42, 61]) == [2, 3, 1]
+    assert get_ranks([50, 50, 40]) == [1, 1, 3]
+
+
+def test_matchup_stats_as_a_sink() -> None:
+    stats = MatchupStats()
+    strategies = [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()]
+    kept = simulate(20, strategies, seed=3)
+    for game in kept.games:
+        stats.add(game)
+
+    simple = stats.by_strategy["SimpleStrategy"]
+    warrior = stats.by_strategy["WarriorStrategy"]
+    assert stats.n_games == 20
+    assert simple.games == 40 and warrior.games == 20
+    assert simple.wins + warrior.wins == pytest.approx(20)
+    assert sum(simple.get_rank_distribution()) == pytest.approx(1)
+    assert warrior.scores["total"].mean == pytest.approx(
+        statistics.mean(game.totals[1] for game in kept.games)
+    )
+    assert [seat.win_rate for seat in stats.by_seat] == pytest.approx(kept.get_win_rates())
+
+
+def test_sequential_matchup_stops_early() -> None:
+    test = SequentialTest("SimpleStrategy", "WarriorStrategy", threshold=0.15, min_games=30)
+    matchup = run_matchup(
+        [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], test, max_games=1000, seed=1
+    )
+
+    assert matchup.stopped
+    assert 30 <= matchup.simulation.n_games < 1000
+    assert matchup.simulation.games == []
+    assert test.half_width <= 0.15
+    # Seats are rotated, so every seat is played by both strategies
+    assert all(seat.games > 0 for seat in matchup.stats.by_seat)
+    low, high = test.interval
+    assert low < test.difference.mean < high
+
+
+def test_sequential_matchup_runs_out_of_games() -> None:
+    test = SequentialTest("SimpleStrategy", "WarriorStrategy", threshold=0.05, min_games=10)
+    matchup = run_matchup(
+        [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], test, max_games=5, seed=2
+    )
+
+    assert not matchup.stopped
+    assert matchup.simulation.n_games == 5 == test.difference.n
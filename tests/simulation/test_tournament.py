@@ -0,0 +1,46 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.game.strategies.simple.simple import SimpleStrategy
+from src.game.strategies.warrior.warrior import WarriorStrategy
+from src.simulation.runner import simulate
+from src.simulation.tournament import (
+    _get_worker_pid,
+    _init_worker,
+    get_strategy_stats,
+    run_tournament,
+    start_workers,
+)
+
+
+def test_tournament_matches_simulate() -> None:
+    """Sharding across workers does not change the games nor their order"""
+    result = run_tournament(6, ["simple", "warrior", "simple"], seed=9, workers=2, chunk_size=2)
+    expected = simulate(6, [SimpleStrategy(), WarriorStrategy(), SimpleStrategy()], seed=9)
+
+    assert [game.seed for game in result.games] == [game.seed for game in expected.games]
+    assert [game.scores for game in result.games] == [game.scores for game in expected.games]
+
+
+def test_strategy_stats_are_merged() -> None:
+    result = run_tournament(4, ["simple", "warrior", "simple"], seed=2, workers=2)
+
+    stats = get_strategy_stats(result)
+
+    assert stats["SimpleStrategy"].games == 8
+    assert stats["WarriorStrategy"].games == 4
+    assert sum(s.wins for s in stats.values()) == pytest.approx(4)
+
+
+def test_workers_are_started_before_the_clock() -> None:
+    with ProcessPoolExecutor(
+        max_workers=3, initializer=_init_worker, initargs=(("simple",) * 3,)
+    ) as executor:
+        pids = start_workers(executor, 3)
+        assert len(pids) == 3
+        # Every worker answered, so none is left to start
+        assert set(executor.map(_get_worker_pid, [0.0] * 12)) <= pids
+
+    result = run_tournament(4, ["simple", "warrior", "simple"], seed=2, workers=2, warm_up=True)
+    assert result.n_games == 4 and result.elapsed > 0
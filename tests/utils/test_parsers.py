@@ -1,11 +1,13 @@
 import pytest
 from src.utils.parsers import (
+    compile_effect,
     parse_cost,
     parse_cards,
     parse_wonders,
     parse_wonder_stages,
 )
-from src.core.enums import Resource, CardType
+from src.core.enums import Resource, CardType, ScienceSymbol
+from src.core.types import Multiplier
 
 
 def test_parse_cost() -> None:
@@ -72,7 +74,7 @@ def test_parse_cards() -> None:
     assert cards[0].age == 1
     assert cards[0].min_players == 3
     assert cards[0].cost == {}
-    assert cards[0].chain_to == []
+    assert cards[0].chain_to == ()
     assert cards[0].effect == "W"
 
     # Test second card
@@ -81,7 +83,7 @@ def test_parse_cards() -> None:
     assert cards[1].age == 1
     assert cards[1].min_players == 4
     assert cards[1].cost == {}
-    assert cards[1].chain_to == []
+    assert cards[1].chain_to == ()
     assert cards[1].effect == "S"
 
     # Test third card
@@ -90,7 +92,7 @@ def test_parse_cards() -> None:
     assert cards[2].age == 2
     assert cards[2].min_players == 3
     assert cards[2].cost == {}
-    assert cards[2].chain_to == []
+    assert cards[2].chain_to == ()
     assert cards[2].effect == "F"
 
     # Test fourth card
@@ -99,7 +101,7 @@ def test_parse_cards() -> None:
     assert cards[3].age == 3
     assert cards[3].min_players == 3
     assert cards[3].cost == {Resource.WOOD: 2, Resource.LOOM: 2}
-    assert cards[3].chain_to == []
+    assert cards[3].chain_to == ()
     assert cards[3].effect == "guild_effect"
 
 
@@ -109,7 +111,7 @@ def test_parse_cards_with_chains() -> None:
 
     cards = parse_cards(csv_content)
     assert len(cards) == 1
-    assert cards[0].chain_to == ["Workshop", "Library"]
+    assert cards[0].chain_to == ("Workshop", "Library")
 
 
 def test_parse_cards_invalid_input() -> None:
@@ -199,7 +201,7 @@ def test_parse_cards_from_resources() -> None:
     assert cards[0].age == 1
     assert cards[0].min_players == 3
     assert cards[0].cost == {}
-    assert cards[0].chain_to == ["pantheon"]
+    assert cards[0].chain_to == ("pantheon",)
     assert cards[0].effect == "VVV"
 
     # Test 93th card
@@ -208,7 +210,7 @@ def test_parse_cards_from_resources() -> None:
     assert cards[93].age == 2
     assert cards[93].min_players == 3
     assert cards[93].cost == {Resource.WOOD: 1, Resource.PAPYRUS: 1}
-    assert cards[93].chain_to == ["academy", "study"]
+    assert cards[93].chain_to == ("academy", "study")
     assert cards[93].effect == "T"
 
     # Test 127th card
@@ -217,7 +219,7 @@ def test_parse_cards_from_resources() -> None:
     assert cards[127].age == 3
     assert cards[127].min_players == 3
     assert cards[127].cost == {Resource.ORE: 2, Resource.STONE: 1, Resource.LOOM: 1}
-    assert cards[127].chain_to == []
+    assert cards[127].chain_to == ()
     assert cards[127].effect == "VVVVVVV-{wonders_complete}"
 
 
@@ -260,3 +262,82 @@ def test_parse_wonders_from_resources() -> None:
     assert len(night_wonders[0].stages) == 3
     assert night_wonders[0].stages[0].cost == {Resource.BRICK: 2}
     assert night_wonders[0].stages[0].effect == "W/S/O/B"
+
+
+def test_compile_effect_production() -> None:
+    assert compile_effect("WW").production == ((Resource.WOOD, 2),)
+    assert compile_effect("S/W").production_choice == (Resource.STONE, Resource.WOOD)
+    assert compile_effect("W/S/O/B").production == ()
+    assert compile_effect("MMM").shields == 3
+    assert compile_effect("VVVV").victory_points == 4
+    assert compile_effect("").special is None
+
+
+def test_compile_effect_science() -> None:
+    assert compile_effect("G", CardType.SCIENTIFIC).science == ScienceSymbol.GEAR
+    assert compile_effect("C/T/G").science_choice is True
+    assert compile_effect("C/T/G").production_choice == ()
+
+
+def test_compile_effect_trade() -> None:
+    effect = compile_effect("trade_{W/O/B/S}_>")
+    assert effect.trade_discount == {
+        Resource.WOOD,
+        Resource.ORE,
+        Resource.BRICK,
+        Resource.STONE,
+    }
+    assert effect.trade_left is False
+    assert effect.trade_right is True
+
+    effect = compile_effect("trade_{F/L/P}_<>")
+    assert effect.trade_left is True
+    assert effect.trade_right is True
+
+
+def test_compile_effect_multipliers() -> None:
+    effect = compile_effect("$$$-V-{wonder}", CardType.COMMERCIAL)
+    assert effect.coins == 0
+    assert effect.victory_points == 0
+    assert effect.coins_per == Multiplier(3, wonder_stages=True)
+    assert effect.points_per == Multiplier(1, wonder_stages=True)
+
+    # Commercial cards count the military tokens, guilds the military cards
+    effect = compile_effect("$$$-V-{military}", CardType.COMMERCIAL)
+    assert effect.coins_per == Multiplier(3, card_types=(CardType.MILITARY,))
+    assert effect.points_per == Multiplier(1, military_tokens=True)
+    effect = compile_effect("V-{military}_<>", CardType.GUILD)
+    assert effect.points_per == Multiplier(
+        1, card_types=(CardType.MILITARY,), own=False, left=True, right=True
+    )
+
+    effect = compile_effect("V-{raw_material;manufactured_good;guild}", CardType.GUILD)
+    assert effect.points_per == Multiplier(
+        1,
+        card_types=(CardType.RAW_MATERIAL, CardType.MANUFACTURED_GOOD, CardType.GUILD),
+    )
+
+    effect = compile_effect("$$-{manufactured_good}_<v>", CardType.COMMERCIAL)
+    assert effect.coins_per == Multiplier(
+        2, card_types=(CardType.MANUFACTURED_GOOD,), left=True, right=True
+    )
+
+    effect = compile_effect("VVVVVVV-{wonders_complete}", CardType.GUILD)
+    assert effect.points_per == Multiplier(7, wonder_complete=True)
+
+
+def test_compile_effect_wonder_stages() -> None:
+    effect = compile_effect("$$$-VVV-M")
+    assert (effect.coins, effect.victory_points, effect.shields) == (3, 3, 1)
+
+    effect = compile_effect("VV-build_discard")
+    assert effect.victory_points == 2
+    assert effect.special == "build_discard"
+
+
+def test_parsed_cards_have_compiled_effects() -> None:
+    with open("data/cards.csv", "r") as file:
+        cards = parse_cards(file.read())
+
+    for card in cards:
+        assert card.parsed_effect is compile_effect(card.effect, card.type)
@@ -8,10 +8,11 @@ from src.utils.validators import (
     get_right_in_list,
     is_card_present,
 )
+from src.utils.parsers import make_card
 
 
 def test_is_card_present() -> None:
-    card1: Card = Card(
+    card1: Card = make_card(
         name="test1",
         type=CardType.CIVILIAN,
         age=1,
@@ -20,7 +21,7 @@ def test_is_card_present() -> None:
         chain_to=None,
         effect="",
     )
-    card2: Card = Card(
+    card2: Card = make_card(
         name="test2",
         type=CardType.CIVILIAN,
         age=1,
@@ -36,7 +37,7 @@ def test_is_card_present() -> None:
 
 
 def test_can_card_be_chained() -> None:
-    card1: Card = Card(
+    card1: Card = make_card(
         name="test1",
         type=CardType.CIVILIAN,
         age=1,
@@ -45,7 +46,7 @@ def test_can_card_be_chained() -> None:
         chain_to=["test2"],
         effect="",
     )
-    card2: Card = Card(
+    card2: Card = make_card(
         name="test2",
         type=CardType.CIVILIAN,
         age=2,
@@ -54,7 +55,7 @@ def test_can_card_be_chained() -> None:
         chain_to=None,
         effect="",
     )
-    card3: Card = Card(
+    card3: Card = make_card(
         name="test3",
         type=CardType.CIVILIAN,
         age=2,
@@ -70,7 +71,7 @@ def test_can_card_be_chained() -> None:
 
 
 def test_drop_duplicates_cards() -> None:
-    card1: Card = Card(
+    card1: Card = make_card(
         name="test1",
         type=CardType.CIVILIAN,
         age=1,
@@ -79,7 +80,7 @@ def test_drop_duplicates_cards() -> None:
         chain_to=None,
         effect="",
     )
-    card2: Card = Card(
+    card2: Card = make_card(
         name="test1",
         type=CardType.CIVILIAN,
         age=2,
@@ -96,7 +97,7 @@ def test_drop_duplicates_cards() -> None:
 
 
 def test_get_random_cards() -> None:
-    card1: Card = Card(
+    card1: Card = make_card(
         name="test1",
         type=CardType.CIVILIAN,
         age=1,
@@ -105,7 +106,7 @@ def test_get_random_cards() -> None:
         chain_to=None,
         effect="",
     )
-    card2: Card = Card(
+    card2: Card = make_card(
         name="test2",
         type=CardType.MILITARY,
         age=2,